@@ -0,0 +1,131 @@
+"""
+Microbenchmark comparing the interned Card representation with the original string-ranked Card.
+
+Run from the repository root:
+    python -m benchmarks.cardBenchmark
+"""
+
+import timeit
+import tracemalloc
+from cards.card import Card
+from cards.deck import Deck
+
+
+class LegacyCard:
+    """
+    The original Card implementation (string rank, per-instance __dict__, names rebuilt on
+    every call), kept here only as a baseline for comparison.
+    """
+
+    def __init__(self, rank, suit):
+        self.rank = rank
+        self.suit = suit
+
+    def __str__(self):
+        if self.rank == 'Joker':
+            return f"{self.suit} {self.rank}"
+        else:
+            rank_names = {'1': "Ace", '11': "Jack", '12': "Queen", '13': "King"}
+            rank_str = rank_names.get(self.rank, self.rank)
+            return f"{rank_str} of {self.suit}"
+
+    def __lt__(self, other):
+        if not isinstance(other, LegacyCard):
+            return ValueError('Non Card object used in comparison.')
+        return int(self.rank) < int(other.rank)
+
+    def __gt__(self, other):
+        if not isinstance(other, LegacyCard):
+            return ValueError('Non Card object used in comparison.')
+        return int(self.rank) > int(other.rank)
+
+    def getImageName(self):
+        if self.rank == 'Joker':
+            return f"{self.suit}_{self.rank}.png".lower()
+        else:
+            rank_names = {'1': "Ace", '11': "Jack", '12': "Queen", '13': "King"}
+            rank_str = rank_names.get(self.rank, self.rank)
+            return f"{rank_str}_of_{self.suit}.png".lower()
+
+
+def legacy_deck():
+    """
+    Builds a 54 card deck the way the original Deck class did.
+
+    Returns:
+        list: LegacyCard objects.
+    """
+    cards = []
+    for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']:
+        for rank in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13']:
+            cards.append(LegacyCard(rank, suit))
+    cards.append(LegacyCard('Joker', 'Red'))
+    cards.append(LegacyCard('Joker', 'Black'))
+    return cards
+
+
+def time_per_call(stmt, namespace, number=200000):
+    """
+    Times a statement and returns the best per-call time in nanoseconds.
+
+    Args:
+        stmt (str): The statement to time.
+        namespace (dict): Globals for the statement.
+        number (int): Number of calls per repeat.
+    Returns:
+        float: Nanoseconds per call.
+    """
+    best = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def bytes_per_deck(build, decks=1000):
+    """
+    Measures the memory allocated per deck while keeping many decks alive.
+
+    Args:
+        build (callable): Function returning a new deck.
+        decks (int): Number of decks to keep alive during the measurement.
+    Returns:
+        float: Bytes allocated per deck.
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build() for _ in range(decks)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return allocated / decks
+
+
+def run():
+    """
+    Runs the comparison and prints a summary table.
+
+    Returns:
+        dict: Measurements keyed by benchmark name, each holding 'legacy' and 'interned' values.
+    """
+    namespace = {
+        'old0': LegacyCard('7', 'Hearts'), 'old1': LegacyCard('12', 'Spades'),
+        'new0': Card('7', 'Hearts'), 'new1': Card('12', 'Spades'),
+    }
+    results = {
+        'compare (ns)': (time_per_call('old1 > old0', namespace),
+                         time_per_call('new1 > new0', namespace)),
+        'str (ns)': (time_per_call('str(old1)', namespace),
+                     time_per_call('str(new1)', namespace)),
+        'getImageName (ns)': (time_per_call('old1.getImageName()', namespace),
+                              time_per_call('new1.getImageName()', namespace)),
+        'deck memory (bytes)': (bytes_per_deck(legacy_deck),
+                                bytes_per_deck(lambda: Deck(include_jokers=True))),
+    }
+
+    print(f"{'benchmark':<22}{'legacy':>12}{'interned':>12}{'ratio':>8}")
+    for name, (legacy, interned) in results.items():
+        print(f"{name:<22}{legacy:>12.1f}{interned:>12.1f}{legacy / interned:>7.1f}x")
+    return {name: {'legacy': legacy, 'interned': interned} for name, (legacy, interned) in results.items()}
+
+
+if __name__ == "__main__":
+    run()
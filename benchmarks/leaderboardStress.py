@@ -0,0 +1,188 @@
+"""
+Stress test for concurrent leaderboard writers: many processes, each with several threads,
+add scores to one database file at the same time, as the GUI, the CLI and simulations do
+when they share leaderboard.db. Every score must be stored exactly once and the score count
+tables must agree with the scores.
+
+Run from the repository root:
+    python -m benchmarks.leaderboardStress --processes 16 --threads 4 --scores 500
+"""
+
+from leaderboard.leaderboard import Leaderboard
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+
+def writer(db_path, process, threads, scores, bulk, barrier, results):
+    """
+    Body of one writer process: start every thread together and report what they wrote.
+
+    Args:
+        db_path (str): Database path.
+        process (int): Process number, used in the player names.
+        threads (int): Writer threads in this process.
+        scores (int): Scores added by each thread.
+        bulk (int): If more than 0, every thread also adds this many scores with add_scores.
+        barrier (multiprocessing.Barrier): Released when every process is ready.
+        results (multiprocessing.Queue): Receives (expected rows, latencies, errors).
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def play(thread):
+        leaderboard = Leaderboard(db_path=db_path)  # Threads share the process's pool
+        name = f"p{process}-t{thread}"
+        own = []
+        try:
+            for i in range(scores):
+                started = time.perf_counter()
+                try:
+                    leaderboard.add_score(name, i)
+                except Exception as error:
+                    errors.append(repr(error))
+                    continue
+                own.append(time.perf_counter() - started)
+            if bulk:
+                leaderboard.add_scores(((name, scores + i, None) for i in range(bulk)), batch_size=100)
+        except Exception as error:
+            errors.append(repr(error))
+        finally:
+            leaderboard.close()
+        with lock:
+            latencies.extend(own)
+
+    workers = [threading.Thread(target=play, args=(thread,)) for thread in range(threads)]
+    barrier.wait()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put((threads * (scores + bulk), latencies, errors))
+
+
+def check(db_path, processes, threads, scores, bulk):
+    """
+    Verify that every score was stored exactly once.
+
+    Args:
+        db_path (str): Database path.
+        processes (int): Writer processes.
+        threads (int): Writer threads per process.
+        scores (int): Scores added by each thread with add_score.
+        bulk (int): Scores added by each thread with add_scores.
+    Returns:
+        list: Problems found, empty if the leaderboard is complete and consistent.
+    """
+    problems = []
+    leaderboard = Leaderboard(db_path=db_path)
+    try:
+        conn = leaderboard.conn
+        expected = list(range(scores + bulk))
+        found = {}
+        for name, score in conn.execute("SELECT name, score FROM leaderboard ORDER BY name, score"):
+            found.setdefault(name, []).append(score)
+        for process in range(processes):
+            for thread in range(threads):
+                name = f"p{process}-t{thread}"
+                if found.pop(name, []) != expected:
+                    problems.append(f"{name}: scores lost or duplicated")
+        if found:
+            problems.append(f"unexpected players: {', '.join(sorted(found))}")
+
+        rows = conn.execute("SELECT COUNT(*) FROM leaderboard").fetchone()[0]
+        counted = conn.execute("SELECT COALESCE(SUM(count), 0) FROM score_counts").fetchone()[0]
+        dated = conn.execute("SELECT COALESCE(SUM(count), 0) FROM score_date_counts").fetchone()[0]
+        if not rows == counted == dated:
+            problems.append(f"{rows} rows but score counts total {counted} and {dated}")
+    finally:
+        leaderboard.close()
+    return problems
+
+
+def stress(db_path, processes, threads, scores, bulk=0):
+    """
+    Run the writer processes against one database and check the result.
+
+    Args:
+        db_path (str): Database path.
+        processes (int): Writer processes.
+        threads (int): Writer threads per process.
+        scores (int): Scores added by each thread with add_score.
+        bulk (int): Scores added by each thread with add_scores afterwards.
+    Returns:
+        dict: Rows expected, seconds, add_score latencies, errors and problems found.
+    """
+    Leaderboard(db_path=db_path).close()  # Create and migrate the database before the race
+
+    barrier = multiprocessing.Barrier(processes + 1)
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=writer, args=(db_path, process, threads, scores, bulk, barrier, results))
+               for process in range(processes)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    reports = [results.get() for _ in workers]
+    seconds = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    latencies = sorted(latency for _, process_latencies, _ in reports for latency in process_latencies)
+    return {
+        'rows': sum(rows for rows, _, _ in reports),
+        'seconds': seconds,
+        'latencies': latencies,
+        'errors': [error for _, _, process_errors in reports for error in process_errors],
+        'problems': check(db_path, processes, threads, scores, bulk),
+    }
+
+
+def main():
+    """
+    Command line entry point: run the stress test and exit with status 1 if any score was lost.
+    """
+    parser = argparse.ArgumentParser(description="Stress test for concurrent leaderboard writers.")
+    parser.add_argument("--processes", type=int, default=8, help="writer processes")
+    parser.add_argument("--threads", type=int, default=2, help="writer threads per process")
+    parser.add_argument("--scores", type=int, default=200, help="scores added one at a time by each thread")
+    parser.add_argument("--bulk", type=int, default=0, help="scores each thread then adds with add_scores")
+    parser.add_argument("--db", help="database to write to (default: a new temporary file)")
+    args = parser.parse_args()
+
+    directory = None
+    db_path = args.db
+    if db_path is None:
+        directory = tempfile.mkdtemp(prefix="leaderboard-stress-")
+        db_path = os.path.join(directory, "leaderboard.db")
+    try:
+        report = stress(db_path, args.processes, args.threads, args.scores, args.bulk)
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    latencies = report['latencies']
+    if latencies:
+        p50 = latencies[len(latencies) // 2] * 1e3
+        p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1e3
+        print(f"add_score latency: p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {latencies[-1] * 1e3:.2f}ms")
+    print(f"{report['rows']:,} scores from {args.processes} processes x {args.threads} threads "
+          f"in {report['seconds']:.2f}s ({report['rows'] / report['seconds']:,.0f} scores/s)")
+    for error in report['errors'][:10]:
+        print(f"error: {error}")
+    for problem in report['problems']:
+        print(f"FAILED: {problem}")
+    if report['errors'] or report['problems']:
+        print(f"{len(report['errors'])} errors, {len(report['problems'])} problems")
+        sys.exit(1)
+    print("No scores lost.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Soak test for the GUI: plays the opening of a game and quits to the home screen thousands
+of times, reporting resident memory and live widget count as it goes. Both should stay flat
+now that the main window reuses one PlayUI.
+
+The widget count must not change, and resident memory must grow by less than --max-growth
+bytes per restart after the first sample, or the soak exits with status 1. Qt's caches keep
+settling for a few thousand restarts, about 3 MB in all, so the default of 1 KB per restart
+leaves room for that while catching a leak of one stylesheet or pixmap per game. The scores
+go to an in-memory leaderboard, leaving leaderboard.db untouched.
+
+Run from the repository root (QT_QPA_PLATFORM=offscreen works without a display):
+    python -m benchmarks.playUISoak --restarts 5000
+"""
+
+from gui.imageCache import CardImageCache
+from gui.main import AppWindow
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+import argparse
+import os
+import resource
+import sys
+
+
+def resident_memory():
+    """
+    Read the current resident set size of this process.
+
+    Returns:
+        int: Resident memory in bytes (peak resident memory where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def soak(restarts, report_every):
+    """
+    Restart the game repeatedly through the main window and print memory samples.
+
+    Args:
+        restarts (int): Number of game restarts.
+        report_every (int): Number of restarts between samples.
+    Returns:
+        list: (restarts, resident bytes, widget count) samples.
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = AppWindow(db_path=":memory:")  # Leave the real leaderboard untouched
+    window.show()
+
+    # Let the card image prefetch finish, so the cache filling up is not counted as growth
+    cache = CardImageCache.instance()
+    while cache.loader is not None and cache.loader.isRunning():
+        cache.loader.wait()
+        app.processEvents()
+
+    samples = []
+    print(f"{'restarts':>9}{'RSS (MB)':>11}{'widgets':>9}")
+    for i in range(1, restarts + 1):
+        window.showPlayUI()
+        window.playUI.advance_state()   # Draw the first card
+        window.playUI.action("h")       # Guess higher
+        window.playUI.advance_state()   # Draw the next card
+        window.quit_game()
+        app.processEvents()
+        # Delete objects scheduled with deleteLater, as the event loop would outside this harness
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        if i % report_every == 0 or i == 1:
+            sample = (i, resident_memory(), len(QApplication.allWidgets()))
+            samples.append(sample)
+            print(f"{sample[0]:>9}{sample[1] / 2**20:>11.1f}{sample[2]:>9}")
+
+    return samples
+
+
+def check(samples, max_growth):
+    """
+    Check that memory and widgets stayed flat after the warm-up sample.
+
+    Args:
+        samples (list): (restarts, resident bytes, widget count) samples from soak.
+        max_growth (float): Largest allowed resident memory growth per restart, in bytes.
+    Returns:
+        list: Problems found, empty if the soak passed.
+    """
+    problems = []
+    warm = samples[1 if len(samples) > 2 else 0]
+    last = samples[-1]
+    restarts = last[0] - warm[0]
+    growth = last[1] - warm[1]
+    print(f"RSS growth after warm-up: {growth / 2**20:.2f} MB"
+          + (f" ({growth / restarts:.0f} bytes per restart)" if restarts else ""))
+    if restarts and growth / restarts > max_growth:
+        problems.append(f"memory grew by {growth / restarts:.0f} bytes per restart (limit {max_growth:.0f})")
+    if last[2] != warm[2]:
+        problems.append(f"widget count changed from {warm[2]} to {last[2]}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soak test for PlayUI restarts.")
+    parser.add_argument("--restarts", type=int, default=5000, help="number of game restarts")
+    parser.add_argument("--report-every", type=int, default=500, help="restarts between samples")
+    parser.add_argument("--max-growth", type=float, default=1024,
+                        help="largest allowed RSS growth per restart after warm-up, in bytes")
+    args = parser.parse_args()
+    problems = check(soak(args.restarts, args.report_every), args.max_growth)
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if problems:
+        sys.exit(1)
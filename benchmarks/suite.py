@@ -0,0 +1,391 @@
+"""
+Reproducible performance benchmark suite for cards, the game engine and the leaderboard.
+
+Every benchmark uses fixed seeds and reports the best time per operation over several repeats
+together with the peak memory allocated by one operation (measured separately with tracemalloc,
+which slows the code it traces). Results are written as JSON and can be compared with an
+earlier run to catch regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --output current.json --compare baseline.json
+    python -m benchmarks.suite --quick --only card deck
+"""
+
+from benchmarks.cardBenchmark import time_per_call
+from cards.card import Card
+from cards.deck import Deck
+from collections import OrderedDict
+from games.higherOrLower import HigherOrLower
+from leaderboard.leaderboard import Leaderboard
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SEED = 20240101
+LEADERBOARD_SIZES = (1000, 1000000, 10000000)
+QUICK_LEADERBOARD_SIZES = (1000, 100000)
+
+
+############ MEASUREMENT ##############
+
+def best_time(func, number, repeat=5):
+    """
+    Best wall time per call of a function over several repeats.
+
+    Args:
+        func (callable): Called with no arguments.
+        number (int): Calls per repeat.
+        repeat (int): Number of repeats.
+    Returns:
+        float: Seconds per call.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+
+def peak_memory(func):
+    """
+    Peak memory allocated while running a function once.
+
+    Args:
+        func (callable): Called with no arguments.
+    Returns:
+        int: Peak traced bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(value, unit, peak_bytes=None, **extra):
+    """
+    Builds one benchmark result.
+
+    Args:
+        value (float): The measurement; lower is better.
+        unit (str): Its unit, e.g. 'ns/op'.
+        peak_bytes (int, optional): Peak memory of one operation.
+        **extra: Further fields stored with the result.
+    Returns:
+        dict: The result.
+    """
+    return dict(value=value, unit=unit, peak_bytes=peak_bytes, **extra)
+
+
+############ CARDS ##############
+
+def bench_cards(quick=False):
+    """
+    Card comparison and formatting.
+
+    Returns:
+        OrderedDict: Results keyed by benchmark name.
+    """
+    number = 50000 if quick else 500000
+    namespace = {'c0': Card('7', 'Hearts'), 'c1': Card('12', 'Spades')}
+    return OrderedDict([
+        ('card.compare', result(time_per_call('c1 > c0', namespace, number), 'ns/op')),
+        ('card.str', result(time_per_call('str(c1)', namespace, number), 'ns/op')),
+        ('card.image_name', result(time_per_call('c1.getImageName()', namespace, number), 'ns/op')),
+    ])
+
+
+############ DECKS ##############
+
+def bench_decks(quick=False):
+    """
+    Deck construction, shuffle, and draining a shuffled deck card by card.
+
+    Returns:
+        OrderedDict: Results keyed by benchmark name.
+    """
+    number = 500 if quick else 5000
+    rng = random.Random(SEED)
+
+    def construct():
+        return Deck(include_jokers=True, rng=rng)
+
+    deck = construct()
+
+    def drain():
+        d = construct()
+        d.shuffle()
+        while d.draw_card():
+            pass
+
+    return OrderedDict([
+        ('deck.construct', result(best_time(construct, number) * 1e6, 'us/op', peak_memory(construct))),
+        ('deck.shuffle', result(best_time(deck.shuffle, number) * 1e6, 'us/op')),
+        ('deck.drain', result(best_time(drain, number) * 1e6, 'us/op', peak_memory(drain))),
+    ])
+
+
+############ GAME ENGINE ##############
+
+def always_higher(card, game):
+    """Never bank, always guess Higher. Returns (bank, guess)."""
+    return False, 'h'
+
+
+def pivot(card, game):
+    """Never bank, guess Higher at or below 7 and Lower above. Returns (bank, guess)."""
+    return False, 'h' if card.rank <= 7 else 'l'
+
+
+def bank_at(card, game):
+    """Bank at 10 unbanked points, guess around 7. Returns (bank, guess)."""
+    return game.unbanked_points >= 10, 'h' if card.rank <= 7 else 'l'
+
+
+GAME_STRATEGIES = OrderedDict([('always-higher', always_higher), ('pivot:7', pivot), ('bank-at:10', bank_at)])
+
+
+def play_game(game, strategy):
+    """
+    Plays one game to the end through the HigherOrLower methods, without the leaderboard.
+
+    Args:
+        game (HigherOrLower): The game.
+        strategy (callable): Called as strategy(card, game), returns (bank, guess).
+    Returns:
+        int: Number of guesses.
+    """
+    def draw_non_joker():
+        card = game.draw_card()
+        while not card or card.is_joker:
+            card = game.draw_card()
+        return card
+
+    card0 = draw_non_joker()
+    guesses = 0
+    while game.lives > 0:
+        bank, guess = strategy(card0, game)
+        if bank:
+            game.bankPoints()
+        card1 = draw_non_joker()
+        if game.checkGuess(card0, card1, guess):
+            game.correct()
+        else:
+            game.incorrect()
+        guesses += 1
+        card0 = card1
+    return guesses
+
+
+def bench_games(quick=False):
+    """
+    Whole-game throughput of HigherOrLower under each fixed strategy, on seeded games.
+
+    Returns:
+        OrderedDict: Results keyed by benchmark name.
+    """
+    games = 500 if quick else 5000
+    results = OrderedDict()
+    for name, strategy in GAME_STRATEGIES.items():
+        def play_all():
+            return sum(play_game(HigherOrLower(rng=SEED + i), strategy) for i in range(games))
+
+        guesses = play_all()
+        seconds = best_time(play_all, 1, repeat=3)
+        results[f'game.{name}'] = result(seconds / games * 1e6, 'us/game',
+                                         peak_memory(lambda: play_game(HigherOrLower(rng=SEED), strategy)),
+                                         games_per_sec=games / seconds, guesses_per_game=guesses / games)
+    return results
+
+
+############ LEADERBOARD ##############
+
+def populate(path, rows, seed=SEED, chunk=100000):
+    """
+    Creates a leaderboard database holding a fixed pseudo-random set of scores, loaded
+    with the bulk API.
+
+    Args:
+        path (str): Database path.
+        rows (int): Number of scores.
+        seed (int): Seed of the names, dates and scores.
+        chunk (int): Rows inserted per transaction.
+    """
+    rng = random.Random(seed)
+    names = [f"player{i}" for i in range(1000)]
+    start = datetime.date(2024, 1, 1).toordinal()
+    dates = [datetime.date.fromordinal(start + day).strftime("%Y-%m-%d") for day in range(365)]
+    leaderboard = Leaderboard(db_path=path)
+    try:
+        scores = ((rng.choice(names), int(rng.expovariate(1 / 25)), rng.choice(dates)) for _ in range(rows))
+        leaderboard.add_scores(scores, batch_size=chunk, defer_indexes=True)
+    finally:
+        leaderboard.close()
+
+
+def bench_leaderboard(sizes=LEADERBOARD_SIZES, quick=False):
+    """
+    Bulk load time per row, and add_score, get_top_scores and rank latency, on leaderboards
+    of several sizes.
+
+    Args:
+        sizes (tuple): Rows in each leaderboard.
+    Returns:
+        OrderedDict: Results keyed by benchmark name.
+    """
+    number = 20 if quick else 100
+    results = OrderedDict()
+    directory = tempfile.mkdtemp(prefix="leaderboard-bench-")
+    try:
+        for rows in sizes:
+            path = os.path.join(directory, f"leaderboard_{rows}.db")
+            started = time.perf_counter()
+            populate(path, rows)
+            populate_seconds = time.perf_counter() - started
+
+            leaderboard = Leaderboard(db_path=path)
+            rng = random.Random(SEED)
+            calls = max(3, min(number, 10 ** 7 // rows))  # Fewer calls on the slow, large leaderboards
+            try:
+                def add():
+                    leaderboard.add_score("bench", rng.randrange(200))
+
+                results[f'leaderboard.add_scores[{rows}]'] = result(populate_seconds / rows * 1e6, 'us/row',
+                                                                   seconds=populate_seconds)
+                results[f'leaderboard.add_score[{rows}]'] = result(
+                    best_time(add, calls, repeat=3) * 1e3, 'ms/op', peak_memory(add))
+                results[f'leaderboard.get_top_scores[{rows}]'] = result(
+                    best_time(leaderboard.get_top_scores, calls, repeat=3) * 1e3, 'ms/op',
+                    peak_memory(leaderboard.get_top_scores))
+
+                def rank():
+                    leaderboard.rank(rng.randrange(200), "2024-07-01")
+
+                results[f'leaderboard.rank[{rows}]'] = result(best_time(rank, 1000, repeat=3) * 1e6, 'us/op')
+            finally:
+                leaderboard.close()
+            os.remove(path)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+############ SUITE ##############
+
+GROUPS = OrderedDict([('card', bench_cards), ('deck', bench_decks), ('game', bench_games),
+                      ('leaderboard', bench_leaderboard)])
+
+
+def environment():
+    """
+    Returns:
+        dict: Python version, platform, CPU count, git commit and time of the run.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'commit': commit, 'seed': SEED,
+            'time': datetime.datetime.now().isoformat(timespec='seconds')}
+
+
+def run(groups=None, quick=False, sizes=None):
+    """
+    Runs benchmark groups and prints each result as it completes.
+
+    Args:
+        groups (list, optional): Group names to run (see GROUPS). Defaults to all.
+        quick (bool): If True, use fewer repeats and smaller leaderboards.
+        sizes (tuple, optional): Leaderboard sizes, overriding the defaults.
+    Returns:
+        dict: {'environment': ..., 'results': {name: result}}.
+    """
+    results = OrderedDict()
+    for group in groups or GROUPS:
+        if group == 'leaderboard':
+            measured = bench_leaderboard(sizes or (QUICK_LEADERBOARD_SIZES if quick else LEADERBOARD_SIZES), quick)
+        else:
+            measured = GROUPS[group](quick)
+        for name, values in measured.items():
+            peak = f"{values['peak_bytes']:>12,} B" if values['peak_bytes'] is not None else ""
+            print(f"{name:<36}{values['value']:>12.3f} {values['unit']:<8}{peak}")
+            sys.stdout.flush()
+        results.update(measured)
+    return {'environment': environment(), 'results': results}
+
+
+def compare(current, baseline, threshold=0.1):
+    """
+    Prints each benchmark's change against a baseline run.
+
+    Args:
+        current (dict): Output of run.
+        baseline (dict): An earlier output of run.
+        threshold (float): Relative slowdown or memory growth reported as a regression.
+    Returns:
+        list: Names of the regressed benchmarks.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<36}{'baseline':>12}{'current':>12}{'change':>9}{'memory':>9}")
+    for name, values in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            print(f"{name:<36}{'-':>12}{values['value']:>12.3f}{'new':>9}")
+            continue
+        change = values['value'] / old['value'] - 1 if old['value'] else 0.0
+        memory = ""
+        regressed = change > threshold
+        if values['peak_bytes'] and old['peak_bytes']:
+            growth = values['peak_bytes'] / old['peak_bytes'] - 1
+            memory = f"{growth:+.0%}"
+            regressed = regressed or growth > threshold
+        print(f"{name:<36}{old['value']:>12.3f}{values['value']:>12.3f}{change:>+9.1%}{memory:>9}"
+              + ("  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """
+    Command line entry point: run the suite, save the results and compare with a baseline.
+    """
+    parser = argparse.ArgumentParser(description="Performance benchmark suite for Higher or Lower.")
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS), help="benchmark groups to run")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and leaderboards of 1k and 100k rows")
+    parser.add_argument("--sizes", type=int, nargs="+", help="leaderboard sizes in rows")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    current = run(args.only, args.quick, tuple(args.sizes) if args.sizes else None)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import numpy as np
+from cards.card import CARDS
+from cards.rng import SeedSequence
+
+EMPTY = 255  # Card code returned when drawing from an empty deck
+
+# Lookup table from card code to rank (Jokers and EMPTY map to rank 0)
+RANK_TABLE = np.zeros(256, dtype=np.uint8)
+RANK_TABLE[:len(CARDS)] = [card.rank for card in CARDS]
+
+STANDARD_CODES = np.arange(52, dtype=np.uint8)
+JOKER_CODES = np.arange(52, len(CARDS), dtype=np.uint8)
+
+
+class ArrayDeck:
+    """
+    Represents one or more independent decks stored as card codes in a 2-D uint8 NumPy array.
+
+    Each row is a deck. Like Deck, cards are drawn from the end of each row, so row i holds
+    its remaining cards in codes[i, :remaining[i]]. Card codes match Card.code.
+
+    Attributes:
+        codes (numpy.ndarray): Array of shape (n_decks, deck_size) holding card codes.
+        remaining (numpy.ndarray): Number of cards left in each deck.
+        rng (numpy.random.Generator): Random generator used for shuffling.
+    """
+
+    def __init__(self, n_decks=1, include_jokers=False, rng=None):
+        """
+        Initialises n_decks ordered decks of 52 cards by default, optionally including Jokers.
+
+        Args:
+            n_decks (int): Number of independent decks to create.
+            include_jokers (bool): If True, adds two Joker cards (one Red, one Black) to each deck.
+            rng (numpy.random.Generator, SeedSequence or int, optional): Generator or seed used for shuffling.
+        """
+        if isinstance(rng, SeedSequence):
+            rng = rng.generate_seed()
+        self.rng = np.random.default_rng(rng)
+        base = np.concatenate([STANDARD_CODES, JOKER_CODES]) if include_jokers else STANDARD_CODES
+        self.codes = np.tile(base, (n_decks, 1))
+        self.remaining = np.full(n_decks, base.size, dtype=np.intp)
+
+    def __repr__(self):
+        """
+        Provides a developer-friendly string representation of the decks.
+
+        Returns:
+            str: A summary of the number of decks and cards left.
+        """
+        return f"ArrayDeck({len(self)} decks, {int(self.remaining.sum())} cards left)"
+
+    def __len__(self):
+        """
+        Returns the number of decks held.
+
+        Returns:
+            int: The number of rows in the array.
+        """
+        return self.codes.shape[0]
+
+    def shuffle(self):
+        """
+        Shuffles the remaining cards of every deck independently in one array operation.
+        """
+        width = self.codes.shape[1]
+        if (self.remaining == width).all():
+            self.codes = self.rng.permuted(self.codes, axis=1)
+        else:
+            # Sort random keys, pinning already drawn slots to the end of their row
+            keys = self.rng.random(self.codes.shape)
+            keys[np.arange(width) >= self.remaining[:, None]] = np.inf
+            order = np.argsort(keys, axis=1)
+            self.codes = np.take_along_axis(self.codes, order, axis=1)
+
+    def draw(self, rows=None):
+        """
+        Removes and returns the top card of each deck.
+
+        Args:
+            rows (array-like, optional): Indices or boolean mask of the decks to draw from.
+                                         If None, draws from every deck.
+        Returns:
+            numpy.ndarray: Card codes drawn, with EMPTY for decks that had no cards left.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        else:
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            else:
+                rows = rows.astype(np.intp, copy=False)  # An empty list would otherwise be float
+        remaining = self.remaining[rows]
+        has_card = remaining > 0
+        drawn = np.full(rows.size, EMPTY, dtype=np.uint8)
+        drawn[has_card] = self.codes[rows[has_card], remaining[has_card] - 1]
+        self.remaining[rows[has_card]] -= 1
+        return drawn
+
+    def draw_many(self, count):
+        """
+        Removes and returns the top count cards of every deck.
+
+        Args:
+            count (int): Number of cards to draw from each deck.
+        Returns:
+            numpy.ndarray: Array of shape (n_decks, count) in draw order.
+        Raises:
+            ValueError: If any deck has fewer than count cards left.
+        """
+        if (self.remaining < count).any():
+            raise ValueError('Not enough cards left to draw from every deck.')
+        offsets = self.remaining[:, None] - 1 - np.arange(count)
+        drawn = np.take_along_axis(self.codes, offsets, axis=1)
+        self.remaining -= count
+        return drawn
+
+    def cards(self, row):
+        """
+        Returns the remaining cards of one deck as Card objects.
+
+        Args:
+            row (int): Index of the deck.
+        Returns:
+            list: Card objects in the same order as Deck.cards (top card last).
+        """
+        return to_cards(self.codes[row, :self.remaining[row]])
+
+
+def ranks(codes):
+    """
+    Converts card codes to ranks.
+
+    Args:
+        codes (numpy.ndarray): Card codes.
+    Returns:
+        numpy.ndarray: Ranks from 1 (Ace) to 13 (King), with 0 for Jokers and EMPTY.
+    """
+    return RANK_TABLE[codes]
+
+
+def check_guesses(card0, card1, higher):
+    """
+    Vectorized HigherOrLower.checkGuess over whole batches of card pairs.
+
+    Args:
+        card0 (numpy.ndarray): Codes of the current cards.
+        card1 (numpy.ndarray): Codes of the next cards drawn.
+        higher (numpy.ndarray): True where the guess is Higher, False where it is Lower.
+    Returns:
+        numpy.ndarray: True where the guess is correct. Ties count as wrong.
+    """
+    rank0 = RANK_TABLE[card0]
+    rank1 = RANK_TABLE[card1]
+    return np.where(higher, rank1 > rank0, rank1 < rank0)
+
+
+def to_cards(codes):
+    """
+    Converts card codes to their interned Card objects.
+
+    Args:
+        codes (numpy.ndarray): Card codes.
+    Returns:
+        list: Card objects, or None for EMPTY codes.
+    """
+    return [CARDS[code] if code != EMPTY else None for code in codes.tolist()]
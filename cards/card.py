@@ -1,23 +1,80 @@
+RANK_NAMES = {1: "Ace", 11: "Jack", 12: "Queen", 13: "King"}  # Display names for face cards
+SUITS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+JOKER_SUITS = ('Red', 'Black')
+JOKER_RANK = 0  # Rank ordinal used for Jokers
+NUM_CODES = len(SUITS) * 13 + len(JOKER_SUITS)  # 52 standard cards + 2 Jokers
+
+
 class Card:
     """
-    Represents a playing card with a rank and suit. 
+    Represents a playing card with a rank and suit.
+
+    Cards are interned flyweights: each of the 54 possible cards exists exactly once, so
+    Card('1', 'Hearts') always returns the same object. Display names and image file names
+    are computed once when the card is created.
 
     Attributes:
-        rank (str): The rank of the card, which can be a number (e.g., '2') or a face card ('1' for Ace, '11' for Jack, '12' for Queen, '13' for King). 
-                    For Jokers, rank is 'Joker'.
+        rank (int): The rank ordinal of the card, 1 (Ace) to 13 (King). For Jokers, rank is 0.
         suit (str): The suit of the card, such as 'Hearts', 'Diamonds', 'Clubs', or 'Spades'.
+                    For Jokers, suit is 'Red' or 'Black'.
+        code (int): Compact card code from 0 to 53. Standard cards are suit_index * 13 + rank - 1,
+                    the Red Joker is 52 and the Black Joker is 53.
+        is_joker (bool): True if the card is a Joker.
     """
 
-    def __init__(self, rank, suit):
+    __slots__ = ('rank', 'suit', 'code', 'is_joker', '_name', '_repr', '_image_name')
+
+    _interned = {}  # (rank, suit) -> Card, keyed by both str and int ranks
+
+    def __new__(cls, rank, suit):
         """
-        Initializes a Card object with a given rank and suit.
+        Returns the interned card for a given rank and suit.
 
         Args:
-            rank (str): The rank of the card.
+            rank (str or int): The rank of the card ('1' to '13' or 1 to 13), or 'Joker'.
             suit (str): The suit of the card.
+        Returns:
+            Card: The single shared instance of the requested card.
+        Raises:
+            ValueError: If the rank and suit do not describe a valid card.
+        """
+        try:
+            return cls._interned[(rank, suit)]
+        except KeyError:
+            raise ValueError(f'Invalid card: {rank!r} of {suit!r}') from None
+
+    @classmethod
+    def _create(cls, rank, suit, code):
+        """
+        Builds a card instance and precomputes its names. Only used to populate the intern table.
+        """
+        card = object.__new__(cls)
+        card.rank = rank
+        card.suit = suit
+        card.code = code
+        card.is_joker = rank == JOKER_RANK
+        if card.is_joker:
+            card._name = f"{suit} Joker"
+            card._repr = f"Card('Joker', '{suit}')"
+            card._image_name = f"{suit}_joker.png".lower()
+        else:
+            rank_str = RANK_NAMES.get(rank, str(rank))
+            card._name = f"{rank_str} of {suit}"
+            card._repr = f"Card('{rank_str}', '{suit}')"
+            card._image_name = f"{rank_str}_of_{suit}.png".lower()
+        return card
+
+    @classmethod
+    def from_code(cls, code):
+        """
+        Returns the card with the given compact code.
+
+        Args:
+            code (int): Card code from 0 to 53.
+        Returns:
+            Card: The interned card.
         """
-        self.rank = rank
-        self.suit = suit
+        return CARDS[code]
 
     def __str__(self):
         """
@@ -26,13 +83,8 @@ class Card:
         Returns:
             str: The formatted string representation, such as "Ace of Hearts" or "Red Joker".
         """
-        if self.rank == 'Joker':
-            return f"{self.suit} {self.rank}"
-        else:
-            rank_names = {'1': "Ace", '11': "Jack", '12': "Queen", '13': "King"}
-            rank_str = rank_names.get(self.rank, self.rank)
-            return f"{rank_str} of {self.suit}"
-    
+        return self._name
+
     def __repr__(self):
         """
         Provides a developer-friendly representation of the card.
@@ -40,10 +92,14 @@ class Card:
         Returns:
             str: A string representation in the format Card('<Rank>', '<Suit>').
         """
-        rank_names = {'1': "Ace", '11': "Jack", '12': "Queen", '13': "King"}
-        rank_str = rank_names.get(self.rank, self.rank)
-        return f"Card('{rank_str}', '{self.suit}')"
-    
+        return self._repr
+
+    def __reduce__(self):
+        """
+        Pickles the card by its code so unpickling returns the interned instance.
+        """
+        return (Card.from_code, (self.code,))
+
     def __lt__(self, other):
         """
         Determines if the current card is less than another card based on rank.
@@ -55,10 +111,10 @@ class Card:
         Raises:
             ValueError: If the other object is not an instance of Card.
         """
-        if not isinstance(other, Card):
-            return ValueError('Non Card object used in comparison.')
-        return int(self.rank) < int(other.rank)
-    
+        if other.__class__ is not Card:
+            raise ValueError('Non Card object used in comparison.')
+        return self.rank < other.rank
+
     def __gt__(self, other):
         """
         Determines if the current card is greater than another card based on rank.
@@ -70,10 +126,10 @@ class Card:
         Raises:
             ValueError: If the other object is not an instance of Card.
         """
-        if not isinstance(other, Card):
-            return ValueError('Non Card object used in comparison.')
-        return int(self.rank) > int(other.rank)
-    
+        if other.__class__ is not Card:
+            raise ValueError('Non Card object used in comparison.')
+        return self.rank > other.rank
+
     def __eq__(self, other):
         """
         Checks if the current card is equal to another card based on rank.
@@ -82,13 +138,12 @@ class Card:
             other (Card): Another Card object to compare against.
         Returns:
             bool: True if the ranks of the two cards are equal, False otherwise.
-        Raises:
-            ValueError: If the other object is not an instance of Card.
+                  Comparing against a non Card object is never equal.
         """
-        if not isinstance(other, Card):
-            return ValueError('Non Card object used in comparison.')
-        return int(self.rank) == int(other.rank)
-    
+        if other.__class__ is not Card:
+            return NotImplemented
+        return self.rank == other.rank
+
     def getImageName(self):
         """
         Generates the file name for the card's image representation within gui/card-images folder
@@ -96,12 +151,24 @@ class Card:
         Returns:
             str: The file name, formatted as '<rank>_of_<suit>.png' for regular cards or '<suit>_joker.png' for Jokers.
         """
-        if self.rank == 'Joker':
-            return f"{self.suit}_{self.rank}.png".lower()
-        else:
-            rank_names = {'1': "Ace", '11': "Jack", '12': "Queen", '13': "King"}
-            rank_str = rank_names.get(self.rank, self.rank)
-            return f"{rank_str}_of_{self.suit}.png".lower()
+        return self._image_name
+
+
+# Build the 54 interned cards in code order
+CARDS = tuple(
+    [Card._create(rank, suit, suit_index * 13 + rank - 1)
+     for suit_index, suit in enumerate(SUITS)
+     for rank in range(1, 14)] +
+    [Card._create(JOKER_RANK, suit, len(SUITS) * 13 + i) for i, suit in enumerate(JOKER_SUITS)]
+)
+
+for _card in CARDS:
+    if _card.is_joker:
+        Card._interned[('Joker', _card.suit)] = _card
+    else:
+        Card._interned[(_card.rank, _card.suit)] = _card
+        Card._interned[(str(_card.rank), _card.suit)] = _card
+del _card
 
 
 def test():
@@ -109,7 +176,7 @@ def test():
     A test function to test the Card class functionality.
     """
     pass
-    
+
 
 if __name__ == "__main__":
     test()
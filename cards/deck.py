@@ -1,37 +1,43 @@
-from cards.card import Card
-from random import shuffle
+from cards.card import CARDS
+from cards.rankIndex import RankIndex
+from cards.rng import make_rng
 
 class Deck:
     """
     Represents a standard deck of playing cards with an option to include Jokers.
 
     Attributes:
-        ranks (list): List of card ranks as strings (e.g., '1' for Ace, '2' to '10', '11' for Jack, '12' for Queen, '13' for King).
-        suits (list): List of card suits (e.g., 'Hearts', 'Diamonds', 'Clubs', 'Spades').
+        RANKS (list): List of card ranks as integers (1 for Ace, 2 to 10, 11 for Jack, 12 for Queen, 13 for King).
+        SUITS (list): List of card suits (e.g., 'Hearts', 'Diamonds', 'Clubs', 'Spades').
         cards (list): List of Card objects that make up the deck.
+        rng (random.Random): Random generator used for shuffling.
+        rank_index (RankIndex): Remaining cards per rank, kept up to date by draw_card.
     """
 
-    def __init__(self, include_jokers=False):
+    def __init__(self, include_jokers=False, rng=None, n_decks=1, jokers=2):
         """
         Initialises the deck with 52 cards by default and optionally includes Jokers.
 
         Args:
-            include_jokers (bool): If True, adds two Joker cards (one Red, one Black) to the deck.
+            include_jokers (bool): If True, adds Joker cards (alternately Red and Black) to the deck.
+            rng (random.Random, SeedSequence or int, optional): Generator or seed used for shuffling.
+                                                               If None, a shared default generator is used.
+            n_decks (int): Number of 52 card decks combined into this one.
+            jokers (int): Number of Jokers added when include_jokers is True.
         """
-        self.RANKS = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13']
+        self.rng = make_rng(rng)
+        self.RANKS = list(range(1, 14))  # Card ranks are integers, as on the interned Cards
         self.SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        self.cards = []
-        
-        # Generate cards for each suit and rank
-        for suit in self.SUITS:
-            for rank in self.RANKS:
-                card = Card(rank, suit)
-                self.cards.append(card)
 
-        # Add Jokers if specified
-        if include_jokers:
-            self.cards.append(Card('Joker', 'Red'))
-            self.cards.append(Card('Joker', 'Black'))
+        # Cards are interned and stored in code order (suit by suit, Ace to King, then Jokers),
+        # so building a deck only copies references to the shared Card objects
+        if n_decks == 1 and (not include_jokers or jokers == 2):
+            self.cards = list(CARDS) if include_jokers else list(CARDS[:52])
+        else:
+            self.cards = list(CARDS[:52]) * n_decks
+            if include_jokers:
+                self.cards += [CARDS[52 + i % 2] for i in range(jokers)]
+        self.rank_index = RankIndex(self.cards)
 
     def __str__(self):
         """
@@ -62,9 +68,9 @@ class Deck:
 
     def shuffle(self):
         """
-        Shuffles the cards in the deck using a random shuffling algorithm.
+        Shuffles the cards in the deck using the deck's random generator.
         """
-        shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def draw_card(self):
         """
@@ -75,6 +81,7 @@ class Deck:
         """
         if len(self.cards) > 0:
             card = self.cards.pop()
+            self.rank_index.remove(card)
             return card
         else:
             return None
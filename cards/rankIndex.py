@@ -0,0 +1,109 @@
+from cards.card import JOKER_RANK
+
+class RankIndex:
+    """
+    Tracks how many cards of each rank are left in a deck, with prefix sums over the ranks,
+    so the odds of the next card being higher, lower, a tie or a Joker are available in
+    constant time.
+
+    Attributes:
+        counts (list): counts[rank] is the number of remaining cards of that rank, with
+                       counts[0] holding the Jokers.
+        below (list): below[rank] is the number of remaining non-Joker cards ranked lower
+                      than rank, for ranks 1 to 14.
+        total (int): Number of remaining cards, including Jokers.
+    """
+
+    def __init__(self, cards=()):
+        """
+        Builds the index from a collection of cards.
+
+        Args:
+            cards (iterable): Card objects remaining in the deck.
+        """
+        counts = [0] * 14
+        for card in cards:
+            counts[card.rank] += 1
+        self.reset(counts)
+
+    def __repr__(self):
+        """
+        Provides a developer-friendly representation of the index.
+
+        Returns:
+            str: The remaining count of each rank.
+        """
+        return f"RankIndex({self.total} cards, counts: {self.counts})"
+
+    def reset(self, counts):
+        """
+        Replaces the index contents with the given per-rank counts.
+
+        Args:
+            counts (list): Remaining cards per rank, indexed like RankIndex.counts.
+        """
+        self.counts = list(counts)
+        self.below = [0] * 15
+        for rank in range(1, 14):
+            self.below[rank + 1] = self.below[rank] + counts[rank]
+        self.total = sum(counts)
+
+    def add(self, card):
+        """
+        Records a card being returned to the deck.
+
+        Args:
+            card (Card): The card added.
+        """
+        rank = card.rank
+        self.counts[rank] += 1
+        self.total += 1
+        if rank != JOKER_RANK:
+            below = self.below
+            for i in range(rank + 1, 15):
+                below[i] += 1
+
+    def remove(self, card):
+        """
+        Records a card being drawn from the deck.
+
+        Args:
+            card (Card): The card drawn.
+        """
+        rank = card.rank
+        self.counts[rank] -= 1
+        self.total -= 1
+        if rank != JOKER_RANK:
+            below = self.below
+            for i in range(rank + 1, 15):
+                below[i] -= 1
+
+    def odds(self, card):
+        """
+        Calculates the odds for the next draw relative to the given card.
+
+        Jokers are redrawn in the game, so 'higher', 'lower' and 'tie' are the odds for the
+        next non-Joker card, while 'joker' is the chance that the very next draw is a Joker.
+
+        Args:
+            card (Card): The current card.
+        Returns:
+            dict: Probabilities keyed by 'higher', 'lower', 'tie' and 'joker', or None if
+                  no non-Joker cards are left.
+        Raises:
+            ValueError: If the card is a Joker, which is redrawn rather than guessed against.
+        """
+        rank = card.rank
+        if rank == JOKER_RANK:
+            raise ValueError("No odds against a Joker: it is redrawn before any guess.")
+        standard = self.below[14]
+        if not standard:
+            return None
+        lower = self.below[rank]
+        tie = self.counts[rank]
+        return {
+            'higher': (standard - lower - tie) / standard,
+            'lower': lower / standard,
+            'tie': tie / standard,
+            'joker': self.counts[JOKER_RANK] / self.total,
+        }
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import random
+
+_default_rng = random.Random()  # Shared fast generator used when no RNG is given
+
+
+class SeedSequence:
+    """
+    Deterministic tree of seeds for creating independent random streams, modelled on
+    numpy.random.SeedSequence.
+
+    Every node hashes its root entropy together with its position in the tree (spawn_key),
+    so children spawned from the same root are reproducible and statistically independent
+    of each other and of their parent.
+
+    Attributes:
+        entropy (int): Root entropy shared by the whole tree.
+        spawn_key (tuple): Path of child indices from the root to this node.
+        n_children_spawned (int): Number of children spawned so far.
+    """
+
+    def __init__(self, entropy=None, spawn_key=()):
+        """
+        Initialises a seed sequence.
+
+        Args:
+            entropy (int, optional): Root entropy. If None, 128 bits are read from the OS.
+            spawn_key (tuple): Path of child indices from the root.
+        """
+        if entropy is None:
+            entropy = int.from_bytes(os.urandom(16), 'little')
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    def __repr__(self):
+        """
+        Provides a developer-friendly representation of the seed sequence.
+
+        Returns:
+            str: A string in the format SeedSequence(<entropy>, spawn_key=<key>).
+        """
+        return f"SeedSequence({self.entropy}, spawn_key={self.spawn_key})"
+
+    def spawn(self, n):
+        """
+        Creates n new independent child sequences. Repeated calls continue numbering
+        where the previous call stopped, so children are never reused.
+
+        Args:
+            n (int): Number of children to create.
+        Returns:
+            list: The child SeedSequence objects.
+        """
+        start = self.n_children_spawned
+        self.n_children_spawned += n
+        return [SeedSequence(self.entropy, self.spawn_key + (i,)) for i in range(start, start + n)]
+
+    def generate_seed(self):
+        """
+        Derives a 256-bit integer seed for this node.
+
+        Returns:
+            int: The seed.
+        """
+        digest = hashlib.blake2b(repr((self.entropy, self.spawn_key)).encode(), digest_size=32).digest()
+        return int.from_bytes(digest, 'little')
+
+    def rng(self):
+        """
+        Creates a random generator seeded from this node.
+
+        Returns:
+            random.Random: A new generator.
+        """
+        return random.Random(self.generate_seed())
+
+
+def make_rng(rng=None, secure=False):
+    """
+    Normalises the different ways of specifying randomness into a generator.
+
+    Args:
+        rng (random.Random, SeedSequence or int, optional): An existing generator (used as is),
+            a SeedSequence, or an integer seed. If None, a shared fast generator is used.
+        secure (bool): If True, returns an OS-backed cryptographically secure generator.
+                       Secure generators cannot be seeded, so rng must be None.
+    Returns:
+        random.Random: The generator to use.
+    Raises:
+        ValueError: If a seed is given together with secure=True.
+    """
+    if secure:
+        if rng is not None and not isinstance(rng, random.SystemRandom):
+            raise ValueError('A secure RNG cannot be seeded.')
+        return random.SystemRandom()
+    if rng is None:
+        return _default_rng
+    if isinstance(rng, random.Random):
+        return rng
+    if isinstance(rng, SeedSequence):
+        return rng.rng()
+    return SeedSequence(rng).rng()
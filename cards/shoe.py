@@ -0,0 +1,131 @@
+from cards.card import CARDS
+from cards.rankIndex import RankIndex
+from cards.rng import make_rng
+
+class Shoe:
+    """
+    Represents a dealing shoe holding one or more decks, shuffled lazily as cards are drawn.
+
+    Instead of shuffling every card up front, each draw performs a single Fisher-Yates step:
+    a random card is picked from the undealt part of the shoe and swapped to the boundary
+    with the dealt part. Dealt cards stay in the same list, so refilling the shoe only resets
+    a counter and never allocates new objects.
+
+    Attributes:
+        cards (list): All Card objects in the shoe. The undealt cards are cards[:remaining].
+        size (int): Number of cards in play after a refill (Jokers may be dropped on refill).
+        remaining (int): Number of undealt cards.
+        penetration (float): Fraction of the shoe dealt before it is automatically refilled.
+        cut (int): Number of undealt cards left when the shoe is refilled.
+        jokers_on_refill (bool): If False, Jokers are removed from the shoe at the first refill.
+        jokers (int): Number of Jokers currently in play.
+        reshuffles (int): Number of times the shoe has been refilled.
+        rng (random.Random): Random generator used to pick each card.
+        rank_index (RankIndex): Undealt cards per rank, kept up to date by draw_card.
+    """
+
+    def __init__(self, n_decks=1, include_jokers=False, penetration=1.0, jokers_on_refill=False, rng=None):
+        """
+        Initialises the shoe with n_decks decks of 52 cards, optionally including Jokers.
+
+        Args:
+            n_decks (int): Number of decks in the shoe.
+            include_jokers (bool): If True, adds two Joker cards (one Red, one Black) per deck.
+            penetration (float): Fraction of the shoe (0 < penetration <= 1) dealt before refilling.
+            jokers_on_refill (bool): If True, Jokers stay in the shoe after it is refilled.
+            rng (random.Random, SeedSequence or int, optional): Generator or seed used for drawing.
+        Raises:
+            ValueError: If n_decks or penetration are out of range.
+        """
+        if n_decks < 1:
+            raise ValueError('A shoe needs at least one deck.')
+        if not 0 < penetration <= 1:
+            raise ValueError('Penetration must be greater than 0 and at most 1.')
+
+        self.cards = list(CARDS if include_jokers else CARDS[:52]) * n_decks
+        self.jokers = 2 * n_decks if include_jokers else 0  # Jokers currently in play
+        self.penetration = penetration
+        self.jokers_on_refill = jokers_on_refill
+        self.reshuffles = 0
+        self.rng = make_rng(rng)
+        self.size = len(self.cards)
+        self.remaining = self.size
+        self.rank_index = RankIndex(self.cards)
+        self._full_counts = list(self.rank_index.counts)
+        self._set_cut()
+
+    def __str__(self):
+        """
+        Provides a human-readable string representation of the shoe.
+
+        Returns:
+            str: A summary of the number of undealt cards and the shoe size.
+        """
+        return f"Shoe with {self.remaining} of {self.size} cards left"
+
+    def __repr__(self):
+        """
+        Provides a developer-friendly string representation of the shoe.
+
+        Returns:
+            str: A summary of the shoe size, undealt cards and penetration.
+        """
+        return f"Shoe({self.remaining}/{self.size} cards, penetration: {self.penetration})"
+
+    def __len__(self):
+        """
+        Returns the number of undealt cards in the shoe.
+
+        Returns:
+            int: The number of undealt cards, including any below the cut.
+        """
+        return self.remaining
+
+    def _set_cut(self):
+        """
+        Sets the number of undealt cards at which the shoe is refilled.
+        """
+        self.cut = self.size - max(1, int(self.size * self.penetration))
+
+    def shuffle(self):
+        """
+        Kept for compatibility with Deck. Every draw is already uniformly random over the
+        undealt cards, so no work is needed up front.
+        """
+        pass
+
+    def refill(self):
+        """
+        Returns all dealt cards to the shoe. Jokers are dropped the first time unless
+        jokers_on_refill is set.
+        """
+        if self.jokers and not self.jokers_on_refill:
+            # One-off partition moving every Joker behind the playable region
+            self.cards.sort(key=lambda card: card.is_joker)
+            self.size -= self.jokers
+            self.jokers = 0
+            self._full_counts[0] = 0
+            self._set_cut()
+        self.remaining = self.size
+        self.rank_index.reset(self._full_counts)
+        self.reshuffles += 1
+
+    def draw_card(self):
+        """
+        Draws a random undealt card, refilling the shoe as soon as the cut is reached so
+        that rank_index always describes the next draw.
+
+        Returns:
+            Card: The drawn card. A shoe never runs out, so this is never None.
+        """
+        cards = self.cards
+        last = self.remaining - 1
+        i = self.rng.randrange(self.remaining)
+        card = cards[i]
+        cards[i] = cards[last]
+        cards[last] = card
+        self.remaining = last
+        self.rank_index.remove(card)
+        if last <= self.cut:
+            self.refill()
+        return card
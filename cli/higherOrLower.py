@@ -1,10 +1,71 @@
 """
 Command line interface for running the Higher or Lower game.
+
+Interactive by default. Batch mode plays many games without prompts or pauses, taking each
+action from a script (a file, or stdin, of h/l/b/d tokens, replayed from the start when it
+runs out) or from a built-in strategy, and prints a summary at the end:
+    python -m cli.higherOrLower --strategy bank-at:10 --games 10000 --quiet
+    python -m cli.higherOrLower --actions actions.txt --games 100 --seed 1
+    echo "h l b" | python -m cli.higherOrLower --batch --games 50
 """
 
+from games import metrics
 from games.higherOrLower import HigherOrLower
+from leaderboard.leaderboard import Leaderboard
+import argparse
+import io
+import itertools
+import sys
 import time
 
+ACTIONS = ('h', 'l', 'b', 'd')
+
+
+def script_actions(tokens):
+    """
+    Batch action source replaying a fixed sequence of actions, from the start again when it runs out.
+
+    Args:
+        tokens (list): Actions, each 'h', 'l', 'b' or 'd'.
+    Returns:
+        callable: Called as actions(card, game), returns the next action.
+    Raises:
+        ValueError: If a token is not an action, or no token is a guess (the game could never end).
+    """
+    tokens = [token.lower() for token in tokens]
+    invalid = sorted(set(tokens) - set(ACTIONS))
+    if invalid:
+        raise ValueError(f"Invalid actions {', '.join(invalid)}. Use h (Higher), l (Lower), b (Bank) or d (Display).")
+    if not {'h', 'l'} & set(tokens):
+        raise ValueError("The action script needs at least one guess (h or l).")
+    script = itertools.cycle(tokens)
+    return lambda card, game: next(script)
+
+
+def strategy_actions(spec):
+    """
+    Batch action source following a built-in strategy (see games.batchSimulator).
+
+    Args:
+        spec (str): Strategy spec, e.g. 'bank-at:10'.
+    Returns:
+        callable: Called as actions(card, game), returns 'b' when the strategy banks, else its guess.
+    """
+    from games.batchSimulator import GameState, make_strategy
+    import numpy as np
+
+    strategy = make_strategy(spec)
+
+    def actions(card, game):
+        state = GameState(*(np.array([value]) for value in (card.rank, game.streak, game.unbanked_points,
+                                                             game.score, game.lives)))
+        bank, higher = strategy(state)
+        if bank[0] and game.unbanked_points > 0:
+            return 'b'
+        return 'h' if higher[0] else 'l'
+    return actions
+
+
 class HigherOrLowerCLI:
     """
     A command line interface for the Higher or Lower game.
@@ -13,11 +74,60 @@ class HigherOrLowerCLI:
     manage gameplay, and handle user input.
     """
 
-    def __init__(self):
+    def __init__(self, actions=None, output=None, quiet=False, delay=1.0, leaderboard=None, seed=None, name=None):
         """
         Initialises the CLI game by creating a new instance of the HigherOrLower game logic.
+
+        Args:
+            actions (callable, optional): Batch mode action source, called as actions(card, game) instead
+                                          of asking the player (see script_actions and strategy_actions).
+            output (file, optional): Where messages are written. Defaults to standard output.
+            quiet (bool): If True, no messages are written.
+            delay (float): Scale of the pauses while drawing; 0 skips them.
+            leaderboard (Leaderboard, optional): Leaderboard for final scores. Defaults to leaderboard.db.
+            seed (int, optional): If given, game i is seeded with seed + i so runs are repeatable;
+                                  otherwise games shuffle with the OS secure generator.
+            name (str, optional): Player name. If None, the player is asked for it.
+        """
+        self.actions = actions
+        self.output = output or sys.stdout
+        self.quiet = quiet
+        self.delay = delay
+        self.leaderboard = leaderboard
+        self.seed = seed
+        self.name = name
+        self.games_played = 0
+        self.guesses = 0  # Guesses made over all games
+        self.new_game()
+
+    def new_game(self):
+        """
+        Starts a fresh game.
+        """
+        if self.seed is None:
+            self.game = HigherOrLower(leaderboard=self.leaderboard, secure=True)
+        else:
+            self.game = HigherOrLower(leaderboard=self.leaderboard, rng=self.seed + self.games_played)
+
+    def say(self, text=""):
+        """
+        Writes a line of output, unless quiet.
+
+        Args:
+            text (str): The line.
+        """
+        if not self.quiet:
+            self.output.write(f"{text}\n")
+
+    def pause(self, seconds):
         """
-        self.game = HigherOrLower()
+        Waits for user-friendliness when reading, scaled by the delay (no wait in batch mode).
+
+        Args:
+            seconds (float): Unscaled pause.
+        """
+        if self.delay:
+            time.sleep(seconds * self.delay)
 
     def startSequence(self):
         """
@@ -30,7 +140,7 @@ class HigherOrLowerCLI:
             self.showRules()
         self.name = input("\nWhat is your name? ")
         print(f"\nCool! Nice to meet you {self.name}")
-        
+
     def showRules(self):
         """
         Retrieves and displays the rules of the game by calling the HigherOrLower game logic.
@@ -38,119 +148,253 @@ class HigherOrLowerCLI:
         rules = self.game.getRules()
         print(rules)
 
+    def showState(self):
+        """
+        Displays the current score, unbanked points, streak and lives.
+        """
+        game = self.game
+        self.say(f"\nScore: {game.score}, Unbanked points: {game.unbanked_points}, " +
+                 f"Current streak: {game.streak}, Lives: {game.lives}")
+
+    def showOdds(self, card):
+        """
+        Displays the odds of the next card being higher, lower, a tie or a Joker.
+
+        Args:
+            card (Card): The current card.
+        """
+        odds = self.game.odds(card)
+        if odds is None:
+            self.say("No odds: the current card is redrawn before you guess.")
+            return
+        self.say(f"Odds for the next card: higher {odds['higher']:.1%}, lower {odds['lower']:.1%}, " +
+                 f"tie {odds['tie']:.1%}, joker {odds['joker']:.1%}")
+
     def play_again(self):
         """
         Prompts the player to decide whether to play again.
-        If 'y' is chosen, the game restarts. Otherwise, the game ends with a goodbye message.
+        If 'y' is chosen, a new game is set up. Otherwise, the game ends with a goodbye message.
+
+        Returns:
+            bool: True if the player wants another game.
         """
         replay = input("Would you like to play again? (y/n): ").lower()
         if replay == 'y':
-            # Reset the game and start over
-            self.game = HigherOrLower()
-            self.play()
-        else:
-            print("Thanks for playing! Goodbye!")
+            # Reset the game; the caller starts it
+            self.new_game()
+            return True
+        print("Thanks for playing! Goodbye!")
+        return False
+
+    def nextAction(self, card0):
+        """
+        Gets the player's next action, from the batch action source or by asking.
+
+        Args:
+            card0 (Card): The current card.
+        Returns:
+            str: 'h', 'l', 'b', 'd', or anything else the player typed.
+        """
+        if self.actions:
+            return self.actions(card0, self.game)
+        return input("\nGuess Higher (h), Lower (l), Bank (b), or display current status (d): ").lower()
+
+    def drawNext(self):
+        """
+        Draws cards until one can be guessed against. An empty deck is replaced and drawn
+        from again, and a Joker adds a life (in draw_card) before the next draw.
+
+        Returns:
+            Card: The first drawn card that is not a Joker.
+        """
+        while True:
+            card = self.game.draw_card()
+            if not card:
+                # Handle case where the deck is finished
+                self.say("Deck finished. New deck being shuffled. No jokers this time!")
+            elif card.is_joker:
+                # Handle Joker cards (add a life)
+                self.say("You just drew a Joker! +1 Life")
+            else:
+                # Valid card drawn
+                return card
+            self.say("Will now draw again...")
+            self.pause(1)
 
     def play(self):
         """
-        Main gameplay loop for Higher or Lower. Handles user interaction,
+        Gameplay loop for one game of Higher or Lower. Handles user interaction,
         card drawing, guesses, and game state updates.
+
+        Returns:
+            int: The final score.
         """
         # Start the game sequence
-        self.startSequence()
-        print("\nLET'S PLAY!")
+        if self.name is None:
+            self.startSequence()
+        self.say("\nLET'S PLAY!")
 
-        # Draw the first card
-        card0 = self.game.draw_card()
-        print(f"\nThe first card drawn was the {str(card0)}!")
+        # Draw the first card, redrawing Jokers and empty decks as for every later card
+        card0 = self.drawNext()
+        self.say(f"\nThe first card drawn was the {str(card0)}!")
 
         # Gameplay continues while the player has lives
         while self.game.lives > 0:
             # Inner loop for user input and actions
             while True:
-                print(f"\nThe current card is the {str(card0)}.")
-                action = input("\nGuess Higher (h), Lower (l), Bank (b), or display current status (d): ").lower()
-                if action not in ['h', 'l', 'b', 'd']:
-                    print("Invalid input. Please enter 'h' for Higher, 'l' for Lower, or 'b' to Bank your points.")
+                self.say(f"\nThe current card is the {str(card0)}.")
+                action = self.nextAction(card0)
+                if action not in ACTIONS:
+                    self.say("Invalid input. Please enter 'h' for Higher, 'l' for Lower, or 'b' to Bank your points.")
                 elif action == 'b':
                     # Bank current points
-                    print("You chose to bank your points!")
+                    self.say("You chose to bank your points!")
                     self.game.bankPoints()
-                    self.game.display_state()
+                    self.showState()
                 elif action == 'd':
-                    # Display the current game state
-                    self.game.display_state()
+                    # Display the current game state and the odds for the next card
+                    self.showState()
+                    self.showOdds(card0)
                 elif action == 'h':
                     # Guess higher
-                    print("You chose higher!")
+                    self.say("You chose higher!")
                     break
                 elif action == 'l':
                     # Guess lower
-                    print("You chose lower!")
-                    break
-            
-            # Loop for drawing the next card
-            while True:
-                print("\nDrawing card...")
-                time.sleep(1)  # Wait for user-friendliness when reading
-                print("...")
-                time.sleep(1)
-
-                card1 = self.game.draw_card()
-                if not card1:
-                    # Handle case where the deck is finished
-                    print("Deck finished. New deck being shuffled. No jokers this time!")
-                    print("Will now draw again...")
-                    time.sleep(1)
-                elif card1.rank == 'Joker':
-                    # Handle Joker cards (add a life)
-                    print("You just drew a Joker! +1 Life")
-                    print("Will now draw again...")
-                    time.sleep(1)
-                else:
-                    # Valid card drawn
+                    self.say("You chose lower!")
                     break
 
-            print(f"The next card drawn is the {str(card1)}.")
-            print("\n...")
+            # Draw the next card
+            self.say("\nDrawing card...")
+            self.pause(1)  # Wait for user-friendliness when reading
+            self.say("...")
+            self.pause(1)
+            card1 = self.drawNext()
+
+            self.say(f"The next card drawn is the {str(card1)}.")
+            self.say("\n...")
 
             # Check the player's guess
             guess = self.game.checkGuess(card0, card1, action)
+            self.guesses += 1
             if guess:
                 # Correct guess
                 points_gained = self.game.correct()
-                print(f"You were right!\n+{points_gained} points, +1 streak")
+                self.say(f"You were right!\n+{points_gained} points, +1 streak")
             else:
                 # Incorrect guess
                 points_lost = self.game.incorrect()
-                print(f"\nTough luck, you were wrong!\n{points_lost} unbanked points lost, -1 life")
+                self.say(f"\nTough luck, you were wrong!\n{points_lost} unbanked points lost, -1 life")
 
             # Display the current game state
-            self.game.display_state()
+            self.showState()
 
             # Set the last drawn card as the new base card
             card0 = card1
 
         # Game over sequence when lives run out
-        print("Uh oh! You've run out of lives!")
+        self.say("Uh oh! You've run out of lives!")
         final_score, position = self.game.gameOver(self.name)
-        print(f"Final score: {final_score}")
+        self.games_played += 1
+        self.say(f"Final score: {final_score}")
         if position == 1:
-            print("NEW HIGH SCORE!")
-        print(f"You have entered the leaderboard at {position}")
-        print()
-        self.leaderboard.display_leaderboard()
-        
-        # Prompt to play again
-        self.play_again()
+            self.say("NEW HIGH SCORE!")
+        self.say(f"You have entered the leaderboard at {position}")
+        self.say()
+        if self.actions is None:
+            self.game.leaderboard.display_leaderboard()
+        return final_score
+
+    def run(self):
+        """
+        Interactive session: plays games until the player declines another one.
+        """
+        while True:
+            self.play()
+            if not self.play_again():
+                break
+
+    def play_batch(self, games, flush_every=100):
+        """
+        Plays games back to back with the batch action source.
+
+        Args:
+            games (int): Number of games.
+            flush_every (int): Games between copies of buffered output to standard output.
+        Returns:
+            dict: games, guesses, score statistics, seconds and games per minute.
+        """
+        scores = []
+        started = time.perf_counter()
+        for i in range(games):
+            if i:
+                self.new_game()
+            scores.append(self.play())
+            if isinstance(self.output, io.StringIO) and (i + 1) % flush_every == 0:
+                self.flush()
+        self.flush()
+        elapsed = time.perf_counter() - started
+        return {'games': games, 'guesses': self.guesses, 'score_mean': sum(scores) / games, 'score_min': min(scores),
+                'score_max': max(scores), 'seconds': elapsed, 'games_per_min': games / elapsed * 60}
+
+    def flush(self):
+        """
+        Copies buffered output to standard output and empties the buffer.
+        """
+        if isinstance(self.output, io.StringIO):
+            sys.stdout.write(self.output.getvalue())
+            sys.stdout.flush()
+            self.output.seek(0)
+            self.output.truncate()
+
 
 def main():
     """
     Main entry point for the CLI version of the game.
-    Creates an instance of HigherOrLowerCLI and starts the game.
+    Plays interactively, or in batch mode when actions or a strategy are given.
     """
-    game = HigherOrLowerCLI()
-    game.play()
+    parser = argparse.ArgumentParser(description="Higher or Lower: Point Rush in the terminal.")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="record engine metrics and write them here on exit (.json for JSON, else Prometheus text)")
+    parser.add_argument("--batch", action="store_true", help="play without prompts or pauses (actions from stdin by default)")
+    parser.add_argument("--actions", metavar="FILE", help="batch actions (h, l, b or d, whitespace separated); - for stdin")
+    parser.add_argument("--strategy", help="batch mode with a built-in strategy, e.g. bank-at:10 or pivot:7")
+    parser.add_argument("--games", type=int, default=1, help="games to play in batch mode")
+    parser.add_argument("--quiet", action="store_true", help="batch mode: print only the summary")
+    parser.add_argument("--seed", type=int, help="batch mode: seed game i with seed + i")
+    parser.add_argument("--name", default="batch", help="batch mode: player name for the leaderboard")
+    parser.add_argument("--leaderboard", default=":memory:",
+                        help="batch mode: leaderboard database (default: in memory, discarded)")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.dump_on_exit(args.metrics)
+
+    if not (args.batch or args.actions or args.strategy):
+        game = HigherOrLowerCLI()
+        game.run()
+        return
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    try:
+        if args.strategy:
+            actions = strategy_actions(args.strategy)
+        elif args.actions and args.actions != "-":
+            with open(args.actions) as f:
+                actions = script_actions(f.read().split())
+        else:
+            actions = script_actions(sys.stdin.read().split())
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    leaderboard = Leaderboard(db_path=args.leaderboard)
+    game = HigherOrLowerCLI(actions, output=io.StringIO(), quiet=args.quiet, delay=0,
+                            leaderboard=leaderboard, seed=args.seed, name=args.name)
+    summary = game.play_batch(args.games)
+    leaderboard.close()
+    print(f"{summary['games']} games in {summary['seconds']:.2f}s ({summary['games_per_min']:,.0f} games/min): "
+          f"mean score {summary['score_mean']:.2f}, min {summary['score_min']}, max {summary['score_max']}, "
+          f"{summary['guesses'] / summary['games']:.1f} guesses per game")
 
 if __name__ == "__main__":
     main()
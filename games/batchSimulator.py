@@ -0,0 +1,486 @@
+"""
+Headless, vectorized simulator for the Higher or Lower game.
+
+Plays many games in lockstep with NumPy arrays, applying the same rules as HigherOrLower:
+a first deck with jokers (each joker drawn gives a life and is redrawn), refilled decks
+without jokers, ties count as wrong, and unbanked points are lost on a wrong guess. Any
+rule variant (see games.rules) can be simulated. Nothing is printed and the leaderboard is
+never touched.
+
+Every deck is derived from (seed, game index, deck number) with a counter-based hash,
+so game i sees the same cards whatever the batch size, chunking or strategy.
+
+Run from the repository root:
+    python -m games.batchSimulator --games 1000000 --strategy bank-at:10
+    python -m games.batchSimulator --cross-check 2000 --strategy bank-at:10
+    python -m games.batchSimulator --rules starting_lives=4,jokers=0
+"""
+
+from cards.arrayDeck import RANK_TABLE, check_guesses
+from cards.card import CARDS
+from cards.deck import Deck
+from cards.rankIndex import RankIndex
+from cards.rng import SeedSequence
+from collections import namedtuple
+from games.higherOrLower import HigherOrLower
+from games.rules import DEFAULT_RULES, parse_rules
+import argparse
+import functools
+import numpy as np
+
+GameState = namedtuple('GameState', ['card', 'streak', 'unbanked', 'score', 'lives'])
+GameState.__doc__ = """
+Arrays describing each live game, passed to strategies.
+
+Attributes:
+    card (numpy.ndarray): Rank of the current card, 1 (Ace) to 13 (King).
+    streak (numpy.ndarray): Consecutive correct guesses.
+    unbanked (numpy.ndarray): Points at risk.
+    score (numpy.ndarray): Banked points.
+    lives (numpy.ndarray): Remaining lives.
+"""
+
+_MASK64 = (1 << 64) - 1
+
+
+############ STRATEGIES ##############
+"""
+A strategy takes a GameState and returns two boolean arrays, (bank, higher): whether each
+game banks its points before guessing, and whether it then guesses Higher (else Lower).
+"""
+
+def always_higher():
+    """
+    Always guess Higher and never bank.
+
+    Returns:
+        callable: The strategy.
+    """
+    def strategy(state):
+        return np.zeros(state.card.shape, dtype=bool), np.ones(state.card.shape, dtype=bool)
+    return strategy
+
+
+def pivot(rank=7):
+    """
+    Guess Higher when the card is at or below a pivot rank, Lower above it, and never bank.
+
+    Args:
+        rank (int): The pivot rank.
+    Returns:
+        callable: The strategy.
+    """
+    def strategy(state):
+        return np.zeros(state.card.shape, dtype=bool), state.card <= rank
+    return strategy
+
+
+def bank_at(threshold=10, rank=7):
+    """
+    Bank once the unbanked points reach a threshold, then guess around a pivot rank.
+
+    Args:
+        threshold (int): Unbanked points at which to bank.
+        rank (int): The pivot rank.
+    Returns:
+        callable: The strategy.
+    """
+    def strategy(state):
+        return state.unbanked >= threshold, state.card <= rank
+    return strategy
+
+
+STRATEGIES = {
+    'always-higher': always_higher,
+    'pivot': pivot,
+    'bank-at': bank_at,
+}
+
+
+def make_strategy(spec):
+    """
+    Build a registered strategy from a specification such as 'bank-at:10' or 'pivot:7'.
+
+    Args:
+        spec (str): Strategy name, optionally followed by ':' and comma-separated integer arguments.
+    Returns:
+        callable: The strategy.
+    Raises:
+        ValueError: If the strategy name is not registered.
+    """
+    name, _, args = spec.partition(':')
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+    return STRATEGIES[name](*(int(arg) for arg in args.split(',') if arg))
+
+
+############ DECKS ##############
+
+def splitmix64(x):
+    """
+    SplitMix64 finaliser, used as a fast counter-based hash.
+
+    Args:
+        x (numpy.ndarray): uint64 values.
+    Returns:
+        numpy.ndarray: Hashed uint64 values.
+    """
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def seed_key(seed):
+    """
+    Derive the 64-bit key all decks of a simulation are hashed from.
+
+    Args:
+        seed (int or SeedSequence): The simulation seed.
+    Returns:
+        numpy.uint64: The key.
+    """
+    sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    return np.uint64(sequence.generate_seed() & _MASK64)
+
+
+@functools.lru_cache(maxsize=None)
+def unshuffled_codes(rules, first):
+    """
+    Card codes of an unshuffled deck, in the order Deck builds it.
+
+    Args:
+        rules (Rules): The rules, giving the deck and joker counts.
+        first (bool): True for the first deck, which has the jokers.
+    Returns:
+        numpy.ndarray: uint8 codes, or None when they are exactly 0..size-1.
+    """
+    codes = list(range(52)) * rules.decks
+    if first:
+        codes += [52 + i % 2 for i in range(rules.jokers)]
+    if codes == list(range(len(codes))):
+        return None
+    return np.array(codes, dtype=np.uint8)
+
+
+def deck_size(rules, first):
+    """
+    Args:
+        rules (Rules): The rules.
+        first (bool): True for the first deck.
+    Returns:
+        int: Cards in the deck.
+    """
+    return 52 * rules.decks + (rules.jokers if first else 0)
+
+
+def deck_codes(key, games, deck_no, rules=DEFAULT_RULES):
+    """
+    Shuffled card codes for deck number deck_no of each game, in draw order.
+
+    Deck 0 is the first deck with jokers; later decks have no jokers.
+
+    Args:
+        key (numpy.uint64): Key from seed_key.
+        games (numpy.ndarray): Game indices.
+        deck_no (int): Deck number, the same for every game in the call.
+        rules (Rules): The rules, giving the deck and joker counts.
+    Returns:
+        numpy.ndarray: uint8 array of shape (len(games), deck size).
+    """
+    size = deck_size(rules, deck_no == 0)
+    h = splitmix64(splitmix64(key + games.astype(np.uint64)) ^ np.uint64(deck_no))
+    sort_keys = splitmix64(h[:, None] ^ np.arange(size, dtype=np.uint64))
+    order = np.argsort(sort_keys, axis=1, kind='stable').astype(np.uint8)
+    # For the standard deck the unshuffled codes are 0..size-1, so the sorting permutation is the deck itself
+    base = unshuffled_codes(rules, deck_no == 0)
+    return order if base is None else base[order]
+
+
+############ SIMULATION ##############
+
+class SimulationResult:
+    """
+    Final scores and game lengths of a batch of simulated games.
+
+    Attributes:
+        scores (numpy.ndarray): Final banked score of each game.
+        lengths (numpy.ndarray): Number of guesses made in each game.
+    """
+
+    def __init__(self, scores, lengths):
+        """
+        Args:
+            scores (numpy.ndarray): Final banked score of each game.
+            lengths (numpy.ndarray): Number of guesses made in each game.
+        """
+        self.scores = scores
+        self.lengths = lengths
+
+    def summary(self, percentiles=(5, 25, 50, 75, 95, 99)):
+        """
+        Summarise the score and game length distributions.
+
+        Args:
+            percentiles (tuple): Percentiles to report.
+        Returns:
+            dict: Game count, mean and percentiles of scores and lengths.
+        """
+        summary = {'games': int(self.scores.size)}
+        for name, values in (('score', self.scores), ('length', self.lengths)):
+            summary[f'{name}_mean'] = float(values.mean())
+            for p, value in zip(percentiles, np.percentile(values, percentiles)):
+                summary[f'{name}_p{p}'] = float(value)
+        return summary
+
+    def score_distribution(self):
+        """
+        Count how many games finished with each score.
+
+        Returns:
+            numpy.ndarray: counts[s] is the number of games with final score s.
+        """
+        return np.bincount(self.scores)
+
+
+class _Batch:
+    """Compacted arrays for the games of one chunk that are still running."""
+
+    def __init__(self, key, games, rules):
+        self.key = key
+        self.games = games
+        self.rules = rules
+        self.refill_size = deck_size(rules, False)
+        n = games.size
+        self.deck = deck_codes(key, games, 0, rules)
+        self.deck_size = np.full(n, deck_size(rules, True), dtype=np.intp)
+        self.pos = np.zeros(n, dtype=np.intp)
+        self.deck_no = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, rules.starting_lives, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.unbanked = np.zeros(n, dtype=np.int64)
+        self.streak = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.card = np.zeros(n, dtype=np.uint8)
+
+    def draw(self, rows):
+        """Draw the next card for the given rows, moving to a new deck where one runs out."""
+        empty = rows[self.pos[rows] == self.deck_size[rows]]
+        if empty.size:
+            self.deck_no[empty] += 1
+            for deck_no in np.unique(self.deck_no[empty]):
+                refill = empty[self.deck_no[empty] == deck_no]
+                self.deck[refill, :self.refill_size] = deck_codes(self.key, self.games[refill], deck_no, self.rules)
+            self.deck_size[empty] = self.refill_size
+            self.pos[empty] = 0
+        codes = self.deck[rows, self.pos[rows]]
+        self.pos[rows] += 1
+        return codes
+
+    def draw_non_joker(self):
+        """Draw for every game until it gets a non-joker card, adding a life per joker."""
+        codes = self.draw(np.arange(self.games.size))
+        jokers = np.flatnonzero(RANK_TABLE[codes] == 0)
+        while jokers.size:
+            self.lives[jokers] += 1
+            codes[jokers] = self.draw(jokers)
+            jokers = jokers[RANK_TABLE[codes[jokers]] == 0]
+        return codes
+
+    def keep(self, mask):
+        """Drop the games that are not in mask."""
+        for name in ('games', 'deck', 'deck_size', 'pos', 'deck_no', 'lives', 'score',
+                     'unbanked', 'streak', 'length', 'card'):
+            setattr(self, name, getattr(self, name)[mask])
+
+
+def simulate(n_games, strategy, seed=0, start=0, chunk_size=100000, rules=None):
+    """
+    Simulate games in lockstep until every game has run out of lives.
+
+    Args:
+        n_games (int): Number of games to play.
+        strategy (callable or str): A strategy function, or a spec for make_strategy.
+        seed (int or SeedSequence): Seed all decks are derived from.
+        start (int): Index of the first game, so a large job can be split into shards.
+        chunk_size (int): Number of games simulated together, bounding memory use.
+        rules (Rules, optional): Rule variant. If None, the standard rules are used.
+    Returns:
+        SimulationResult: The final score and length of each game, in game index order.
+    """
+    if isinstance(strategy, str):
+        strategy = make_strategy(strategy)
+    rules = rules or DEFAULT_RULES
+    key = seed_key(seed)
+    base = rules.base_score
+    multiplier = rules.streak_multiplier
+
+    scores = np.zeros(n_games, dtype=np.int64)
+    lengths = np.zeros(n_games, dtype=np.int64)
+    for chunk_start in range(start, start + n_games, chunk_size):
+        games = np.arange(chunk_start, min(chunk_start + chunk_size, start + n_games), dtype=np.int64)
+        batch = _Batch(key, games, rules)
+        batch.card = batch.draw_non_joker()  # The first card
+
+        while batch.games.size:
+            bank, higher = strategy(GameState(RANK_TABLE[batch.card], batch.streak, batch.unbanked,
+                                              batch.score, batch.lives))
+
+            # Banking adds unbanked points to the score and resets the streak
+            batch.score += np.where(bank, batch.unbanked, 0)
+            batch.unbanked[bank] = 0
+            batch.streak[bank] = 0
+
+            card1 = batch.draw_non_joker()
+            correct = check_guesses(batch.card, card1, higher)
+
+            # Correct: earn base + streak bonus unbanked points. Incorrect: lose them and a life
+            batch.unbanked = np.where(correct, batch.unbanked + base + batch.streak * multiplier, 0)
+            batch.streak = np.where(correct, batch.streak + 1, 0)
+            batch.lives -= ~correct
+            batch.length += 1
+            batch.card = card1
+
+            over = batch.lives <= 0
+            if over.any():
+                scores[batch.games[over] - start] = batch.score[over]
+                lengths[batch.games[over] - start] = batch.length[over]
+                batch.keep(~over)
+
+    return SimulationResult(scores, lengths)
+
+
+############ CROSS-CHECK ##############
+
+class ReplayGame(HigherOrLower):
+    """
+    A HigherOrLower game dealt the same decks the simulator gives one game index,
+    used to check the simulator against the scalar rules engine.
+    """
+
+    def __init__(self, key, game, rules=None):
+        """
+        Args:
+            key (numpy.uint64): Key from seed_key.
+            game (int): Game index.
+            rules (Rules, optional): Rule variant. If None, the standard rules are used.
+        """
+        self.key = key
+        self.game_index = game
+        self.decks_used = 0
+        self.set_rules(rules)
+        super(ReplayGame, self).__init__(deck=self.dealt_deck(0), rules=rules)
+
+    def dealt_deck(self, deck_no):
+        """
+        Build a Deck holding the simulator's deck number deck_no for this game.
+
+        Args:
+            deck_no (int): Deck number.
+        Returns:
+            Deck: The deck, ordered so that draw_card deals in the simulator's order.
+        """
+        deck = Deck(include_jokers=deck_no == 0, n_decks=self.rules.decks, jokers=self.rules.jokers)
+        codes = deck_codes(self.key, np.array([self.game_index]), deck_no, self.rules)[0]
+        deck.cards = [CARDS[code] for code in reversed(codes.tolist())]  # draw_card pops from the end
+        deck.rank_index = RankIndex(deck.cards)
+        deck.shuffle = lambda: None  # Already in dealing order
+        return deck
+
+    def new_deck(self):
+        """
+        Returns:
+            Deck: The next deck the simulator would deal.
+        """
+        self.decks_used += 1
+        return self.dealt_deck(self.decks_used)
+
+
+def play_scalar(game, strategy):
+    """
+    Play one game to the end through the HigherOrLower methods, as the CLI does.
+
+    Args:
+        game (HigherOrLower): The game to play.
+        strategy (callable): A vectorized strategy, called with one-element arrays.
+    Returns:
+        tuple: (final score, number of guesses).
+    """
+    def draw_non_joker():
+        card = game.draw_card()
+        while not card or card.is_joker:
+            card = game.draw_card()
+        return card
+
+    card0 = draw_non_joker()
+    length = 0
+    while game.lives > 0:
+        state = GameState(*(np.array([value]) for value in (card0.rank, game.streak, game.unbanked_points,
+                                                             game.score, game.lives)))
+        bank, higher = strategy(state)
+        if bank[0]:
+            game.bankPoints()
+        card1 = draw_non_joker()
+        if game.checkGuess(card0, card1, 'h' if higher[0] else 'l'):
+            game.correct()
+        else:
+            game.incorrect()
+        length += 1
+        card0 = card1
+    return game.score, length
+
+
+def cross_check(n_games, strategy, seed=0, rules=None):
+    """
+    Play the same games with the simulator and with the scalar HigherOrLower class.
+
+    Args:
+        n_games (int): Number of games to compare.
+        strategy (callable or str): A strategy function, or a spec for make_strategy.
+        seed (int or SeedSequence): Seed the decks are derived from.
+        rules (Rules, optional): Rule variant. If None, the standard rules are used.
+    Returns:
+        list: Indices of games whose score or length differ (empty if the engines agree).
+    """
+    if isinstance(strategy, str):
+        strategy = make_strategy(strategy)
+    result = simulate(n_games, strategy, seed, rules=rules)
+    key = seed_key(seed)
+    mismatches = []
+    for game in range(n_games):
+        score, length = play_scalar(ReplayGame(key, game, rules), strategy)
+        if score != result.scores[game] or length != result.lengths[game]:
+            mismatches.append(game)
+    return mismatches
+
+
+def main():
+    """
+    Command line entry point: run a simulation or a cross-check and print the results.
+    """
+    import time
+
+    parser = argparse.ArgumentParser(description="Vectorized Higher or Lower simulator.")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to simulate")
+    parser.add_argument("--strategy", default="bank-at:10", help=f"one of {', '.join(STRATEGIES)}, e.g. bank-at:10")
+    parser.add_argument("--seed", type=int, default=0, help="seed the decks are derived from")
+    parser.add_argument("--rules", default="", help="rule variant, e.g. starting_lives=4,decks=2")
+    parser.add_argument("--cross-check", type=int, metavar="N", help="compare N games against HigherOrLower")
+    args = parser.parse_args()
+    rules = parse_rules(args.rules)
+
+    if args.cross_check:
+        mismatches = cross_check(args.cross_check, args.strategy, args.seed, rules)
+        print(f"Cross-check of {args.cross_check} games: {len(mismatches)} mismatches")
+        return
+
+    started = time.perf_counter()
+    result = simulate(args.games, args.strategy, args.seed, rules=rules)
+    elapsed = time.perf_counter() - started
+    for name, value in result.summary().items():
+        print(f"{name:>12}: {value:g}")
+    print(f"{args.games / elapsed:,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Compact append-only binary log of game events, with a vectorized replay.
+
+Every event is one fixed-width 12 byte record, struct '<BBHQ':
+    kind  (uint8)   One of the event kinds below.
+    card  (uint8)   Card code (see cards.card), or NO_CARD.
+    aux   (uint16)  Kind-specific small value.
+    value (uint64)  Kind-specific large value.
+
+    START      A new game. value: the integer seed, aux: 1 if the game was seeded, else 0.
+    DRAW       A non-joker card was drawn. card: its code.
+    JOKER      A joker was drawn. card: its code, aux: lives after the bonus life.
+    RESHUFFLE  The deck ran out and was replaced by a new shuffled deck.
+    GUESS      A guess was checked. card: the next card, aux: GUESS_LOWER and GUESS_CORRECT
+               flags, with the current card's code in the high byte.
+    BANK       Points were banked. value: the points banked.
+    END        The game ended. value: the final score, aux: the leaderboard position.
+
+Many games can share a log; each starts with a START record. Records are packed into a
+preallocated buffer and written in large blocks, so logging costs one struct.pack_into per event.
+The reader maps blocks of records straight onto a NumPy structured array, and replay applies the
+scoring rules to every game at once with array operations, never creating per-event objects.
+
+Run from the repository root:
+    python -m games.eventLog record games.log --games 10000
+    python -m games.eventLog replay games.log
+"""
+
+from cards.arrayDeck import check_guesses
+from games.higherOrLower import HigherOrLower
+import argparse
+import numpy as np
+import struct
+import time
+
+RECORD = struct.Struct('<BBHQ')
+RECORD_SIZE = RECORD.size
+EVENT_DTYPE = np.dtype([('kind', 'u1'), ('card', 'u1'), ('aux', '<u2'), ('value', '<u8')])
+
+# Event kinds
+START, DRAW, JOKER, RESHUFFLE, GUESS, BANK, END = range(7)
+KIND_NAMES = ('START', 'DRAW', 'JOKER', 'RESHUFFLE', 'GUESS', 'BANK', 'END')
+
+NO_CARD = 255
+GUESS_LOWER = 1    # aux flag: the guess was Lower (otherwise Higher)
+GUESS_CORRECT = 2  # aux flag: the guess was correct
+
+
+class EventLog:
+    """
+    Buffered writer appending event records to a binary file.
+
+    Attributes:
+        path (str): Log file path.
+        events (int): Number of events written, including those still buffered.
+    """
+
+    def __init__(self, path, buffer_events=8192):
+        """
+        Opens the log for appending.
+
+        Args:
+            path (str): Log file path. Created if it does not exist.
+            buffer_events (int): Events held in memory between writes.
+        """
+        self.path = path
+        self.file = open(path, 'ab')
+        self.buffer = bytearray(buffer_events * RECORD_SIZE)
+        self.offset = 0
+        self.events = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, kind, card=NO_CARD, aux=0, value=0):
+        """
+        Appends one event record.
+
+        Args:
+            kind (int): Event kind.
+            card (int): Card code, or NO_CARD.
+            aux (int): 16-bit kind-specific value.
+            value (int): 64-bit kind-specific value.
+        """
+        RECORD.pack_into(self.buffer, self.offset, kind, card, aux, value)
+        self.offset += RECORD_SIZE
+        self.events += 1
+        if self.offset == len(self.buffer):
+            self.flush()
+
+    def start(self, seed=None):
+        """
+        Logs the start of a game.
+
+        Args:
+            seed (int, optional): The game's integer seed, if it was seeded with one.
+        """
+        seeded = isinstance(seed, int) and 0 <= seed < 1 << 64
+        self.append(START, aux=int(seeded), value=seed if seeded else 0)
+
+    def draw(self, card):
+        """
+        Logs a non-joker card drawn.
+
+        Args:
+            card (Card): The card drawn.
+        """
+        self.append(DRAW, card.code)
+
+    def joker(self, card, lives):
+        """
+        Logs a joker drawn.
+
+        Args:
+            card (Card): The joker.
+            lives (int): Lives after the bonus life.
+        """
+        self.append(JOKER, card.code, lives)
+
+    def reshuffle(self):
+        """
+        Logs the deck being replaced by a new shuffled deck.
+        """
+        self.append(RESHUFFLE)
+
+    def guess(self, card0, card1, guess, correct):
+        """
+        Logs a checked guess.
+
+        Args:
+            card0 (Card): The current card.
+            card1 (Card): The next card drawn.
+            guess (str): 'h' for Higher or 'l' for Lower.
+            correct (bool): Whether the guess was correct.
+        """
+        flags = (GUESS_LOWER if guess == 'l' else 0) | (GUESS_CORRECT if correct else 0)
+        self.append(GUESS, card1.code, card0.code << 8 | flags)
+
+    def bank(self, points):
+        """
+        Logs points being banked.
+
+        Args:
+            points (int): The points banked.
+        """
+        self.append(BANK, value=points)
+
+    def end(self, score, position=0):
+        """
+        Logs the end of a game.
+
+        Args:
+            score (int): The final score.
+            position (int): The leaderboard position, or 0 if the score was not submitted.
+        """
+        self.append(END, aux=min(position, 0xFFFF), value=score)
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if self.offset:
+            self.file.write(memoryview(self.buffer)[:self.offset])
+            self.offset = 0
+        self.file.flush()
+
+    def close(self):
+        """
+        Flushes the buffer and closes the file.
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def read_events(path, block_events=1 << 20):
+    """
+    Streams a log as structured arrays, each holding only whole games.
+
+    Args:
+        path (str): Log file path.
+        block_events (int): Records read per block.
+    Yields:
+        numpy.ndarray: Events with EVENT_DTYPE fields, starting at a START record.
+    """
+    carry = np.empty(0, dtype=EVENT_DTYPE)
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(block_events * RECORD_SIZE)
+            if not data:
+                break
+            usable = len(data) - len(data) % RECORD_SIZE  # Ignore a partly written last record
+            events = np.frombuffer(data, dtype=EVENT_DTYPE, count=usable // RECORD_SIZE)
+            if carry.size:
+                events = np.concatenate((carry, events))
+            # Hold back the last game, which may continue in the next block
+            starts = np.flatnonzero(events['kind'] == START)
+            cut = starts[-1] if starts.size else 0
+            if cut:
+                yield events[:cut]
+            carry = events[cut:]
+    if carry.size:
+        yield carry
+
+
+def replay(events, base_score=HigherOrLower.BASE_SCORE, streak_multiplier=HigherOrLower.STREAK_MULTIPLIER,
+           starting_lives=HigherOrLower.STARTING_LIVES):
+    """
+    Replays whole games through the scoring rules and checks them against the logged outcomes.
+
+    Banks, wrong guesses and game starts reset the streak, so the events between two resets
+    are correct guesses worth base_score + streak * streak_multiplier each; a run of points
+    is banked if the next reset is a BANK.
+
+    Args:
+        events (numpy.ndarray): Events from read_events, starting at a START record.
+        base_score (int): Points for a correct guess.
+        streak_multiplier (int): Bonus points per streak step.
+        starting_lives (int): Lives at the start of a game.
+    Returns:
+        dict: 'scores' and 'lives' (numpy arrays, one entry per game), 'guesses' (int), and
+              'mismatches' (int): guesses whose logged result disagrees with the cards, plus
+              banks and final scores that disagree with the replayed points.
+    """
+    kind = events['kind']
+    aux = events['aux']
+    game = np.cumsum(kind == START) - 1
+    n_games = int(game[-1]) + 1
+
+    # Check each logged guess result against its cards
+    guess = kind == GUESS
+    correct = guess & (aux & GUESS_CORRECT != 0)
+    wrong = guess & ~correct
+    guesses = np.flatnonzero(guess)
+    actual = check_guesses((aux[guesses] >> 8).astype(np.uint8), events['card'][guesses],
+                           aux[guesses] & GUESS_LOWER == 0)
+    mismatches = int(np.count_nonzero(actual != correct[guesses]))
+
+    # Split the scoring events into runs, each starting at a reset
+    scoring = np.flatnonzero(guess | (kind == BANK) | (kind == START))
+    reset = ~correct[scoring]
+    run = np.cumsum(reset) - 1
+    run_starts = np.flatnonzero(reset)
+    streak = np.arange(scoring.size) - run_starts[run] - 1  # Streak before each correct guess
+    points = np.where(reset, 0, base_score + streak * streak_multiplier)
+    run_points = np.add.reduceat(points, run_starts)
+
+    # A run is banked when the following run starts with a BANK
+    run_kind = kind[scoring[run_starts]]
+    banked = np.zeros(run_starts.size, dtype=bool)
+    banked[:-1] = run_kind[1:] == BANK
+    banks = np.flatnonzero(run_kind == BANK)
+    mismatches += int(np.count_nonzero(events['value'][scoring[run_starts[banks]]] != run_points[banks - 1]))
+
+    run_game = game[scoring[run_starts]]
+    scores = np.zeros(n_games, dtype=np.int64)
+    np.add.at(scores, run_game[banked], run_points[banked])
+    lives = (starting_lives + np.bincount(game[kind == JOKER], minlength=n_games)
+             - np.bincount(game[wrong], minlength=n_games))
+
+    ends = np.flatnonzero(kind == END)
+    mismatches += int(np.count_nonzero(events['value'][ends].astype(np.int64) != scores[game[ends]]))
+    return {'scores': scores, 'lives': lives, 'guesses': int(guesses.size), 'mismatches': mismatches}
+
+
+def replay_file(path, block_events=1 << 20, **rules):
+    """
+    Replays every game in a log, streaming it in blocks.
+
+    Args:
+        path (str): Log file path.
+        block_events (int): Records read per block.
+        **rules: Rule overrides passed to replay.
+    Returns:
+        dict: As replay, for the whole log, plus 'events' (int).
+    """
+    scores, lives = [], []
+    guesses = mismatches = events = 0
+    for block in read_events(path, block_events):
+        result = replay(block, **rules)
+        scores.append(result['scores'])
+        lives.append(result['lives'])
+        guesses += result['guesses']
+        mismatches += result['mismatches']
+        events += block.size
+    return {'scores': np.concatenate(scores) if scores else np.zeros(0, dtype=np.int64),
+            'lives': np.concatenate(lives) if lives else np.zeros(0, dtype=np.int64),
+            'guesses': guesses, 'mismatches': mismatches, 'events': events}
+
+
+def record(path, n_games, strategy, seed=0):
+    """
+    Plays games through HigherOrLower with a batch simulator strategy, logging every event.
+
+    Args:
+        path (str): Log file path (appended to).
+        n_games (int): Number of games.
+        strategy (str): Strategy spec for games.batchSimulator.make_strategy.
+        seed (int): Seed of the first game; game i uses seed + i.
+    Returns:
+        tuple: (events written, seconds spent playing).
+    """
+    from games.batchSimulator import make_strategy, play_scalar
+
+    strategy = make_strategy(strategy)
+    started = time.perf_counter()
+    with EventLog(path) as log:
+        for i in range(n_games):
+            game = HigherOrLower(rng=seed + i, event_log=log)
+            play_scalar(game, strategy)
+            log.end(game.score)
+    return log.events, time.perf_counter() - started
+
+
+def main():
+    """
+    Command line entry point: record games to a log, or replay and check a log.
+    """
+    parser = argparse.ArgumentParser(description="Binary game event log for Higher or Lower.")
+    parser.add_argument("command", choices=("record", "replay"))
+    parser.add_argument("path", help="log file")
+    parser.add_argument("--games", type=int, default=10000, help="games to record")
+    parser.add_argument("--strategy", default="bank-at:10", help="strategy used when recording")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first recorded game")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        events, elapsed = record(args.path, args.games, args.strategy, args.seed)
+        print(f"Recorded {args.games} games ({events} events, {events * RECORD_SIZE} bytes) in {elapsed:.2f}s")
+        return
+
+    started = time.perf_counter()
+    result = replay_file(args.path)
+    elapsed = time.perf_counter() - started
+    games = result['scores'].size
+    print(f"Replayed {games} games ({result['events']} events, {result['guesses']} guesses) in {elapsed:.3f}s")
+    print(f"Mean score {result['scores'].mean():.3f}, {result['mismatches']} mismatches")
+    print(f"{result['events'] / elapsed:,.0f} events/sec")
+
+
+if __name__ == "__main__":
+    main()
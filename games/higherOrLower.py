@@ -1,5 +1,23 @@
+from cards.card import CARDS
 from cards.deck import Deck
+from cards.rankIndex import RankIndex
+from cards.rng import make_rng
+from games.rules import DEFAULT_RULES, Rules, validate
 from leaderboard.leaderboard import Leaderboard
+import random
+import struct
+
+FRESH_DECK_INDEX = RankIndex(CARDS[:52])  # Rank counts of a refilled deck (no jokers)
+
+# Snapshot layout: version, flags, lives, streak, score, unbanked points, current card code,
+# number of cards left, RNG seed, then (from version 2) the rules; followed by the deck's
+# card codes packed 6 bits each
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<BBBHIIBBQ')
+SNAPSHOT_RULES = struct.Struct('<BBBBB')
+SNAPSHOT_SECURE = 1  # flags bit: the game shuffles with the OS secure generator
+NO_CARD = 255
+CODE_BITS = 6        # Card codes 0-53 fit in 6 bits
 
 class HigherOrLower:
     """
@@ -7,34 +25,70 @@ class HigherOrLower:
     scorekeeping, and game state management.
     """
 
-    def __init__(self, leaderboard=None):
+    # Game constants of the standard rules; a game with other Rules overrides them on the instance
+    STARTING_LIVES = DEFAULT_RULES.starting_lives        # Initial number of lives
+    BASE_SCORE = DEFAULT_RULES.base_score                # Points for a correct guess
+    STREAK_MULTIPLIER = DEFAULT_RULES.streak_multiplier  # Bonus multiplier for streaks
+
+    def __init__(self, leaderboard=None, deck=None, rng=None, secure=False, event_log=None, rules=None):
         """
         Initialises the game with a shuffled deck, game constants, variables, and leaderboard.
 
         Args:
             leaderboard (Leaderboard, optional): Custom leaderboard instance.
-                                                 If None, a default leaderboard is created.
+                                                 If None, a default leaderboard is opened
+                                                 when the game ends.
+            deck (Deck or Shoe, optional): Card source to draw from. If None, a 54 card deck
+                                           with jokers is used. A Shoe refills itself, so
+                                           draw_card never returns None.
+            rng (random.Random, SeedSequence or int, optional): Generator or seed for shuffling.
+                Pass children of SeedSequence.spawn to reproduce many parallel games exactly.
+            secure (bool): If True, shuffles with the OS secure generator. Use this for games
+                           whose scores are submitted to the leaderboard.
+            event_log (EventLog, optional): Log receiving the game's draws, guesses and banks
+                                            (see games.eventLog).
+            rules (Rules, optional): Rule variant (lives, scoring, decks and jokers).
+                                     If None, the standard rules are used.
         """
+        self.set_rules(rules)
+        self.rng = make_rng(rng, secure)
+        self.secure = secure
+        self.event_log = event_log
+        if event_log:
+            event_log.start(rng if isinstance(rng, int) else None)
+
         # Initialise the deck with jokers and shuffle it
-        self.deck = Deck(include_jokers=True)
+        if deck is None:
+            deck = Deck(include_jokers=self.rules.jokers > 0, rng=self.rng,
+                        n_decks=self.rules.decks, jokers=self.rules.jokers)
+        self.deck = deck
         self.deck.shuffle()
 
-        # Game constants
-        self.STARTING_LIVES = 3  # Initial number of lives
-        self.BASE_SCORE = 2      # Points for a correct guess
-        self.STREAK_MULTIPLIER = 2  # Bonus multiplier for streaks
-
         # Game variables
         self.lives = self.STARTING_LIVES  # Player's remaining lives
         self.score = 0                   # Banked points
         self.unbanked_points = 0         # Points at risk (unbanked)
         self.streak = 0                  # Consecutive correct guesses
+        self.card = None                 # Last card drawn
 
-        # Initialise the leaderboard
-        if not leaderboard:
-            leaderboard = Leaderboard(db_path='leaderboard.db')  # Default leaderboard
-        else:
-            self.leaderboard = leaderboard
+        # Leaderboard for the final score; the default one is only opened by gameOver,
+        # so games that never finish (e.g. simulations) do not touch the database
+        self.leaderboard = leaderboard
+
+    def set_rules(self, rules):
+        """
+        Applies a rule variant, overriding the class game constants for this game.
+
+        Args:
+            rules (Rules, optional): The rules, or None for the standard rules.
+        Raises:
+            ValueError: If the rules are out of range.
+        """
+        self.rules = validate(rules) if rules is not None else DEFAULT_RULES
+        if self.rules != DEFAULT_RULES:
+            self.STARTING_LIVES = self.rules.starting_lives
+            self.BASE_SCORE = self.rules.base_score
+            self.STREAK_MULTIPLIER = self.rules.streak_multiplier
 
     def display_state(self):
         """
@@ -101,20 +155,59 @@ class HigherOrLower:
         self.card = self.deck.draw_card()
         if not self.card:
             # If the deck is empty, create and shuffle a new deck
-            self.deck = Deck()
-            self.deck.shuffle()
+            self.deck = self.new_deck()
+            if self.event_log:
+                self.event_log.reshuffle()
             return None
-        elif self.card.rank == 'Joker':
+        elif self.card.is_joker:
             # If a Joker is drawn, add a life
             self.lives += 1
+            if self.event_log:
+                self.event_log.joker(self.card, self.lives)
             return self.card
         else:
             # Return the drawn card
+            if self.event_log:
+                self.event_log.draw(self.card)
             return self.card
         
+    def new_deck(self):
+        """
+        Creates the shuffled deck that replaces an empty one. Refilled decks have no jokers.
+
+        Returns:
+            Deck: The new deck.
+        """
+        deck = Deck(rng=self.rng, n_decks=self.rules.decks)
+        deck.shuffle()
+        return deck
+
+    def odds(self, card=None):
+        """
+        Returns the odds for the next draw relative to a card, read from the deck's rank index.
+        If the deck is empty, the odds are those of the new deck that will replace it. If only
+        Jokers are left, the next draw is certainly a Joker and the card guessed against comes
+        from the new deck.
+
+        Args:
+            card (Card, optional): The card to compare against. Defaults to the last drawn card.
+        Returns:
+            dict: Probabilities keyed by 'higher', 'lower', 'tie' and 'joker' (see RankIndex.odds),
+                  or None if there is no card to compare against or the card is a Joker.
+        """
+        card = card or self.card
+        if not card or card.is_joker:
+            return None
+        index = self.deck.rank_index if len(self.deck) else FRESH_DECK_INDEX
+        odds = index.odds(card)
+        if odds is None:
+            odds = dict(FRESH_DECK_INDEX.odds(card), joker=1.0)  # Only Jokers are left
+        return odds
+
     def checkGuess(self, card0, card1, guess):
         """
-        Checks whether the player's guess (Higher or Lower) is correct.
+        Checks whether the player's guess (Higher or Lower) is correct. The guess is recorded
+        in the event log, so call this once per guess and reuse the result.
 
         Args:
             card0 (Card): The current card.
@@ -128,9 +221,12 @@ class HigherOrLower:
         if guess not in ['h', 'l']:
             raise ValueError('Invalid guess value used.')
         if guess == 'h':
-            return card1 > card0
+            correct = card1 > card0
         else:
-            return card1 < card0
+            correct = card1 < card0
+        if self.event_log:
+            self.event_log.guess(card0, card1, guess, correct)
+        return correct
         
     def incorrect(self):
         """
@@ -162,10 +258,92 @@ class HigherOrLower:
         Banks the unbanked points, adding them to the total score.
         Resets unbanked points and streak to zero.
         """
+        if self.event_log:
+            self.event_log.bank(self.unbanked_points)
         self.score += self.unbanked_points
         self.unbanked_points = 0
         self.streak = 0
 
+    def snapshot(self):
+        """
+        Packs the game state into a compact, versioned binary snapshot: the counters, the
+        remaining deck order as card codes and a seed for later shuffles. The leaderboard and
+        event log are left out.
+
+        The seed is drawn from a copy of the RNG, so taking a snapshot does not change this
+        game: a seeded game deals the same cards whether or not it is snapshotted. A restored
+        game deals the rest of the deck exactly as this one would, then shuffles its refills
+        from the stored seed, so restoring the same snapshot always gives the same game.
+        Secure games are not seeded; they resume with a new OS secure generator.
+
+        Returns:
+            bytes: The snapshot (67 bytes for a full 52 card deck).
+        Raises:
+            ValueError: If the game is not drawing from a Deck (e.g. a Shoe).
+        """
+        if type(self.deck) is not Deck:
+            raise ValueError('Only games drawing from a Deck can be snapshotted.')
+        flags = SNAPSHOT_SECURE if self.secure else 0
+        seed = 0
+        if not self.secure:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())  # Leave the game's own generator untouched
+            seed = rng.getrandbits(64)
+
+        packed = 0
+        for i, card in enumerate(self.deck.cards):
+            packed |= card.code << (CODE_BITS * i)
+        cards = len(self.deck.cards)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, flags, self.lives, self.streak, self.score,
+                                      self.unbanked_points, self.card.code if self.card else NO_CARD,
+                                      cards, seed)
+        return header + SNAPSHOT_RULES.pack(*self.rules) + packed.to_bytes((cards * CODE_BITS + 7) // 8, 'little')
+
+    @classmethod
+    def restore(cls, snapshot, leaderboard=None, event_log=None):
+        """
+        Rebuilds a game from a snapshot taken with snapshot().
+
+        Args:
+            snapshot (bytes): The snapshot.
+            leaderboard (Leaderboard, optional): Leaderboard for the restored game.
+            event_log (EventLog, optional): Log for the restored game's further events.
+        Returns:
+            HigherOrLower: The game, with the counters and deck order it was snapshotted with.
+        Raises:
+            ValueError: If the snapshot is malformed or from an unsupported version.
+        """
+        if len(snapshot) < SNAPSHOT_HEADER.size or snapshot[0] not in (1, SNAPSHOT_VERSION):
+            raise ValueError('Unsupported game snapshot.')
+        (version, flags, lives, streak, score, unbanked_points,
+         card, cards, seed) = SNAPSHOT_HEADER.unpack_from(snapshot)
+        rules = None  # Version 1 snapshots are always of the standard rules
+        body = snapshot[SNAPSHOT_HEADER.size:]
+        if version >= 2:
+            rules = Rules(*SNAPSHOT_RULES.unpack_from(body))
+            body = body[SNAPSHOT_RULES.size:]
+        if len(body) != (cards * CODE_BITS + 7) // 8:
+            raise ValueError('Truncated game snapshot.')
+
+        game = cls.__new__(cls)
+        game.set_rules(rules)
+        game.secure = bool(flags & SNAPSHOT_SECURE)
+        game.rng = make_rng(None, secure=True) if game.secure else random.Random(seed)
+        game.event_log = event_log
+        game.leaderboard = leaderboard
+        game.lives = lives
+        game.score = score
+        game.unbanked_points = unbanked_points
+        game.streak = streak
+        game.card = CARDS[card] if card != NO_CARD else None
+
+        packed = int.from_bytes(body, 'little')
+        mask = (1 << CODE_BITS) - 1
+        game.deck = Deck(rng=game.rng, n_decks=game.rules.decks)
+        game.deck.cards = [CARDS[(packed >> (CODE_BITS * i)) & mask] for i in range(cards)]
+        game.deck.rank_index = RankIndex(game.deck.cards)
+        return game
+
     def gameOver(self, name):
         """
         Handles the end of the game. Adds the player's score to the leaderboard.
@@ -175,7 +353,11 @@ class HigherOrLower:
         Returns:
             tuple: The final score and the leaderboard position.
         """
+        if self.leaderboard is None:
+            self.leaderboard = Leaderboard(db_path='leaderboard.db')  # Default leaderboard
         position = self.leaderboard.add_score(name, self.score)
+        if self.event_log:
+            self.event_log.end(self.score, position)
         return self.score, position
 
 def test():
@@ -0,0 +1,290 @@
+"""
+Optional hot-path metrics for the game engine: a call counter and a latency histogram for
+each instrumented method.
+
+Instrumentation costs nothing until it is enabled: enable() replaces each method on its class
+with a timing wrapper, and disable() puts the original back, so a game that never enables
+metrics runs exactly the original code with no per-call checks at all. Latencies include any
+instrumented methods called from inside the method.
+
+Metrics export as Prometheus text format or as a JSON snapshot:
+    from games import metrics
+    metrics.enable()
+    ...
+    metrics.REGISTRY.dump("metrics.prom")   # or "metrics.json"
+
+The CLI and GUI take --metrics PATH to enable metrics and dump them on exit. Run from the
+repository root to measure the overhead on simulated games:
+    python -m games.metrics --games 20000
+"""
+
+from collections import OrderedDict
+from games.higherOrLower import HigherOrLower
+from leaderboard.leaderboard import Leaderboard
+import argparse
+import atexit
+import bisect
+import functools
+import json
+import time
+
+# Methods instrumented by enable(), by class
+INSTRUMENTED = (
+    (HigherOrLower, ('draw_card', 'checkGuess', 'correct', 'incorrect', 'bankPoints', 'gameOver')),
+    (Leaderboard, ('add_score',)),
+)
+
+BUCKETS = tuple(1e-6 * 2 ** i for i in range(21))  # Upper bounds in seconds, 1us to about 1s
+METRIC_PREFIX = 'higherorlower'
+
+
+class Histogram:
+    """
+    Latency histogram with fixed exponential buckets.
+
+    Attributes:
+        counts (list): counts[i] is the number of observations in bucket i (the last is +Inf).
+        total (float): Sum of observed seconds.
+        calls (int): Number of observations.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        """
+        Args:
+            buckets (tuple): Increasing bucket upper bounds in seconds.
+        """
+        self.buckets = buckets
+        self.clear()
+
+    def clear(self):
+        """
+        Discards every observation.
+        """
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.calls = 0
+
+    def observe(self, seconds):
+        """
+        Records one observation.
+
+        Args:
+            seconds (float): The latency.
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.calls += 1
+
+    def percentile(self, q):
+        """
+        Upper bound of the bucket holding a percentile.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+        Returns:
+            float: The bucket bound in seconds (inf for the overflow bucket), or 0.0 if empty.
+        """
+        if not self.calls:
+            return 0.0
+        target = q / 100 * self.calls
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class Registry:
+    """
+    Named histograms of instrumented methods.
+
+    Attributes:
+        histograms (OrderedDict): Method name (e.g. 'HigherOrLower.draw_card') -> Histogram.
+    """
+
+    def __init__(self):
+        self.histograms = OrderedDict()
+
+    def histogram(self, name):
+        """
+        Returns the histogram of a method, creating it if needed.
+
+        Args:
+            name (str): Method name.
+        Returns:
+            Histogram: The histogram.
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def reset(self):
+        """
+        Clears every histogram in place, so installed timing wrappers keep recording into them.
+        """
+        for histogram in self.histograms.values():
+            histogram.clear()
+
+    def to_prometheus(self):
+        """
+        Returns:
+            str: Every metric in Prometheus text exposition format.
+        """
+        lines = [f"# HELP {METRIC_PREFIX}_calls_total Calls of instrumented game engine methods.",
+                 f"# TYPE {METRIC_PREFIX}_calls_total counter"]
+        for name, histogram in self.histograms.items():
+            lines.append(f'{METRIC_PREFIX}_calls_total{{method="{name}"}} {histogram.calls}')
+        lines += [f"# HELP {METRIC_PREFIX}_call_seconds Latency of instrumented game engine methods.",
+                  f"# TYPE {METRIC_PREFIX}_call_seconds histogram"]
+        for name, histogram in self.histograms.items():
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}_call_seconds_bucket{{method="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_call_seconds_bucket{{method="{name}",le="+Inf"}} {histogram.calls}')
+            lines.append(f'{METRIC_PREFIX}_call_seconds_sum{{method="{name}"}} {histogram.total:.9f}')
+            lines.append(f'{METRIC_PREFIX}_call_seconds_count{{method="{name}"}} {histogram.calls}')
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Method name -> calls, total seconds, mean, p50 and p99 (bucket bounds, in
+                  microseconds) and the raw bucket counts.
+        """
+        methods = {}
+        for name, histogram in self.histograms.items():
+            methods[name] = {
+                'calls': histogram.calls,
+                'seconds': histogram.total,
+                'mean_us': histogram.total / histogram.calls * 1e6 if histogram.calls else 0.0,
+                'p50_us': histogram.percentile(50) * 1e6,
+                'p99_us': histogram.percentile(99) * 1e6,
+                'buckets': {f"{bound:g}": count for bound, count in zip(histogram.buckets, histogram.counts)},
+                'overflow': histogram.counts[-1],
+            }
+        return {'enabled': enabled(), 'methods': methods}
+
+    def dump(self, path):
+        """
+        Writes the metrics to a file: a JSON snapshot if the path ends in '.json', otherwise
+        Prometheus text format.
+
+        Args:
+            path (str): Output file path.
+        """
+        with open(path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump(self.snapshot(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+REGISTRY = Registry()  # Shared registry used by enable() by default
+_originals = {}        # (class, method name) -> original function, while enabled
+_registry = None       # Registry receiving the measurements, while enabled
+
+
+def _timed(func, histogram):
+    """Wrap a function to record each call's latency in a histogram."""
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(perf_counter() - started)
+    return wrapper
+
+
+def enable(registry=REGISTRY):
+    """
+    Installs the timing wrappers on every instrumented method. Does nothing if already enabled
+    with the same registry; if enabled with another, the wrappers switch to this one.
+
+    Args:
+        registry (Registry): Registry receiving the measurements.
+    """
+    global _registry
+    if _originals:
+        if registry is _registry:
+            return
+        disable()
+    _registry = registry
+    for cls, names in INSTRUMENTED:
+        for name in names:
+            original = cls.__dict__[name]
+            _originals[(cls, name)] = original
+            setattr(cls, name, _timed(original, registry.histogram(f"{cls.__name__}.{name}")))
+
+
+def disable():
+    """
+    Restores the original methods, so calls are no longer measured or slowed down.
+    """
+    global _registry
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+    _registry = None
+
+
+def enabled():
+    """
+    Returns:
+        bool: True if the timing wrappers are installed.
+    """
+    return bool(_originals)
+
+
+def dump_on_exit(path, registry=REGISTRY):
+    """
+    Enables metrics and writes them to a file when the process exits.
+
+    Args:
+        path (str): Output file path (see Registry.dump).
+        registry (Registry): Registry receiving the measurements.
+    """
+    enable(registry)
+    atexit.register(registry.dump, path)
+
+
+def main():
+    """
+    Command line entry point: play simulated games with metrics disabled and enabled, and
+    print the overhead and the per-method latencies.
+    """
+    from games.batchSimulator import make_strategy, play_scalar
+
+    parser = argparse.ArgumentParser(description="Hot-path metrics overhead for the Higher or Lower engine.")
+    parser.add_argument("--games", type=int, default=20000, help="games to play in each run")
+    parser.add_argument("--strategy", default="bank-at:10", help="strategy spec, e.g. bank-at:10")
+    parser.add_argument("--output", help="also dump the metrics here (.json for JSON, else Prometheus text)")
+    args = parser.parse_args()
+    strategy = make_strategy(args.strategy)
+
+    def play():
+        started = time.perf_counter()
+        for seed in range(args.games):
+            play_scalar(HigherOrLower(rng=seed), strategy)
+        return time.perf_counter() - started
+
+    disabled_seconds = play()
+    enable()
+    enabled_seconds = play()
+    disable()
+
+    print(f"{'method':>28}{'calls':>10}{'mean us':>9}{'p50 us':>8}{'p99 us':>8}")
+    for name, values in REGISTRY.snapshot()['methods'].items():
+        print(f"{name:>28}{values['calls']:>10}{values['mean_us']:>9.2f}{values['p50_us']:>8g}{values['p99_us']:>8g}")
+    print(f"{args.games} games: {disabled_seconds:.2f}s disabled, {enabled_seconds:.2f}s enabled "
+          f"({enabled_seconds / disabled_seconds - 1:+.1%})")
+    if args.output:
+        REGISTRY.dump(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Multi-core Monte Carlo runner for the batch simulator.
+
+A job of n games is cut into fixed shards of consecutive game indices. Each shard is simulated
+in a worker process and sent back as an integer Aggregate (counts, sums and histograms), never
+as per-game results. Every game's decks are derived from the seed and its game index (see
+games.batchSimulator), and the aggregates only hold integers, so merging them in any order
+gives exactly the same result whatever the number of workers.
+
+Run from the repository root:
+    python -m games.monteCarlo --games 10000000 --strategy bank-at:10
+    python -m games.monteCarlo --games 2000000 --scaling
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from games.batchSimulator import STRATEGIES, simulate
+import argparse
+import numpy as np
+import os
+import sys
+import time
+
+
+class Aggregate:
+    """
+    Exactly mergeable summary of a set of games.
+
+    Attributes:
+        games (int): Number of games.
+        score_total (int): Sum of final scores.
+        score_squares (int): Sum of squared final scores.
+        length_total (int): Sum of game lengths.
+        score_counts (numpy.ndarray): score_counts[s] is the number of games with final score s.
+        length_counts (numpy.ndarray): length_counts[n] is the number of games lasting n guesses.
+    """
+
+    def __init__(self):
+        """
+        Creates an empty aggregate.
+        """
+        self.games = 0
+        self.score_total = 0
+        self.score_squares = 0
+        self.length_total = 0
+        self.score_counts = np.zeros(0, dtype=np.int64)
+        self.length_counts = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Summarise a SimulationResult.
+
+        Args:
+            result (SimulationResult): Simulated games.
+        Returns:
+            Aggregate: The summary.
+        """
+        aggregate = cls()
+        aggregate.games = int(result.scores.size)
+        aggregate.score_total = int(result.scores.sum())
+        aggregate.score_squares = int((result.scores * result.scores).sum())
+        aggregate.length_total = int(result.lengths.sum())
+        aggregate.score_counts = np.bincount(result.scores)
+        aggregate.length_counts = np.bincount(result.lengths)
+        return aggregate
+
+    def merge(self, other):
+        """
+        Add another aggregate's games to this one.
+
+        Args:
+            other (Aggregate): The aggregate to add.
+        Returns:
+            Aggregate: self, for chaining.
+        """
+        self.games += other.games
+        self.score_total += other.score_total
+        self.score_squares += other.score_squares
+        self.length_total += other.length_total
+        self.score_counts = _add_counts(self.score_counts, other.score_counts)
+        self.length_counts = _add_counts(self.length_counts, other.length_counts)
+        return self
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The aggregate as JSON-serializable integers and lists.
+        """
+        return {'games': self.games, 'score_total': self.score_total, 'score_squares': self.score_squares,
+                'length_total': self.length_total, 'score_counts': self.score_counts.tolist(),
+                'length_counts': self.length_counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an aggregate saved with to_dict.
+
+        Args:
+            data (dict): Output of to_dict.
+        Returns:
+            Aggregate: The aggregate.
+        """
+        aggregate = cls()
+        aggregate.games = data['games']
+        aggregate.score_total = data['score_total']
+        aggregate.score_squares = data['score_squares']
+        aggregate.length_total = data['length_total']
+        aggregate.score_counts = np.array(data['score_counts'], dtype=np.int64)
+        aggregate.length_counts = np.array(data['length_counts'], dtype=np.int64)
+        return aggregate
+
+    def __eq__(self, other):
+        """
+        Checks whether two aggregates describe identical sets of results.
+
+        Args:
+            other (Aggregate): The aggregate to compare with.
+        Returns:
+            bool: True if every total and histogram matches.
+        """
+        if not isinstance(other, Aggregate):
+            return NotImplemented
+        return ((self.games, self.score_total, self.score_squares, self.length_total) ==
+                (other.games, other.score_total, other.score_squares, other.length_total)
+                and np.array_equal(self.score_counts, other.score_counts)
+                and np.array_equal(self.length_counts, other.length_counts))
+
+    def percentile(self, counts, q):
+        """
+        Read a percentile from a histogram.
+
+        Args:
+            counts (numpy.ndarray): score_counts or length_counts.
+            q (float): Percentile between 0 and 100.
+        Returns:
+            int: The smallest value with at least q percent of games at or below it.
+        """
+        return int(np.searchsorted(np.cumsum(counts), q / 100 * self.games))
+
+    def summary(self, percentiles=(5, 25, 50, 75, 95, 99)):
+        """
+        Summarise the score and game length distributions.
+
+        Args:
+            percentiles (tuple): Percentiles to report.
+        Returns:
+            dict: Game count, mean score with its standard error, mean length and percentiles.
+        """
+        mean = self.score_total / self.games
+        variance = self.score_squares / self.games - mean * mean
+        summary = {'games': self.games, 'score_mean': mean,
+                   'score_stderr': (max(variance, 0) / self.games) ** 0.5,
+                   'length_mean': self.length_total / self.games}
+        for p in percentiles:
+            summary[f'score_p{p}'] = self.percentile(self.score_counts, p)
+        for p in percentiles:
+            summary[f'length_p{p}'] = self.percentile(self.length_counts, p)
+        return summary
+
+
+def _add_counts(a, b):
+    """Add two histograms of possibly different lengths."""
+    if a.size < b.size:
+        a, b = b, a
+    total = a.copy()
+    total[:b.size] += b
+    return total
+
+
+def run_shard(seed, strategy, start, count, chunk_size, rules=None):
+    """
+    Simulate one shard of games; runs in a worker process.
+
+    Args:
+        seed (int): Simulation seed.
+        strategy (str): Strategy spec for make_strategy (specs pickle, closures do not).
+        start (int): Index of the shard's first game.
+        count (int): Number of games in the shard.
+        chunk_size (int): Games simulated together.
+        rules (Rules, optional): Rule variant. If None, the standard rules are used.
+    Returns:
+        Aggregate: The shard's results.
+    """
+    return Aggregate.from_result(simulate(count, strategy, seed, start, chunk_size, rules))
+
+
+def run(n_games, strategy, seed=0, workers=None, shard_size=50000, chunk_size=50000, progress=None, rules=None):
+    """
+    Simulate games across a process pool and merge the shard aggregates.
+
+    Args:
+        n_games (int): Number of games.
+        strategy (str): Strategy spec, e.g. 'bank-at:10'.
+        seed (int): Simulation seed.
+        workers (int, optional): Worker processes. Defaults to the number of cores; with one
+                                 worker the shards run in this process.
+        shard_size (int): Games per shard. The result does not depend on it.
+        chunk_size (int): Games each worker simulates together, bounding its memory use.
+        progress (callable, optional): Called as progress(games done, n_games, seconds elapsed)
+                                       after each shard.
+        rules (Rules, optional): Rule variant. If None, the standard rules are used.
+    Returns:
+        Aggregate: The merged results, identical for any number of workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = [(start, min(shard_size, n_games - start)) for start in range(0, n_games, shard_size)]
+    total = Aggregate()
+    done = 0
+    started = time.perf_counter()
+
+    def collect(aggregate):
+        nonlocal done
+        total.merge(aggregate)
+        done += aggregate.games
+        if progress:
+            progress(done, n_games, time.perf_counter() - started)
+
+    if workers == 1:
+        for start, count in shards:
+            collect(run_shard(seed, strategy, start, count, chunk_size, rules))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_shard, seed, strategy, start, count, chunk_size, rules)
+                   for start, count in shards]
+        for future in as_completed(futures):
+            collect(future.result())
+    return total
+
+
+def print_progress(done, n_games, elapsed):
+    """
+    Progress callback printing games done and throughput on one line.
+    """
+    rate = done / elapsed if elapsed else 0.0
+    sys.stdout.write(f"\r{done:,}/{n_games:,} games, {rate:,.0f} games/sec")
+    sys.stdout.flush()
+    if done == n_games:
+        sys.stdout.write("\n")
+
+
+def scaling(n_games, strategy, seed=0, max_workers=None, shard_size=50000):
+    """
+    Run the same job with 1, 2, 4, ... workers up to the core count, check that every run gives
+    the same aggregate, and print the throughput of each.
+
+    Args:
+        n_games (int): Number of games per run.
+        strategy (str): Strategy spec.
+        seed (int): Simulation seed.
+        max_workers (int, optional): Largest worker count. Defaults to the number of cores.
+        shard_size (int): Games per shard.
+    Returns:
+        list: (workers, seconds) for each run.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+
+    timings = []
+    reference = None
+    print(f"{'workers':>8}{'seconds':>9}{'games/sec':>12}{'per core':>11}{'speedup':>9}")
+    for workers in counts:
+        started = time.perf_counter()
+        aggregate = run(n_games, strategy, seed, workers, shard_size)
+        elapsed = time.perf_counter() - started
+        if reference is None:
+            reference = aggregate
+        elif aggregate != reference:
+            raise RuntimeError(f'Results with {workers} workers differ from the single worker run.')
+        timings.append((workers, elapsed))
+        print(f"{workers:>8}{elapsed:>9.2f}{n_games / elapsed:>12,.0f}"
+              f"{n_games / elapsed / workers:>11,.0f}{timings[0][1] / elapsed:>8.2f}x")
+    return timings
+
+
+def main():
+    """
+    Command line entry point: run a job, or a scaling report, and print the results.
+    """
+    parser = argparse.ArgumentParser(description="Multi-core Monte Carlo runner for Higher or Lower.")
+    parser.add_argument("--games", type=int, default=1000000, help="number of games to simulate")
+    parser.add_argument("--strategy", default="bank-at:10", help=f"one of {', '.join(STRATEGIES)}, e.g. bank-at:10")
+    parser.add_argument("--seed", type=int, default=0, help="seed the decks are derived from")
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of cores)")
+    parser.add_argument("--shard-size", type=int, default=50000, help="games per shard")
+    parser.add_argument("--scaling", action="store_true", help="compare 1, 2, 4, ... workers")
+    args = parser.parse_args()
+
+    if args.scaling:
+        scaling(args.games, args.strategy, args.seed, args.workers, args.shard_size)
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    aggregate = run(args.games, args.strategy, args.seed, workers, args.shard_size, progress=print_progress)
+    elapsed = time.perf_counter() - started
+    for name, value in aggregate.summary().items():
+        print(f"{name:>12}: {value:g}")
+    print(f"{args.games / elapsed / workers:,.0f} games/sec per core ({workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Configurable rule set for the Higher or Lower game.
+"""
+
+from collections import namedtuple
+
+Rules = namedtuple('Rules', ['starting_lives', 'base_score', 'streak_multiplier', 'decks', 'jokers'],
+                   defaults=(3, 2, 2, 1, 2))
+Rules.__doc__ = """
+Rule constants of a game variant. Rules are immutable and hashable, so they can key caches.
+
+Attributes:
+    starting_lives (int): Lives at the start of the game.
+    base_score (int): Points for a correct guess.
+    streak_multiplier (int): Bonus points per streak step.
+    decks (int): Standard 52 card decks shuffled together, both at the start and on each refill.
+    jokers (int): Jokers in the first deck (refilled decks never have jokers).
+"""
+
+MAX_BYTE = 255  # Largest lives and score values a game snapshot can store
+
+DEFAULT_RULES = Rules()  # The standard game: 3 lives, 2 + 2 * streak points, one deck, two jokers
+
+
+def parse_rules(spec):
+    """
+    Build rules from a comma-separated 'name=value' specification, e.g. 'starting_lives=4,jokers=0'.
+    Unnamed rules keep their default values.
+
+    Args:
+        spec (str): The specification. An empty string gives the default rules.
+    Returns:
+        Rules: The rules.
+    Raises:
+        ValueError: If a name is not a rule or a value is out of range (see validate).
+    """
+    values = {}
+    for item in filter(None, spec.split(',')):
+        name, _, value = item.partition('=')
+        if name not in Rules._fields:
+            raise ValueError(f"Unknown rule '{name}'. Choose from: {', '.join(Rules._fields)}")
+        values[name] = int(value)
+    return validate(DEFAULT_RULES._replace(**values))
+
+
+def validate(rules):
+    """
+    Check that rules describe a playable game.
+
+    Args:
+        rules (Rules): The rules.
+    Returns:
+        Rules: The same rules.
+    Raises:
+        ValueError: If a value is out of range.
+    """
+    if rules.starting_lives < 1 or rules.base_score < 0 or rules.streak_multiplier < 0:
+        raise ValueError('Rules need at least one life and non-negative scores.')
+    if not 1 <= rules.decks <= 4 or not 0 <= rules.jokers <= 8:
+        raise ValueError('Rules allow 1 to 4 decks and 0 to 8 jokers.')
+    # Game snapshots store the rules and the lives in single bytes; each joker adds a life
+    if (rules.starting_lives + rules.jokers > MAX_BYTE or rules.base_score > MAX_BYTE
+            or rules.streak_multiplier > MAX_BYTE):
+        raise ValueError(f'Rules allow at most {MAX_BYTE} lives including jokers, and scores up to {MAX_BYTE}.')
+    return rules
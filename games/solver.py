@@ -0,0 +1,508 @@
+"""
+Optimal-policy solver for the Higher or Lower game.
+
+Finds the move (Higher, Lower or Bank) that maximises the expected final score, by memoized
+dynamic programming over game states: (remaining rank counts, jokers left, current card,
+streak, lives). Unbanked points are not part of the state because they follow from the streak.
+
+State keys are canonicalized: suits never matter, so the remaining cards are stored as packed
+per-rank counts, and a state is equivalent to its mirror image (every rank r replaced by
+14 - r, with Higher and Lower swapped), so only one of each pair is stored.
+
+An exact solution is only feasible for small decks (a full deck alone has 5**13 rank count
+combinations). For the real 52 card deck, pass a horizon: the remaining cards are followed
+exactly for that many draws and the value beyond is taken from the solution of the game
+with an infinite deck, in which any jokers still to come arrive at the rate the remaining
+deck implies.
+
+Run from the repository root:
+    python -m games.solver
+"""
+
+from collections import OrderedDict
+from games.higherOrLower import HigherOrLower
+import argparse
+import json
+import numpy as np
+import time
+
+MOVES = ('h', 'l', 'b')  # Higher, Lower, Bank
+MIRRORED = {'h': 'l', 'l': 'h', 'b': 'b'}
+
+COUNT_BITS = 3  # Bits per rank in a packed count, so at most 7 copies of each rank
+
+
+class Solver:
+    """
+    Computes and caches the expected-score-maximising move for any state of a game.
+
+    Refilled decks hold `copies` of every rank and no jokers, as with HigherOrLower.
+    Streaks are capped at max_streak, where banking is forced; with the default rules
+    banking is optimal long before the cap.
+
+    Attributes:
+        table (OrderedDict): Canonical state key -> (move index, expected future banked points),
+                             bounded to cache_size entries, least recently used first.
+        hits (int): Number of table lookups that found a solved state.
+        misses (int): Number of states solved.
+    """
+
+    def __init__(self, ranks=13, copies=4, jokers=2, horizon=None, max_streak=30,
+                 base_score=HigherOrLower.BASE_SCORE, streak_multiplier=HigherOrLower.STREAK_MULTIPLIER,
+                 starting_lives=HigherOrLower.STARTING_LIVES, cache_size=2000000, tolerance=1e-9):
+        """
+        Args:
+            ranks (int): Number of ranks in a deck, at most 13.
+            copies (int): Cards of each rank in a deck, at most 7.
+            jokers (int): Jokers in the first deck, at most 3.
+            horizon (int, optional): Draws followed exactly before falling back to the infinite
+                                     deck solution, at most 15. If None, the game is solved
+                                     exactly, which is only feasible for small decks.
+            max_streak (int): Streak at which banking is forced, at most 63.
+            base_score (int): Points for a correct guess.
+            streak_multiplier (int): Bonus points per streak step.
+            starting_lives (int): Lives at the start of the game.
+            cache_size (int): Maximum number of solved states kept in the table.
+            tolerance (float): Convergence threshold for the value iterations.
+        Raises:
+            ValueError: If a parameter is outside the range the state keys can hold, or an
+                        exact solution is requested for a deck that is too large.
+        """
+        if not (1 <= ranks <= 13 and 1 <= copies < 1 << COUNT_BITS and 0 <= jokers <= 3
+                and 1 <= max_streak <= 63 and 1 <= starting_lives + jokers <= 15):
+            raise ValueError('Solver parameters out of range.')
+        if horizon is not None and not 1 <= horizon <= 15:
+            raise ValueError('The horizon must be between 1 and 15 draws.')
+        if horizon is None and (copies + 1) ** ranks > 100000:
+            raise ValueError('The deck is too large to solve exactly; pass a horizon.')
+
+        self.ranks = ranks
+        self.copies = copies
+        self.jokers = jokers
+        self.horizon = horizon
+        self.max_streak = max_streak
+        self.base_score = base_score
+        self.streak_multiplier = streak_multiplier
+        self.starting_lives = starting_lives
+        self.max_lives = starting_lives + jokers  # Each joker adds a life
+        self.cache_size = cache_size
+        self.tolerance = tolerance
+
+        self.full_counts = self.pack([copies] * ranks)
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.unbanked_points = [self.unbanked(streak) for streak in range(max_streak + 1)]
+
+        # Values of the infinite deck game, used beyond the horizon and as the first
+        # estimate of the values at the start of a refilled deck
+        self.fallback_values, self.fallback_moves, *self.fallback_guesses = self._solve_infinite()
+        self.joker_fallbacks = {}    # (jokers, cards left) -> infinite deck solution with jokers to come
+        self.horizon_fallbacks = {}  # Packed counts << 2 | jokers -> its (values, moves), at most cache_size
+        self.boundary_values = self.fallback_values
+        self.boundary_moves = self.fallback_moves
+
+    def params(self):
+        """
+        Returns:
+            dict: The parameters the solver was created with.
+        """
+        return {'ranks': self.ranks, 'copies': self.copies, 'jokers': self.jokers,
+                'horizon': self.horizon, 'max_streak': self.max_streak,
+                'base_score': self.base_score, 'streak_multiplier': self.streak_multiplier,
+                'starting_lives': self.starting_lives, 'cache_size': self.cache_size,
+                'tolerance': self.tolerance}
+
+    def unbanked(self, streak):
+        """
+        Unbanked points held after a streak of correct guesses.
+
+        Args:
+            streak (int): Consecutive correct guesses.
+        Returns:
+            int: The unbanked points.
+        """
+        return streak * self.base_score + self.streak_multiplier * streak * (streak - 1) // 2
+
+    def pack(self, counts):
+        """
+        Pack per-rank counts into one integer, COUNT_BITS bits per rank.
+
+        Args:
+            counts (sequence): Remaining cards of ranks 1 to ranks.
+        Returns:
+            int: The packed counts.
+        Raises:
+            ValueError: If a count is more than the solver's copies per rank.
+        """
+        packed = 0
+        for rank, count in enumerate(counts):
+            if not 0 <= count <= self.copies:
+                raise ValueError(f'Deck has {count} cards of one rank; the solver expects at most {self.copies}.')
+            packed |= count << (COUNT_BITS * rank)
+        return packed
+
+    def _size(self, counts):
+        """Number of cards in packed counts."""
+        mask = (1 << COUNT_BITS) - 1
+        return sum((counts >> (COUNT_BITS * rank)) & mask for rank in range(self.ranks))
+
+    def _mirror(self, counts):
+        """Packed counts with the rank order reversed."""
+        mirrored = 0
+        mask = (1 << COUNT_BITS) - 1
+        for rank in range(self.ranks):
+            mirrored = (mirrored << COUNT_BITS) | (counts >> (COUNT_BITS * rank)) & mask
+        return mirrored
+
+    ############ INFINITE DECK ##############
+
+    def _solve_infinite(self, joker_rate=0.0, after_joker=None):
+        """
+        Solve the game with an infinite deck (every rank equally likely) by value iteration.
+
+        Args:
+            joker_rate (float): Chance that a draw is a joker, which gives a life and is redrawn.
+            after_joker (tuple, optional): (higher, lower) guess values of the game once the
+                                           joker has been drawn, as returned by this method.
+                                           Required if joker_rate is not 0.
+        Returns:
+            tuple: (values, moves) arrays indexed [lives, streak, card], then (higher, lower)
+                   arrays of the guess values indexed [lives, streak, card - 1].
+        """
+        n, streaks = self.ranks, self.max_streak
+        p = 1.0 / n
+        rank = np.arange(1, n + 1)
+        above = (rank[None, :] > rank[:, None]) * p  # above[card, next]: probability of a higher next card
+        below = (rank[None, :] < rank[:, None]) * p
+        unbanked = np.array(self.unbanked_points, dtype=float)[:, None]
+
+        values = np.zeros((self.max_lives + 1, streaks + 1, n + 1))
+        moves = np.zeros(values.shape, dtype=np.uint8)
+        higher_values = np.zeros((self.max_lives + 1, streaks, n))
+        lower_values = np.zeros_like(higher_values)
+        for lives in range(1, self.max_lives + 1):
+            lost = values[lives - 1, 0, 1:]  # Value after a wrong guess, by next card
+            lost_higher = (p - above) @ lost
+            lost_lower = (p - below) @ lost
+            # A joker gives a life and the guess is settled by the card drawn after it; with the
+            # most lives there are no jokers left to draw
+            rate = joker_rate if lives < self.max_lives else 0.0
+            v = np.zeros((streaks + 1, n))
+            while True:
+                higher = v[1:] @ above.T + lost_higher
+                lower = v[1:] @ below.T + lost_lower
+                if rate:
+                    higher = rate * after_joker[0][lives + 1] + (1 - rate) * higher
+                    lower = rate * after_joker[1][lives + 1] + (1 - rate) * lower
+                guess = np.maximum(higher, lower)
+                bank = unbanked + guess[0]
+                new = np.empty_like(v)
+                new[:streaks] = np.maximum(guess, bank[:streaks])
+                new[streaks] = bank[streaks]
+                converged = np.abs(new - v).max() < self.tolerance
+                v = new
+                if converged:
+                    break
+            values[lives, :, 1:] = v
+            higher_values[lives], lower_values[lives] = higher, lower
+            moves[lives, :streaks, 1:] = np.where(bank[:streaks] > guess, 2, np.where(higher >= lower, 0, 1))
+            moves[lives, streaks, 1:] = 2
+        return values, moves, higher_values, lower_values
+
+    def _joker_fallback(self, jokers, cards):
+        """
+        Infinite deck solution for a state beyond the horizon that still has jokers to come,
+        solved on first use.
+
+        The jokers are spread evenly through the remaining cards, so each draw is a joker with
+        the chance that gives the right mean wait for the next one: (jokers + 1) / (cards + 1).
+
+        Args:
+            jokers (int): Jokers remaining.
+            cards (int): Cards remaining, jokers included.
+        Returns:
+            tuple: As returned by _solve_infinite.
+        """
+        if not jokers:
+            return (self.fallback_values, self.fallback_moves, *self.fallback_guesses)
+        key = (jokers, cards)
+        if key not in self.joker_fallbacks:
+            after_joker = self._joker_fallback(jokers - 1, cards - 1)[2:]
+            self.joker_fallbacks[key] = self._solve_infinite((jokers + 1) / (cards + 1), after_joker)
+        return self.joker_fallbacks[key]
+
+    ############ FINITE DECK ##############
+
+    def _value(self, counts, jokers, card, streak, lives, depth):
+        """
+        Best move and expected future banked points of a state, memoized under its canonical key.
+
+        Args:
+            counts (int): Packed counts of the remaining non-joker cards.
+            jokers (int): Jokers remaining.
+            card (int): Rank of the current card.
+            streak (int): Current streak.
+            lives (int): Remaining lives, at least 1.
+            depth (int): Draws left before the horizon, or -1 when solving exactly.
+        Returns:
+            tuple: (move, value) with move one of 'h', 'l', 'b'.
+        """
+        if depth == 0:
+            if not jokers:
+                return MOVES[self.fallback_moves[lives, streak, card]], self.fallback_values[lives, streak, card]
+            fallback = self.horizon_fallbacks.get(counts << 2 | jokers)
+            if fallback is None:
+                if len(self.horizon_fallbacks) >= self.cache_size:
+                    self.horizon_fallbacks.clear()
+                fallback = self._joker_fallback(jokers, jokers + self._size(counts))[:2]
+                self.horizon_fallbacks[counts << 2 | jokers] = fallback
+            return MOVES[fallback[1][lives, streak, card]], fallback[0][lives, streak, card]
+        if not counts and not jokers:
+            if depth < 0:
+                # Exactly solved games meet the refilled deck at the boundary values
+                return MOVES[self.boundary_moves[lives, streak, card]], self.boundary_values[lives, streak, card]
+            counts = self.full_counts  # The next draw refills the deck
+
+        # Canonical orientation: the smaller of the state and its mirror image
+        mirrored_counts = self._mirror(counts)
+        mirrored = mirrored_counts < counts or (mirrored_counts == counts and self.ranks + 1 - card < card)
+        if mirrored:
+            counts, card = mirrored_counts, self.ranks + 1 - card
+        key = (((((counts << 2 | jokers) << 4 | card) << 6 | streak) << 4 | lives) << 4) | max(depth, 0)
+
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = self._solve(counts, jokers, card, streak, lives, depth)
+            self.table[key] = entry
+            if len(self.table) > self.cache_size:
+                self.table.popitem(last=False)
+        move = MOVES[entry[0]]
+        return (MIRRORED[move] if mirrored else move), entry[1]
+
+    def _solve(self, counts, jokers, card, streak, lives, depth):
+        """Compute the (move index, value) entry of a canonical state."""
+        if streak >= self.max_streak:
+            higher, lower = self._guess(counts, jokers, card, 0, lives, depth)
+            return 2, self.unbanked_points[streak] + max(higher, lower)
+        higher, lower = self._guess(counts, jokers, card, streak, lives, depth)
+        move, value = (0, higher) if higher >= lower else (1, lower)
+        if streak:
+            higher, lower = self._guess(counts, jokers, card, 0, lives, depth)
+            bank = self.unbanked_points[streak] + max(higher, lower)
+            if bank > value:
+                move, value = 2, bank
+        return move, value
+
+    def _guess(self, counts, jokers, card, streak, lives, depth):
+        """
+        Expected future banked points of guessing Higher and of guessing Lower, without banking first.
+
+        Returns:
+            tuple: (higher, lower) values.
+        """
+        if not counts and not jokers:
+            counts = self.full_counts  # The draw refills the deck first
+        higher = lower = 0.0
+        total = jokers
+        if jokers:
+            # A joker gives a life and the next card is drawn instead
+            joker_higher, joker_lower = self._guess(counts, jokers - 1, card, streak, lives + 1, depth)
+            higher += jokers * joker_higher
+            lower += jokers * joker_lower
+
+        next_depth = depth - 1 if depth > 0 else depth
+        mask = (1 << COUNT_BITS) - 1
+        for rank in range(1, self.ranks + 1):
+            shift = COUNT_BITS * (rank - 1)
+            n = (counts >> shift) & mask
+            if not n:
+                continue
+            total += n
+            rest = counts - (1 << shift)
+            # Wrong guesses (ties included) lose a life, the unbanked points and the streak
+            wrong = self._value(rest, jokers, rank, 0, lives - 1, next_depth)[1] if lives > 1 else 0.0
+            if rank == card:
+                higher += n * wrong
+                lower += n * wrong
+                continue
+            right = self._value(rest, jokers, rank, streak + 1, lives, next_depth)[1]
+            if rank > card:
+                higher += n * right
+                lower += n * wrong
+            else:
+                higher += n * wrong
+                lower += n * right
+        return higher / total, lower / total
+
+    def solve(self):
+        """
+        Solve the game exactly by value iteration over the values at the start of a refilled deck.
+
+        Lives only ever go down once the jokers are drawn, so the lives levels are solved in
+        turn. Each iteration solves every state of a deck with the current number of lives,
+        taking the values at the start of the next deck from the previous iteration, until
+        they stop changing. With a horizon there is nothing to precompute: states are solved
+        when first queried.
+
+        Returns:
+            int: Number of iterations.
+        """
+        if self.horizon is not None:
+            return 0
+        iterations = 0
+        self.table.clear()
+        self.boundary_values = self.boundary_values.copy()
+        self.boundary_moves = self.boundary_moves.copy()
+        for lives in range(1, self.max_lives + 1):
+            while True:
+                iterations += 1
+                # Forget the states of this level solved with the previous boundary values
+                for key in [key for key in self.table if (key >> 4) & 15 == lives]:
+                    del self.table[key]
+                values = np.zeros_like(self.boundary_values[lives])
+                moves = np.zeros_like(self.boundary_moves[lives])
+                for streak in range(self.max_streak + 1):
+                    for card in range(1, self.ranks + 1):
+                        move, value = self._value(self.full_counts, 0, card, streak, lives, -1)
+                        values[streak, card] = value
+                        moves[streak, card] = MOVES.index(move)
+                change = np.abs(values - self.boundary_values[lives]).max()
+                self.boundary_values[lives], self.boundary_moves[lives] = values, moves
+                if change < self.tolerance:
+                    break
+        return iterations
+
+    ############ QUERIES ##############
+
+    def value(self, counts, jokers, card, streak, lives):
+        """
+        Best move and expected future banked points of a state.
+
+        Streaks above max_streak are solved as the capped state, where banking is forced, and
+        the value is then raised by the extra unbanked points the longer streak holds.
+
+        Args:
+            counts (sequence): Remaining cards of ranks 1 to ranks.
+            jokers (int): Jokers remaining.
+            card (int): Rank of the current card.
+            streak (int): Current streak.
+            lives (int): Remaining lives.
+        Returns:
+            tuple: (move, value) with move 'h', 'l' or 'b'.
+        Raises:
+            ValueError: If the state is outside the solver's range or the game is over.
+        """
+        if not 1 <= lives <= self.max_lives or not 1 <= card <= self.ranks or not 0 <= jokers <= self.jokers:
+            raise ValueError('State is outside the range of the solver.')
+        depth = self.horizon if self.horizon is not None else -1
+        move, value = self._value(self.pack(counts), jokers, card, min(streak, self.max_streak), lives, depth)
+        if streak > self.max_streak:
+            value += self.unbanked(streak) - self.unbanked_points[self.max_streak]  # Banked on the next move
+        return move, float(value)
+
+    def best_move(self, game):
+        """
+        Best move for a live game and the expected final score when playing optimally from it.
+
+        Args:
+            game (HigherOrLower): A game whose current card has been drawn.
+        Returns:
+            tuple: (move, expected final score) with move 'h' (Higher), 'l' (Lower) or 'b' (Bank).
+        Raises:
+            ValueError: If the game's rules are not the ones solved, there is no current card,
+                        or the state is outside the solver's range.
+        """
+        rules = game.rules
+        solved = (self.ranks, self.copies, self.jokers, self.starting_lives, self.base_score, self.streak_multiplier)
+        if solved != (13, 4 * rules.decks, rules.jokers, rules.starting_lives, rules.base_score, rules.streak_multiplier):
+            raise ValueError('The game is played with different rules from the solver.')
+        if game.card is None or game.card.is_joker:
+            raise ValueError('The game has no card to guess against.')
+        counts = game.deck.rank_index.counts
+        move, value = self.value(counts[1:self.ranks + 1], counts[0], game.card.rank, game.streak, game.lives)
+        return move, game.score + value
+
+    ############ PERSISTENCE ##############
+
+    def save(self, path):
+        """
+        Save the solved value table, with the parameters and boundary values, to a .npz file.
+
+        Args:
+            path (str): File path.
+        """
+        entries = list(self.table.items())
+        np.savez_compressed(
+            path,
+            params=np.array(json.dumps(self.params())),
+            keys=np.array([key for key, _ in entries], dtype=np.uint64),
+            moves=np.array([entry[0] for _, entry in entries], dtype=np.uint8),
+            values=np.array([entry[1] for _, entry in entries], dtype=float),
+            boundary_values=self.boundary_values,
+            boundary_moves=self.boundary_moves)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a solver saved with save, without solving again.
+
+        Args:
+            path (str): File path.
+        Returns:
+            Solver: The solver with its value table restored.
+        """
+        with np.load(path) as data:
+            solver = cls(**json.loads(str(data['params'])))
+            solver.boundary_values = data['boundary_values']
+            solver.boundary_moves = data['boundary_moves']
+            solver.table.update(zip(data['keys'].tolist(),
+                                    zip(data['moves'].tolist(), data['values'].tolist())))
+        return solver
+
+
+def main():
+    """
+    Command line entry point: solve a deck and print the best first moves and query times.
+    """
+    parser = argparse.ArgumentParser(description="Optimal-policy solver for Higher or Lower.")
+    parser.add_argument("--ranks", type=int, default=13, help="ranks per deck")
+    parser.add_argument("--copies", type=int, default=4, help="cards of each rank per deck")
+    parser.add_argument("--jokers", type=int, default=2, help="jokers in the first deck")
+    parser.add_argument("--horizon", type=int, help="draws solved exactly (required for large decks)")
+    parser.add_argument("--save", help="write the solved table to this .npz file")
+    args = parser.parse_args()
+
+    solver = Solver(args.ranks, args.copies, args.jokers, args.horizon)
+    started = time.perf_counter()
+    iterations = solver.solve()
+    print(f"Solved in {time.perf_counter() - started:.2f}s ({iterations} iterations)")
+
+    full = [args.copies] * args.ranks
+    for card in range(1, args.ranks + 1):
+        started = time.perf_counter()
+        move, value = solver.value(full[:card - 1] + [args.copies - 1] + full[card:], args.jokers,
+                                   card, 0, solver.starting_lives)
+        print(f"First card {card:>2}: {move}, expected score {value:.3f} ({time.perf_counter() - started:.4f}s)")
+
+    query = (full, args.jokers, args.ranks // 2 + 1, 0, solver.starting_lives)
+    started = time.perf_counter()
+    solver.value(*query)  # Solve the state once, if it is not in the table yet
+    solve_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(10000):
+        solver.value(*query)
+    print(f"Solved state query: {(time.perf_counter() - started) / 10000 * 1e6:.1f}us "
+          f"(first query {solve_seconds * 1e6:.0f}us)")
+    print(f"Table: {len(solver.table)} states, {solver.hits} hits, {solver.misses} misses")
+
+    if args.save:
+        solver.save(args.save)
+
+
+if __name__ == "__main__":
+    main()
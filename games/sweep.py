@@ -0,0 +1,212 @@
+"""
+Rule-parameter sweep: simulate a grid of rule variants and tabulate their score and length
+distributions, for balancing the game.
+
+Every variant is cut into shards, and the shards of all variants that still need computing
+share one process pool, so a sweep keeps every core busy even when only a few variants are new.
+Each finished variant is cached on disk as a JSON Aggregate, keyed by a hash of its rules,
+strategy, seed and game count, so re-running or widening a sweep only computes the new points.
+
+Run from the repository root:
+    python -m games.sweep --lives 2 3 4 --jokers 0 2 4 --games 200000
+    python -m games.sweep --decks 1 2 --multiplier 1 2 3 --strategy pivot
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from games.batchSimulator import STRATEGIES
+from games.monteCarlo import Aggregate, print_progress, run_shard
+from games.rules import DEFAULT_RULES, Rules, validate
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+
+CACHE_DIR = '.sweep-cache'
+CACHE_VERSION = 1  # Bump when a simulator change alters results, so stale entries are ignored
+
+
+def variant_grid(lives=None, base=None, multiplier=None, decks=None, jokers=None):
+    """
+    Every combination of the given rule values. A rule left as None keeps its default value.
+
+    Args:
+        lives (list, optional): Starting lives to try.
+        base (list, optional): Base scores to try.
+        multiplier (list, optional): Streak multipliers to try.
+        decks (list, optional): Deck counts to try.
+        jokers (list, optional): Joker counts to try.
+    Returns:
+        list: Rules for each variant.
+    Raises:
+        ValueError: If a combination is not a playable game.
+    """
+    values = [lives or [DEFAULT_RULES.starting_lives], base or [DEFAULT_RULES.base_score],
+              multiplier or [DEFAULT_RULES.streak_multiplier], decks or [DEFAULT_RULES.decks],
+              jokers or [DEFAULT_RULES.jokers]]
+    return [validate(Rules(*combination)) for combination in itertools.product(*values)]
+
+
+def cache_key(rules, strategy, seed, n_games):
+    """
+    Args:
+        rules (Rules): The rule variant.
+        strategy (str): Strategy spec.
+        seed (int): Simulation seed.
+        n_games (int): Number of games.
+    Returns:
+        str: Hex digest identifying the simulation's result.
+    """
+    data = json.dumps([CACHE_VERSION, rules._asdict(), strategy, seed, n_games], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def load_cached(cache_dir, key):
+    """
+    Args:
+        cache_dir (str): Cache directory.
+        key (str): Key from cache_key.
+    Returns:
+        Aggregate: The cached result, or None if it is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(cache_dir, f"{key}.json")) as f:
+            return Aggregate.from_dict(json.load(f)['aggregate'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached(cache_dir, key, rules, strategy, seed, aggregate):
+    """
+    Writes a result to the cache. The file is replaced atomically, so an interrupted sweep
+    never leaves a partial entry.
+
+    Args:
+        cache_dir (str): Cache directory, created if needed.
+        key (str): Key from cache_key.
+        rules (Rules): The rule variant, stored for reference.
+        strategy (str): Strategy spec, stored for reference.
+        seed (int): Simulation seed, stored for reference.
+        aggregate (Aggregate): The result.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'rules': rules._asdict(), 'strategy': strategy, 'seed': seed,
+                   'summary': aggregate.summary(), 'aggregate': aggregate.to_dict()}, f)
+    os.replace(path + '.tmp', path)
+
+
+def sweep(variants, n_games, strategy, seed=0, workers=None, shard_size=50000, chunk_size=50000,
+          cache_dir=CACHE_DIR, progress=None):
+    """
+    Simulate every variant, reusing cached results.
+
+    Args:
+        variants (list): Rules to simulate.
+        n_games (int): Games per variant.
+        strategy (str): Strategy spec, e.g. 'bank-at:10'.
+        seed (int): Simulation seed. Variants share it, so their decks are as alike as the rules allow.
+        workers (int, optional): Worker processes. Defaults to the number of cores; with one
+                                 worker the shards run in this process.
+        shard_size (int): Games per shard. Results do not depend on it.
+        chunk_size (int): Games each worker simulates together.
+        cache_dir (str, optional): Cache directory. If None, nothing is cached.
+        progress (callable, optional): Called as progress(games done, games to compute, seconds elapsed).
+    Returns:
+        list: (rules, Aggregate, cached) for each variant, in the order given.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    pending = {}  # Variant -> [merged aggregate, shards left]
+    for rules in variants:
+        cached = load_cached(cache_dir, cache_key(rules, strategy, seed, n_games)) if cache_dir else None
+        if cached is not None:
+            results[rules] = (cached, True)
+        elif rules not in pending:
+            pending[rules] = [Aggregate(), 0]
+
+    shards = [(rules, start, min(shard_size, n_games - start))
+              for rules in pending for start in range(0, n_games, shard_size)]
+    for rules, _, _ in shards:
+        pending[rules][1] += 1
+    total = len(pending) * n_games
+    done = 0
+    started = time.perf_counter()
+
+    def collect(rules, aggregate):
+        nonlocal done
+        entry = pending[rules]
+        entry[0].merge(aggregate)
+        entry[1] -= 1
+        done += aggregate.games
+        if entry[1] == 0:
+            results[rules] = (entry[0], False)
+            if cache_dir:
+                save_cached(cache_dir, cache_key(rules, strategy, seed, n_games), rules, strategy, seed, entry[0])
+        if progress:
+            progress(done, total, time.perf_counter() - started)
+
+    if workers == 1 or not shards:
+        for rules, start, count in shards:
+            collect(rules, run_shard(seed, strategy, start, count, chunk_size, rules))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_shard, seed, strategy, start, count, chunk_size, rules): rules
+                       for rules, start, count in shards}
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+
+    return [(rules,) + results[rules] for rules in variants]
+
+
+def print_table(results):
+    """
+    Print one row per variant: its rules, score mean and percentiles, and length mean and median.
+
+    Args:
+        results (list): Output of sweep.
+    """
+    print(f"{'lives':>5}{'base':>5}{'mult':>5}{'decks':>6}{'jokers':>7} |"
+          f"{'mean':>8}{'±':>6}{'p5':>5}{'p25':>5}{'p50':>5}{'p75':>5}{'p95':>5}{'p99':>5} |"
+          f"{'len':>6}{'p50':>5}  cached")
+    for rules, aggregate, cached in results:
+        s = aggregate.summary()
+        print(f"{rules.starting_lives:>5}{rules.base_score:>5}{rules.streak_multiplier:>5}"
+              f"{rules.decks:>6}{rules.jokers:>7} |"
+              f"{s['score_mean']:>8.2f}{s['score_stderr']:>6.2f}{s['score_p5']:>5}{s['score_p25']:>5}"
+              f"{s['score_p50']:>5}{s['score_p75']:>5}{s['score_p95']:>5}{s['score_p99']:>5} |"
+              f"{s['length_mean']:>6.1f}{s['length_p50']:>5}  {'yes' if cached else 'no'}")
+
+
+def main():
+    """
+    Command line entry point: sweep a grid of rule variants and print the table.
+    """
+    parser = argparse.ArgumentParser(description="Rule-parameter sweep for Higher or Lower.")
+    parser.add_argument("--lives", type=int, nargs="+", help="starting lives to try")
+    parser.add_argument("--base", type=int, nargs="+", help="base scores to try")
+    parser.add_argument("--multiplier", type=int, nargs="+", help="streak multipliers to try")
+    parser.add_argument("--decks", type=int, nargs="+", help="deck counts to try")
+    parser.add_argument("--jokers", type=int, nargs="+", help="joker counts to try")
+    parser.add_argument("--games", type=int, default=100000, help="games per variant")
+    parser.add_argument("--strategy", default="bank-at:10", help=f"one of {', '.join(STRATEGIES)}, e.g. bank-at:10")
+    parser.add_argument("--seed", type=int, default=0, help="seed the decks are derived from")
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of cores)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="result cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write cached results")
+    args = parser.parse_args()
+
+    variants = variant_grid(args.lives, args.base, args.multiplier, args.decks, args.jokers)
+    started = time.perf_counter()
+    results = sweep(variants, args.games, args.strategy, args.seed, args.workers,
+                    cache_dir=None if args.no_cache else args.cache_dir, progress=print_progress)
+    elapsed = time.perf_counter() - started
+    print_table(results)
+    computed = sum(not cached for _, _, cached in results)
+    print(f"{len(results)} variants ({computed} computed, {len(results) - computed} cached) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Strategy tournament with sequential early stopping.
+
+Every pair of strategies plays the same games: game i deals the same decks to both (see the
+counter-based decks in games.batchSimulator), so the paired score difference of each game
+cancels most of the luck of the deal. Games are played in batches and after each batch the
+running mean and variance of the differences are tested; a matchup stops as soon as the test
+is decided, instead of always playing the fixed max_games.
+
+Two stopping rules are available:
+    msprt  Mixture sequential probability ratio test of "the mean difference is 0", with a
+           normal mixture over the alternative. It may be checked after every batch and still
+           keeps its false positive rate below alpha. Stops when one strategy is shown better.
+    ci     Stops when the (1 - alpha) confidence interval of the mean difference is narrower
+           than +-tolerance points, i.e. when the difference is known precisely enough.
+
+Run from the repository root:
+    python -m games.tournament bank-at:6 bank-at:12 bank-at:20 bank-at:30
+    python -m games.tournament bank-at:12 bank-at:20 --test ci --tolerance 0.1
+"""
+
+from collections import namedtuple
+from games.batchSimulator import ReplayGame, STRATEGIES, make_strategy, play_scalar, seed_key, simulate
+from games.rules import parse_rules
+from statistics import NormalDist
+import argparse
+import itertools
+import math
+import numpy as np
+import time
+
+MatchupResult = namedtuple('MatchupResult', ['a', 'b', 'games', 'mean', 'stderr', 'winner', 'decided'])
+MatchupResult.__doc__ = """
+Outcome of a matchup.
+
+Attributes:
+    a (str): First strategy spec.
+    b (str): Second strategy spec.
+    games (int): Games played before stopping.
+    mean (float): Mean score of a minus score of b, per game.
+    stderr (float): Standard error of the mean difference.
+    winner (str): The better strategy's spec, or None if neither was shown better.
+    decided (bool): True if the test stopped the matchup before max_games.
+"""
+
+
+class PairedStats:
+    """
+    Running count, mean and variance of paired differences (Welford's method, merged per batch).
+
+    Attributes:
+        n (int): Number of differences.
+        mean (float): Mean difference.
+        m2 (float): Sum of squared deviations from the mean.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, differences):
+        """
+        Add a batch of differences.
+
+        Args:
+            differences (numpy.ndarray): Paired differences.
+        """
+        count = differences.size
+        if not count:
+            return
+        batch_mean = float(differences.mean())
+        batch_m2 = float(((differences - batch_mean) ** 2).sum())
+        delta = batch_mean - self.mean
+        total = self.n + count
+        self.mean += delta * count / total
+        self.m2 += batch_m2 + delta * delta * self.n * count / total
+        self.n = total
+
+    @property
+    def variance(self):
+        """float: Sample variance of the differences."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stderr(self):
+        """float: Standard error of the mean difference."""
+        return math.sqrt(self.variance / self.n) if self.n else math.inf
+
+
+def msprt_log_ratio(n, mean, variance, mixing_variance=None):
+    """
+    Log of the normal-mixture SPRT statistic for the hypothesis that the mean difference is 0.
+
+    Args:
+        n (int): Number of differences.
+        mean (float): Their mean.
+        variance (float): Their variance, estimated from the data.
+        mixing_variance (float, optional): Variance of the normal prior over the true difference.
+                                           Defaults to the data variance.
+    Returns:
+        float: log(Lambda_n); the test rejects when it reaches log(1 / alpha).
+    """
+    if variance <= 0:
+        return math.inf if mean else -math.inf
+    tau2 = variance if mixing_variance is None else mixing_variance
+    spread = variance + n * tau2
+    return 0.5 * math.log(variance / spread) + n * n * tau2 * mean * mean / (2 * variance * spread)
+
+
+class Tournament:
+    """
+    Round-robin of strategies on common decks.
+
+    Attributes:
+        strategies (list): Strategy specs, e.g. 'bank-at:10'.
+        scores (dict): Cached scores: (spec, batch number) -> numpy array, shared by every
+                       matchup the strategy plays.
+    """
+
+    def __init__(self, strategies, seed=0, rules=None, batch_size=2000, max_games=1000000,
+                 alpha=0.05, test='msprt', tolerance=0.5, scalar=False):
+        """
+        Args:
+            strategies (list): Strategy specs for make_strategy.
+            seed (int): Seed all decks are derived from.
+            rules (Rules, optional): Rule variant. If None, the standard rules are used.
+            batch_size (int): Games played between tests.
+            max_games (int): Games a matchup plays if the test never stops it (the fixed-sample run).
+            alpha (float): Significance level.
+            test (str): 'msprt' or 'ci'.
+            tolerance (float): Half-width in points at which the 'ci' test stops.
+            scalar (bool): If True, play every game through HigherOrLower instead of the vectorized simulator.
+        Raises:
+            ValueError: If a strategy or the test is unknown.
+        """
+        for spec in strategies:
+            make_strategy(spec)
+        if test not in ('msprt', 'ci'):
+            raise ValueError(f"Unknown test '{test}'. Choose from: msprt, ci")
+        self.strategies = list(strategies)
+        self.seed = seed
+        self.rules = rules
+        self.batch_size = batch_size
+        self.max_games = max_games
+        self.alpha = alpha
+        self.test = test
+        self.tolerance = tolerance
+        self.scalar = scalar
+        self.z = NormalDist().inv_cdf(1 - alpha / 2)
+        self.scores = {}
+
+    def batch_scores(self, spec, batch):
+        """
+        Final scores of one batch of games for a strategy.
+
+        Args:
+            spec (str): Strategy spec.
+            batch (int): Batch number; it covers games batch * batch_size onwards.
+        Returns:
+            numpy.ndarray: The scores, in game index order.
+        """
+        key = (spec, batch)
+        if key not in self.scores:
+            start = batch * self.batch_size
+            count = min(self.batch_size, self.max_games - start)
+            if self.scalar:
+                strategy = make_strategy(spec)
+                key64 = seed_key(self.seed)
+                scores = [play_scalar(ReplayGame(key64, game, self.rules), strategy)[0]
+                          for game in range(start, start + count)]
+                self.scores[key] = np.array(scores, dtype=np.int64)
+            else:
+                self.scores[key] = simulate(count, spec, self.seed, start, rules=self.rules).scores
+        return self.scores[key]
+
+    def decided(self, stats):
+        """
+        Applies the stopping rule.
+
+        Args:
+            stats (PairedStats): Differences so far.
+        Returns:
+            bool: True if the matchup can stop.
+        """
+        if stats.n < 2:
+            return False
+        if self.test == 'ci':
+            return self.z * stats.stderr <= self.tolerance
+        return msprt_log_ratio(stats.n, stats.mean, stats.variance) >= math.log(1 / self.alpha)
+
+    def play(self, a, b):
+        """
+        Plays one matchup until the test stops it or max_games have been played.
+
+        Args:
+            a (str): First strategy spec.
+            b (str): Second strategy spec.
+        Returns:
+            MatchupResult: The outcome.
+        """
+        stats = PairedStats()
+        decided = False
+        batch = 0
+        while stats.n < self.max_games and not decided:
+            stats.update(self.batch_scores(a, batch) - self.batch_scores(b, batch))
+            decided = self.decided(stats)
+            batch += 1
+
+        # A winner needs the confidence interval to exclude 0 (the msprt stops only when it does)
+        winner = None
+        if abs(stats.mean) > self.z * stats.stderr:
+            winner = a if stats.mean > 0 else b
+        return MatchupResult(a, b, stats.n, stats.mean, stats.stderr, winner, decided)
+
+    def run(self, progress=None):
+        """
+        Plays every pair of strategies once.
+
+        Args:
+            progress (callable, optional): Called with each MatchupResult as it finishes.
+        Returns:
+            list: MatchupResult for each pair.
+        """
+        results = []
+        for a, b in itertools.combinations(self.strategies, 2):
+            result = self.play(a, b)
+            results.append(result)
+            if progress:
+                progress(result)
+        return results
+
+
+def standings(results):
+    """
+    Wins per strategy.
+
+    Args:
+        results (list): MatchupResults.
+    Returns:
+        list: (spec, wins, losses) sorted by wins then fewest losses.
+    """
+    wins, losses = {}, {}
+    for result in results:
+        for spec in (result.a, result.b):
+            wins.setdefault(spec, 0)
+            losses.setdefault(spec, 0)
+        if result.winner:
+            loser = result.b if result.winner == result.a else result.a
+            wins[result.winner] += 1
+            losses[loser] += 1
+    return sorted(((spec, wins[spec], losses[spec]) for spec in wins), key=lambda row: (-row[1], row[2]))
+
+
+def print_result(result):
+    """
+    Prints one matchup as a table row.
+    """
+    winner = result.winner or "-"
+    stopped = "early" if result.decided else "limit"
+    print(f"{result.a:>15} vs {result.b:<15}{result.games:>10,}{result.mean:>+9.3f}{result.stderr:>8.3f}"
+          f"  {winner:<15}{stopped}")
+
+
+def main():
+    """
+    Command line entry point: run a tournament and report the games saved by early stopping.
+    """
+    parser = argparse.ArgumentParser(description="Strategy tournament for Higher or Lower with sequential early stopping.")
+    parser.add_argument("strategies", nargs="+", help=f"strategy specs ({', '.join(STRATEGIES)}), e.g. bank-at:10")
+    parser.add_argument("--test", choices=("msprt", "ci"), default="msprt", help="stopping rule")
+    parser.add_argument("--alpha", type=float, default=0.05, help="significance level")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="confidence interval half-width for --test ci")
+    parser.add_argument("--max-games", type=int, default=1000000, help="games per matchup in the fixed-sample run")
+    parser.add_argument("--batch-size", type=int, default=2000, help="games between tests")
+    parser.add_argument("--seed", type=int, default=0, help="seed the decks are derived from")
+    parser.add_argument("--rules", default="", help="rule variant, e.g. starting_lives=4,decks=2")
+    parser.add_argument("--scalar", action="store_true", help="play games through HigherOrLower (slow)")
+    args = parser.parse_args()
+    if len(args.strategies) < 2:
+        parser.error("a tournament needs at least two strategies")
+
+    tournament = Tournament(args.strategies, args.seed, parse_rules(args.rules), args.batch_size, args.max_games,
+                            args.alpha, args.test, args.tolerance, args.scalar)
+    print(f"{'matchup':>34}{'games':>10}{'mean':>9}{'stderr':>8}  {'winner':<15}stopped")
+    started = time.perf_counter()
+    results = tournament.run(progress=print_result)
+    elapsed = time.perf_counter() - started
+
+    print("\nStandings:")
+    for spec, wins, losses in standings(results):
+        print(f"{spec:>15}  {wins} won, {losses} lost")
+
+    played = sum(result.games for result in results)
+    fixed = len(results) * args.max_games
+    simulated = sum(scores.size for scores in tournament.scores.values())
+    print(f"\nPlayed {played:,} paired games of a {fixed:,} game fixed-sample run "
+          f"({fixed - played:,} saved, {100 * (1 - played / fixed):.1f}%); "
+          f"{simulated:,} games simulated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
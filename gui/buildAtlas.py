@@ -0,0 +1,158 @@
+"""
+Asset build step packing every card image into sprite atlases.
+
+Each atlas holds all card faces, the back of the card and the joker icon in one grid,
+pre-downscaled to one of several card heights. A JSON index maps card codes (and 'back'
+and 'icon') to sub-rectangles, and records the size and modification time of every
+source image so that the atlases are rebuilt automatically when a source changes.
+
+Run from the repository root to force a rebuild:
+    python -m gui.buildAtlas
+"""
+
+from cards.card import CARDS
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+import json
+import os
+
+DIRPATH = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(DIRPATH, "card-images")
+ATLAS_DIR = os.path.join(DIRPATH, "card-atlas")
+INDEX_PATH = os.path.join(ATLAS_DIR, "atlas.json")
+
+INDEX_VERSION = 1
+CARD_SIZE = (500, 726)    # Size of the source card face images
+HEIGHTS = (291, 146, 73)  # Card heights of the atlas levels, largest matches the play screen
+COLUMNS = 8
+
+# Atlas key for each source image: card codes for faces, names for the extras
+SOURCES = {card.getImageName(): str(card.code) for card in CARDS}
+SOURCES["back_of_card.png"] = "back"
+SOURCES["joker_icon.png"] = "icon"
+
+
+def source_stamp():
+    """
+    Record the size and modification time of every source image.
+
+    Returns:
+        dict: File name -> [size in bytes, modification time in nanoseconds].
+    """
+    stamp = {}
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(SOURCE_DIR, filename))
+        stamp[filename] = [stat.st_size, stat.st_mtime_ns]
+    return stamp
+
+
+def load_index():
+    """
+    Read the atlas index, if one has been built.
+
+    Returns:
+        dict: The index, or None if it is missing or unreadable.
+    """
+    try:
+        with open(INDEX_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_stale(index):
+    """
+    Check whether an index is missing, outdated, or refers to missing atlas files.
+
+    Args:
+        index (dict): The index returned by load_index.
+    Returns:
+        bool: True if the atlases need rebuilding.
+    """
+    if not index or index.get("version") != INDEX_VERSION or index.get("sources") != source_stamp():
+        return True
+    return not all(os.path.exists(os.path.join(ATLAS_DIR, level["file"])) for level in index["levels"])
+
+
+def build_atlas():
+    """
+    Pack every source image into one atlas per level and write the index.
+
+    Returns:
+        dict: The new index.
+    Raises:
+        OSError: If a source image cannot be read or an atlas cannot be written.
+    """
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    images = {filename: QImage(os.path.join(SOURCE_DIR, filename)) for filename in SOURCES}
+    unreadable = [filename for filename, image in images.items() if image.isNull()]
+    if unreadable:
+        raise OSError(f"Cannot read card images: {', '.join(unreadable)}")
+    rows = -(-len(SOURCES) // COLUMNS)
+
+    levels = []
+    for height in HEIGHTS:
+        width = round(height * CARD_SIZE[0] / CARD_SIZE[1])
+        atlas = QImage(width * COLUMNS, height * rows, QImage.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.transparent)
+        painter = QPainter(atlas)
+
+        rects = {}
+        for slot, (filename, key) in enumerate(SOURCES.items()):
+            # Scale within the cell, keeping the aspect ratio of non-card images
+            scaled = images[filename].scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            x = (slot % COLUMNS) * width
+            y = (slot // COLUMNS) * height
+            painter.drawImage(x, y, scaled)
+            rects[key] = [x, y, scaled.width(), scaled.height()]
+        painter.end()
+
+        filename = f"atlas_{height}.png"
+        if not atlas.save(os.path.join(ATLAS_DIR, filename)):
+            raise OSError(f"Cannot write {filename} to {ATLAS_DIR}")
+        levels.append({"file": filename, "cell": [width, height], "rects": rects})
+
+    index = {"version": INDEX_VERSION, "sources": source_stamp(), "levels": levels}
+    with open(INDEX_PATH, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return index
+
+
+def ensure_atlas():
+    """
+    Return an up-to-date atlas index, rebuilding the atlases first if a source image changed.
+
+    Returns:
+        dict: The index, or None if the atlases could not be built (e.g. read-only install or
+              a missing card image).
+    """
+    try:
+        index = load_index()
+        if not is_stale(index):  # Reads the source images' stamps, so a missing image fails here
+            return index
+        return build_atlas()
+    except OSError:
+        return None
+
+
+def pick_level(index, height):
+    """
+    Choose the smallest atlas level at least as tall as the requested height.
+
+    Args:
+        index (dict): The atlas index.
+        height (int): Display height in pixels.
+    Returns:
+        dict: The chosen level entry of the index.
+    """
+    levels = sorted(index["levels"], key=lambda level: level["cell"][1])
+    for level in levels:
+        if level["cell"][1] >= height:
+            return level
+    return levels[-1]
+
+
+if __name__ == "__main__":
+    built = build_atlas()
+    for level in built["levels"]:
+        print(f"{level['file']}: {len(level['rects'])} images, cell {level['cell'][0]}x{level['cell'][1]}")
@@ -0,0 +1,97 @@
+"""
+Precompiled Qt Designer forms.
+
+Parsing the .ui XML with loadUi on every start is slow, so each form in gui/ui is compiled
+once into a Python module (gui/ui/<name>_ui.py) that builds the widgets directly. The module
+is regenerated whenever the .ui file is newer than it.
+
+Run from the repository root to recompile every form:
+    python -m gui.compileUi
+"""
+
+from PyQt5 import uic
+import importlib
+import io
+import os
+import re
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui")
+
+# Helper added to compiled forms so pixmap paths stay relative to gui/ui, as with loadUi
+PATH_HELPER = '''
+import os
+
+
+def _ui_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+'''
+
+
+def compile_form(name):
+    """
+    Compile gui/ui/<name>.ui into gui/ui/<name>_ui.py.
+
+    Args:
+        name (str): Form name without extension, e.g. 'home_screen'.
+    """
+    ui_path = os.path.join(UI_DIR, f"{name}.ui")
+    code = io.StringIO()
+    with open(ui_path) as ui_file:
+        uic.compileUi(ui_file, code)
+    source = code.getvalue()
+    source = source.replace("from PyQt5 import QtCore, QtGui, QtWidgets\n",
+                            "from PyQt5 import QtCore, QtGui, QtWidgets\n" + PATH_HELPER, 1)
+    source = re.sub(r'QtGui\.QPixmap\("([^"]*)"\)', r'QtGui.QPixmap(_ui_path("\1"))', source)
+
+    # Write to a temporary file first so a half-written module is never imported
+    py_path = os.path.join(UI_DIR, f"{name}_ui.py")
+    with open(py_path + ".tmp", "w") as py_file:
+        py_file.write(source)
+    os.replace(py_path + ".tmp", py_path)
+
+
+def is_stale(name):
+    """
+    Check whether a compiled form is missing or older than its .ui file.
+
+    Args:
+        name (str): Form name without extension.
+    Returns:
+        bool: True if the form needs compiling.
+    """
+    py_path = os.path.join(UI_DIR, f"{name}_ui.py")
+    ui_path = os.path.join(UI_DIR, f"{name}.ui")
+    return not os.path.exists(py_path) or os.path.getmtime(py_path) < os.path.getmtime(ui_path)
+
+
+def load_form(window, name):
+    """
+    Build a Designer form onto a window, like loadUi, using the precompiled module.
+
+    Widgets are set as attributes of the window (e.g. window.playButton). If the form cannot
+    be compiled (e.g. a read-only install), the .ui file is parsed with loadUi instead.
+
+    Args:
+        window (QMainWindow): The window to build the form onto.
+        name (str): Form name without extension, e.g. 'home_screen'.
+    """
+    try:
+        if is_stale(name):
+            compile_form(name)
+            importlib.invalidate_caches()
+        module = importlib.import_module(f"gui.ui.{name}_ui")
+    except OSError:
+        uic.loadUi(os.path.join(UI_DIR, f"{name}.ui"), window)
+        return
+
+    form = module.Ui_MainWindow()
+    form.setupUi(window)
+    for attribute, widget in vars(form).items():
+        setattr(window, attribute, widget)
+
+
+if __name__ == "__main__":
+    for filename in sorted(os.listdir(UI_DIR)):
+        if filename.endswith(".ui"):
+            compile_form(filename[:-3])
+            print(f"Compiled {filename}")
@@ -1,8 +1,8 @@
 from games.higherOrLower import HigherOrLower
+from gui.compileUi import load_form
 from gui.leaderboardDialog import LeaderboardDialog
-from PyQt5.QtWidgets import QMainWindow, QDialog, QVBoxLayout, QLabel
-from PyQt5.uic import loadUi
-import os
+from gui.rulesDialog import RulesDialog
+from PyQt5.QtWidgets import QMainWindow
 
 class HomeUI(QMainWindow):
     """
@@ -19,13 +19,8 @@ class HomeUI(QMainWindow):
         """
         super(HomeUI, self).__init__()
 
-        # Define the path to the UI file
-        dirpath = os.path.dirname(os.path.abspath(__file__))
-        UIpath = os.path.join(dirpath, r"ui\home_screen.ui")
-        print(UIpath)
-
-        # Load the UI file
-        loadUi(UIpath, self)
+        # Build the UI from the precompiled form
+        load_form(self, "home_screen")
 
         # Set the title of the main window
         self.setWindowTitle("Higher or Lower: Point Rush")
@@ -33,6 +28,10 @@ class HomeUI(QMainWindow):
         # Initialise the leaderboard
         self.leaderboard = leaderboard
 
+        # Dialogs are built on first use and reused afterwards
+        self.rules_dialog = None
+        self.leaderboard_dialog = None
+
         # Connect buttons to their respective actions
         self.rulesButton.clicked.connect(self.showRules)          # Show game rules
         self.leaderboardButton.clicked.connect(self.showLeaderboard)  # Show leaderboard
@@ -41,37 +40,26 @@ class HomeUI(QMainWindow):
         """
         Displays the game rules in a dialog window.
 
-        - Initialises a game instance to retrieve the rules.
-        - Creates a QDialog with a QLabel to show the rules text.
-        - Applies custom styling to the text for better readability.
+        - On first use, initialises a game instance to retrieve the rules and builds the dialog.
+        - Reuses the same dialog on later calls.
         """
-        # Create a game instance to fetch the rules
-        self.game = HigherOrLower(self.leaderboard)
-        rules = self.game.getRules()
-
-        # Create a QDialog for displaying the rules
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Game Rules")
-        dialog.setGeometry(100, 100, 400, 600)  # Set the size of the dialog
-
-        # Create a QLabel to display the rules and add it to the dialog
-        layout = QVBoxLayout(dialog)
-        label = QLabel(rules, dialog)
-        layout.addWidget(label)
-
-        # Apply custom styles to the QLabel
-        label.setStyleSheet("color: white; font-size: 20px; font-family: Bodoni MT;")
+        if self.rules_dialog is None:
+            # Create a game instance to fetch the rules
+            rules = HigherOrLower(self.leaderboard).getRules()
+            self.rules_dialog = RulesDialog(rules, self)
 
         # Execute the dialog to show it on the screen
-        dialog.exec_()
+        self.rules_dialog.exec_()
 
     def showLeaderboard(self):
         """
         Displays the leaderboard in a custom dialog window.
 
-        - Creates an instance of the LeaderboardDialog with the current leaderboard.
+        - Creates the LeaderboardDialog on first use, otherwise refreshes its scores.
         - Executes the dialog to allow user interaction.
         """
-        # Create and display the leaderboard dialog
-        dialog = LeaderboardDialog(self.leaderboard)
-        dialog.exec_()
+        if self.leaderboard_dialog is None:
+            self.leaderboard_dialog = LeaderboardDialog(self.leaderboard)
+        else:
+            self.leaderboard_dialog.populate_table()  # Pick up scores saved since last shown
+        self.leaderboard_dialog.exec_()
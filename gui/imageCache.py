@@ -0,0 +1,270 @@
+from cards.card import CARDS
+from gui.buildAtlas import ATLAS_DIR, SOURCES, ensure_atlas, pick_level
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from collections import OrderedDict
+import os
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "card-images")
+CARD_FACES = [card.getImageName() for card in CARDS]  # Every face that can appear in a game
+
+
+class AtlasLoader(QThread):
+    """
+    Worker thread that brings the sprite atlases up to date and decodes the atlas level
+    for a display size away from the GUI thread.
+    """
+
+    loaded = pyqtSignal(object, str, int, int, QImage)  # Index, atlas file name, width, height, atlas
+
+    def __init__(self, filenames, width, height):
+        """
+        Initialises the loader.
+
+        Args:
+            filenames (list): Image file names still missing for this size.
+            width (int): Display width in pixels.
+            height (int): Display height in pixels, used to choose the atlas level.
+        """
+        super(AtlasLoader, self).__init__()
+        self.filenames = filenames
+        self.width = width
+        self.height = height
+
+    def run(self):
+        """Rebuild the atlases if stale, then decode the chosen level."""
+        index = ensure_atlas()
+        if index is None or self.isInterruptionRequested():
+            return
+        level = pick_level(index, self.height)
+        image = QImage(os.path.join(ATLAS_DIR, level["file"]))
+        if not image.isNull():
+            self.loaded.emit(index, level["file"], self.width, self.height, image)
+
+
+class ImageLoader(QThread):
+    """
+    Worker thread that decodes and scales individual card images away from the GUI thread.
+    Used when the sprite atlases are unavailable.
+
+    QPixmap can only be created on the GUI thread, so the worker produces QImage objects
+    and hands them back through the loaded signal.
+    """
+
+    loaded = pyqtSignal(str, int, int, QImage)  # File name, width, height, scaled image
+
+    def __init__(self, filenames, width, height):
+        """
+        Initialises the loader.
+
+        Args:
+            filenames (list): Image file names within gui/card-images to decode.
+            width (int): Target width in pixels.
+            height (int): Target height in pixels.
+        """
+        super(ImageLoader, self).__init__()
+        self.filenames = filenames
+        self.width = width
+        self.height = height
+
+    def run(self):
+        """Decode each image, stopping early if interruption is requested."""
+        for filename in self.filenames:
+            if self.isInterruptionRequested():
+                return
+            image = load_image(filename, self.width, self.height)
+            if not image.isNull():
+                self.loaded.emit(filename, self.width, self.height, image)
+
+
+def load_image(filename, width, height):
+    """
+    Decode a card image from disk and scale it to the given size.
+
+    Args:
+        filename (str): Image file name within gui/card-images.
+        width (int): Target width in pixels.
+        height (int): Target height in pixels.
+    Returns:
+        QImage: The scaled image (null if the file could not be read).
+    """
+    image = QImage(os.path.join(IMAGE_DIR, filename))
+    if image.isNull():
+        return image
+    return image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+
+class CardImageCache(QObject):
+    """
+    Process-wide cache of card pixmaps, scaled to the size they are displayed at.
+
+    Card images come from the sprite atlases built by gui.buildAtlas: one atlas file is read
+    per display size and every face is cropped from it. Until the atlas index is available,
+    individual image files are decoded instead. Pixmaps are grouped by size, and when the
+    cache grows beyond its memory budget the least recently used sizes are evicted.
+
+    Attributes:
+        max_bytes (int): Memory budget for cached pixmaps.
+        index (dict): Atlas index, or None until the atlases have been checked.
+        sizes (OrderedDict): (width, height) -> {file name: QPixmap}, least recently used first.
+        hits (int): Lookups served from memory.
+        misses (int): Lookups that had to decode from disk.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """
+        Return the shared cache, creating it on first use.
+
+        Returns:
+            CardImageCache: The process-wide cache.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialise an empty cache.
+
+        Args:
+            max_bytes (int): Memory budget for cached pixmaps, 64 MB by default.
+        """
+        super(CardImageCache, self).__init__()
+        self.max_bytes = max_bytes
+        self.sizes = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.index = None
+        self.loader = None
+
+    def pixmap(self, filename, size):
+        """
+        Return the pixmap for a card image at the given size, decoding it only if it is not cached.
+
+        Args:
+            filename (str): Image file name within gui/card-images.
+            size (QSize): Display size of the pixmap.
+        Returns:
+            QPixmap: The scaled pixmap.
+        """
+        key = (size.width(), size.height())
+        bucket = self.sizes.get(key)
+        if bucket is None:
+            bucket = self.sizes[key] = {}
+        self.sizes.move_to_end(key)
+
+        pixmap = bucket.get(filename)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        if self.index is not None and filename in SOURCES:
+            # Read the atlas level once and crop every image for this size
+            level = pick_level(self.index, key[1])
+            atlas = QImage(os.path.join(ATLAS_DIR, level["file"]))
+            if not atlas.isNull():
+                self._crop_all(level, atlas, key)
+                return bucket[filename]
+        return self._store(filename, key, load_image(filename, *key))
+
+    def prefetch(self, size, filenames=CARD_FACES):
+        """
+        Load every card image at the given size on a worker thread, rebuilding the
+        atlases first if the source images changed.
+
+        Args:
+            size (QSize): Display size to prefetch.
+            filenames (list): Image file names to prefetch if the atlases are unavailable.
+                              Defaults to every card face.
+        """
+        if self.loader is not None and self.loader.isRunning():
+            return
+        key = (size.width(), size.height())
+        cached = self.sizes.get(key, {})
+        missing = [filename for filename in filenames if filename not in cached]
+        if not missing:
+            return
+
+        if self.loader is None:
+            QCoreApplication.instance().aboutToQuit.connect(self.stop_prefetch)
+        if self.index is None:
+            self.loader = AtlasLoader(missing, *key)
+            self.loader.loaded.connect(self._atlas_loaded)  # Queued back onto the GUI thread
+            self.loader.finished.connect(self._atlas_checked)
+        else:
+            self.loader = ImageLoader(missing, *key)
+            self.loader.loaded.connect(self._prefetched)  # Queued back onto the GUI thread
+        self.loader.start(QThread.LowPriority)
+
+    def stop_prefetch(self):
+        """Stop a running prefetch and wait for the worker thread to finish."""
+        if self.loader is not None:
+            self.loader.requestInterruption()
+            self.loader.wait()
+
+    def clear(self):
+        """Drop every cached pixmap."""
+        self.sizes.clear()
+        self.bytes_used = 0
+
+    def _atlas_loaded(self, index, file, width, height, atlas):
+        """Adopt the atlas index and crop every image from an atlas decoded by the worker."""
+        self.index = index
+        key = (width, height)
+        level = next(level for level in index["levels"] if level["file"] == file)
+        if key not in self.sizes:
+            self.sizes[key] = {}
+            self.sizes.move_to_end(key, last=False)  # Prefetching does not count as use
+        self._crop_all(level, atlas, key)
+
+    def _atlas_checked(self):
+        """Fall back to decoding individual files if the atlases could not be loaded."""
+        if self.index is None:
+            atlas_loader = self.loader
+            self.loader = ImageLoader(atlas_loader.filenames, atlas_loader.width, atlas_loader.height)
+            self.loader.loaded.connect(self._prefetched)
+            self.loader.start(QThread.LowPriority)
+
+    def _crop_all(self, level, atlas, key):
+        """Cut every image that is not cached yet for a size out of an atlas level."""
+        bucket = self.sizes[key]
+        for filename, atlas_key in SOURCES.items():
+            if filename in bucket:
+                continue
+            image = atlas.copy(QRect(*level["rects"][atlas_key]))
+            if (image.width(), image.height()) != key:
+                image = image.scaled(key[0], key[1], Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            self._store(filename, key, image)
+
+    def _prefetched(self, filename, width, height, image):
+        """Store an image decoded by the worker, unless it was loaded on demand meanwhile."""
+        key = (width, height)
+        bucket = self.sizes.get(key)
+        if bucket is None:
+            bucket = self.sizes[key] = {}
+            self.sizes.move_to_end(key, last=False)  # Prefetching does not count as use
+        if filename not in bucket:
+            self._store(filename, key, image)
+
+    def _store(self, filename, key, image):
+        """Convert an image to a pixmap, cache it and enforce the memory budget."""
+        pixmap = QPixmap.fromImage(image)
+        self.sizes[key][filename] = pixmap
+        self.bytes_used += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self._evict(keep=key)
+        return pixmap
+
+    def _evict(self, keep):
+        """Evict least recently used sizes, never the one in use, until within budget."""
+        for key in list(self.sizes):
+            if self.bytes_used <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for pixmap in self.sizes.pop(key).values():
+                self.bytes_used -= pixmap.width() * pixmap.height() * pixmap.depth() // 8
@@ -1,9 +1,13 @@
+import time
+STARTED_AT = time.perf_counter()  # Recorded before the heavy imports for the startup timing
+
+from games import metrics
 from gui.homeUI import HomeUI
-from gui.playUI import PlayUI
+from gui.imageCache import CardImageCache
+from gui.playUI import PlayUI, CARD_IMAGE_SIZE
 from leaderboard.leaderboard import Leaderboard
 from PyQt5.QtWidgets import QMainWindow, QApplication, QStackedWidget
 from PyQt5.QtGui import QIcon
-from PyQt5.uic import loadUi
 import sys
 import os
 
@@ -11,20 +15,30 @@ class AppWindow(QMainWindow):
     """
     Main application window for Higher or Lower: Point Rush.
     Manages transitions between HomeUI and PlayUI using QStackedWidget.
+
+    Only the home screen is built before the first frame; the play screen is built
+    the first time it is shown.
     """
 
-    def __init__(self):
+    def __init__(self, report_startup=False, db_path="leaderboard.db"):
         """
         Initialises the main application window, sets up UI screens, and manages navigation.
+
+        Args:
+            report_startup (bool): If True, print the time from process start to the first frame.
+            db_path (str): Leaderboard database, relative to the working directory.
         """
         super(AppWindow, self).__init__()
+        self.report_startup = report_startup
+        self.first_frame = True
+
         # Set fixed window size and initial geometry
         self.setGeometry(100, 100, 1116, 673)
         self.setFixedSize(1116, 673)
 
         # Set the window icon
         dirpath = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(dirpath, r"card-images\joker_icon.png")
+        icon_path = os.path.join(dirpath, "card-images", "joker_icon.png")
         self.setWindowIcon(QIcon(icon_path))
 
         # Create a QStackedWidget to manage multiple screens
@@ -32,50 +46,69 @@ class AppWindow(QMainWindow):
         self.setCentralWidget(self.stack)
 
         # Initialise leaderboard instance
-        self.leaderboard = Leaderboard(db_path="leaderboard.db")
+        self.leaderboard = Leaderboard(db_path=db_path)
 
-        # Create instances of the home and play screens
+        # Create the home screen now; the play screen is created when first needed
         self.homeUI = HomeUI(self.leaderboard)
-        self.playUI = PlayUI(self.leaderboard)
+        self.playUI = None
 
-        # Add the screens to the stack
+        # Add the home screen to the stack
         self.stack.addWidget(self.homeUI)  # Index 0
-        self.stack.addWidget(self.playUI)  # Index 1
 
         # Connect buttons for screen transitions
         self.homeUI.playButton.clicked.connect(self.showPlayUI)  # Navigate to PlayUI
-        self.playUI.home_button.clicked.connect(self.quit_game)  # Return to HomeUI
 
         # Show the initial screen (HomeUI)
         self.showHomeUI()
 
+    def showEvent(self, event):
+        """Start prefetching card images in the background once the window is first shown."""
+        super(AppWindow, self).showEvent(event)
+        if not event.spontaneous():
+            CardImageCache.instance().prefetch(CARD_IMAGE_SIZE)
+
+    def paintEvent(self, event):
+        """Report the time to the first frame, if requested."""
+        super(AppWindow, self).paintEvent(event)
+        if self.first_frame:
+            self.first_frame = False
+            if self.report_startup:
+                print(f"Time to first frame: {time.perf_counter() - STARTED_AT:.3f}s")
+
     def showHomeUI(self):
         """Switch to the HomeUI screen."""
         self.stack.setCurrentIndex(0)  # Set the current screen to HomeUI
         self.setWindowTitle("Higher or Lower: Point Rush")  # Update the window title
 
     def showPlayUI(self):
-        """Switch to the PlayUI screen."""
+        """Switch to the PlayUI screen, building it on first use."""
+        if self.playUI is None:
+            self.playUI = PlayUI(self.leaderboard)
+            self.stack.addWidget(self.playUI)  # Index 1
+            self.playUI.home_button.clicked.connect(self.quit_game)  # Return to HomeUI
         self.stack.setCurrentWidget(self.playUI)  # Set the current screen to PlayUI
         self.setWindowTitle("Higher or Lower: Point Rush")  # Update the window title
 
     def quit_game(self):
         """
-        Return to the HomeUI from the PlayUI and reinitialise the PlayUI.
-        This ensures that the game state resets each time the user quits to the home screen.
+        Return to the HomeUI from the PlayUI and reset the PlayUI in place.
+        This ensures that the game state resets each time the user quits to the home screen,
+        while reusing the same PlayUI widgets for every game.
         """
         # Switch back to the HomeUI
         self.stack.setCurrentWidget(self.homeUI)
 
-        # Reinitialise the PlayUI for a new game
-        self.playUI = PlayUI(self.leaderboard)
-        self.stack.addWidget(self.playUI)  # Add the new PlayUI instance to the stack
-        self.playUI.home_button.clicked.connect(self.quit_game)  # Reconnect the home button
+        # Reset the PlayUI for a new game
+        self.playUI.reset()
 
 if __name__ == "__main__":
+    # Record engine metrics and write them on exit, if requested with --metrics PATH
+    if "--metrics" in sys.argv[:-1]:
+        metrics.dump_on_exit(sys.argv[sys.argv.index("--metrics") + 1])
+
     # Create the PyQt application
     app = QApplication(sys.argv)
-    mainWindow = AppWindow()  # Instantiate the main application window
+    mainWindow = AppWindow(report_startup="--startup-time" in sys.argv)  # Instantiate the main application window
     mainWindow.show()  # Show the main window
     try:
         sys.exit(app.exec_())  # Start the event loop
@@ -1,10 +1,14 @@
 from games.higherOrLower import HigherOrLower
+from gui.compileUi import load_form
+from gui.imageCache import CardImageCache
 from gui.leaderboardDialog import LeaderboardDialog
-from PyQt5.QtWidgets import QMainWindow, QInputDialog, QMessageBox, QDialog, QVBoxLayout, QLabel
-from PyQt5.QtGui import QPixmap
-from PyQt5.uic import loadUi
+from gui.rulesDialog import RulesDialog
+from PyQt5.QtWidgets import QMainWindow, QInputDialog, QMessageBox
+from PyQt5.QtCore import QSize
 import os
 
+CARD_IMAGE_SIZE = QSize(201, 291)  # Size of the card_image label in play_screen.ui
+
 class PlayUI(QMainWindow):
     """
     Represents the gameplay UI for Higher or Lower: Point Rush. Handles user interactions,
@@ -21,9 +25,7 @@ class PlayUI(QMainWindow):
         """
         super(PlayUI, self).__init__()
         self.dirpath = os.path.dirname(os.path.abspath(__file__))
-        UIpath = os.path.join(self.dirpath, r"ui\play_screen.ui")
-        print(UIpath)
-        loadUi(UIpath, self)
+        load_form(self, "play_screen")
 
         # Define stylesheets for UI elements
         self.enabled_button_style = "background-color: darkgreen; color: white;"
@@ -34,16 +36,26 @@ class PlayUI(QMainWindow):
         self.menu_button_blue = "background-color: rgb(0,85,255); color: white"
         self.menu_button_maroon = "background-color: maroon; color: white"
 
-        # Initialise the game and state
+        # The guess and next buttons and their labels take their enabled or disabled look from
+        # one stylesheet each, so changing state only needs setEnabled, not a new stylesheet
+        self.guess_button_style = (f"QPushButton {{ {self.enabled_button_style} }} "
+                                   f"QPushButton:disabled {{ {self.disabled_button_style} }}")
+        self.guess_label_style = (f"QLabel {{ {self.enabled_label_style} }} "
+                                  f"QLabel:disabled {{ {self.disabled_label_style} }}")
+        for button in (self.higher_button, self.lower_button, self.bank_button, self.next_button):
+            button.setStyleSheet(self.guess_button_style)
+        for label in (self.higher_lower_label, self.bank_label):
+            label.setStyleSheet(self.guess_label_style)
+
+        # Shared cache of decoded card images
+        self.image_cache = CardImageCache.instance()
+
+        # Dialogs are built on first use and reused afterwards
+        self.rules_dialog = None
+        self.leaderboard_dialog = None
+
+        # Initialise the leaderboard
         self.leaderboard = leaderboard
-        self.game = HigherOrLower(self.leaderboard)  # Start a new game instance
-        self.current_state = "START_GAME"  # Initial game state
-
-        # Set initial values in the UI
-        self.score_value.setText(str(self.game.score))
-        self.streak_value.setText(str(self.game.streak))
-        self.unbanked_points_value.setText(str(self.game.unbanked_points)) 
-        self.lives_left_value.setText(str(self.game.STARTING_LIVES))
 
         # Connect buttons to respective functions
         self.restart_button.clicked.connect(self.restart_game)
@@ -55,9 +67,8 @@ class PlayUI(QMainWindow):
         self.bank_button.clicked.connect(lambda: self.action("b"))
         self.next_button.clicked.connect(self.advance_state)
 
-        # Initialise UI with starting message and button states
-        self.display("Welcome! Click next to draw a card")
-        self.next_button_state()
+        # Start the first game with the starting message and button states
+        self.reset()
 
     ######## BUTTON STATE DEFINITIONS ###########
     """Management of button enable, disable and appearance"""
@@ -65,62 +76,63 @@ class PlayUI(QMainWindow):
     def next_button_state(self):
         """Enable only the 'Next' button and disable all guessing buttons."""
         self.higher_button.setEnabled(False)
-        self.higher_button.setStyleSheet(self.disabled_button_style)
         self.lower_button.setEnabled(False)
-        self.lower_button.setStyleSheet(self.disabled_button_style)
         self.bank_button.setEnabled(False)
-        self.bank_button.setStyleSheet(self.disabled_button_style)
         self.next_button.setEnabled(True)
-        self.next_button.setStyleSheet(self.enabled_button_style)
 
-        self.higher_lower_label.setStyleSheet(self.disabled_label_style)
-        self.bank_label.setStyleSheet(self.disabled_label_style)
+        self.higher_lower_label.setEnabled(False)
+        self.bank_label.setEnabled(False)
 
     def guess_button_state(self):
         """Enable only the 'Higher', 'Lower', and 'Bank' buttons, disabling 'Next'."""
         self.higher_button.setEnabled(True)
-        self.higher_button.setStyleSheet(self.enabled_button_style)
         self.lower_button.setEnabled(True)
-        self.lower_button.setStyleSheet(self.enabled_button_style)
         self.bank_button.setEnabled(True)
-        self.bank_button.setStyleSheet(self.enabled_button_style)
         self.next_button.setEnabled(False)
-        self.next_button.setStyleSheet(self.disabled_button_style)
 
-        self.higher_lower_label.setStyleSheet(self.enabled_label_style)
-        self.bank_label.setStyleSheet(self.enabled_label_style)
+        self.higher_lower_label.setEnabled(True)
+        self.bank_label.setEnabled(True)
 
     def disable_all_buttons(self):
         """Disable 'Next', 'Higher', 'Lower', and 'Bank' on the UI."""
         self.higher_button.setEnabled(False)
-        self.higher_button.setStyleSheet(self.disabled_button_style)
         self.lower_button.setEnabled(False)
-        self.lower_button.setStyleSheet(self.disabled_button_style)
         self.bank_button.setEnabled(False)
-        self.bank_button.setStyleSheet(self.disabled_button_style)
         self.next_button.setEnabled(False)
-        self.next_button.setStyleSheet(self.disabled_button_style)
 
-        self.higher_lower_label.setStyleSheet(self.disabled_label_style)
-        self.bank_label.setStyleSheet(self.disabled_label_style)
+        self.higher_lower_label.setEnabled(False)
+        self.bank_label.setEnabled(False)
+
+    def set_style(self, widget, style):
+        """
+        Apply a stylesheet to a widget unless it already has it. The menu buttons are restyled
+        on every restart, and every setStyleSheet call re-polishes the widget and leaves a
+        little memory behind, even for the same sheet.
+
+        Args:
+            widget (QWidget): The button or label to style.
+            style (str): The stylesheet to apply.
+        """
+        if widget.styleSheet() != style:
+            widget.setStyleSheet(style)
 
     def menu_button_startgame(self):
         self.home_button.setText("Quit")
         self.restart_button.setText("Restart")
 
-        self.home_button.setStyleSheet(self.menu_button_maroon)
-        self.restart_button.setStyleSheet(self.menu_button_green)
-        self.rules_button.setStyleSheet(self.menu_button_green)
-        self.leaderboard_button.setStyleSheet(self.menu_button_green)
+        self.set_style(self.home_button, self.menu_button_maroon)
+        self.set_style(self.restart_button, self.menu_button_green)
+        self.set_style(self.rules_button, self.menu_button_green)
+        self.set_style(self.leaderboard_button, self.menu_button_green)
 
     def menu_button_endgame(self):
         self.home_button.setText("Home")
         self.restart_button.setText("Play Again")
         
-        self.home_button.setStyleSheet(self.menu_button_maroon)
-        self.restart_button.setStyleSheet(self.menu_button_blue)
-        self.rules_button.setStyleSheet(self.menu_button_green)
-        self.leaderboard_button.setStyleSheet(self.menu_button_green)
+        self.set_style(self.home_button, self.menu_button_maroon)
+        self.set_style(self.restart_button, self.menu_button_blue)
+        self.set_style(self.rules_button, self.menu_button_green)
+        self.set_style(self.leaderboard_button, self.menu_button_green)
         
     ######## MENU FUNCTIONS ###########
     """
@@ -128,16 +140,35 @@ class PlayUI(QMainWindow):
     rules, and leaderboard.
     """
 
-    def restart_game(self):
+    def reset(self, message="Welcome! Click next to draw a card"):
         """
-        Restart the game by resetting the game state and updating the UI.
+        Reset the screen in place for a new game, so one PlayUI can be reused for every game.
+
+        Starts a new game, clears the cards, labels and odds, and returns the buttons
+        to their starting state.
+
+        Args:
+            message (str): The message shown on the display line.
         """
-        self.game = HigherOrLower(self.leaderboard)
-        self.update_ui(no_deck=True)
-        self.display("New game! Click next to draw")
+        self.game = HigherOrLower(self.leaderboard, secure=True)  # Start a new leaderboard-eligible game
+        self.current_state = "START_GAME"  # Initial game state
+        self.card0 = None
+        self.card1 = None
+        self.guess = None
+        self.correct = None  # Result of the last checked guess, scored by update_state
+
+        self.update_ui(no_deck=True)  # Also clears the card image
+        self.higher_button.setToolTip("")
+        self.lower_button.setToolTip("")
+        self.display(message)
         self.next_button_state()
         self.menu_button_startgame() # Menu buttons to start game appearance
-        self.current_state = "START_GAME"
+
+    def restart_game(self):
+        """
+        Restart the game by resetting the game state and updating the UI.
+        """
+        self.reset("New game! Click next to draw")
 
     def quit_to_home(self):
         """
@@ -153,36 +184,25 @@ class PlayUI(QMainWindow):
         """
         Displays the game rules in a dialog window.
 
-        - Initialises a game instance to retrieve the rules.
-        - Creates a QDialog with a QLabel to show the rules text.
-        - Applies custom styling to the text for better readability.
+        - On first use, builds the dialog from the current game's rules.
+        - Reuses the same dialog on later calls, leaving the game in progress untouched.
         """
-        # Create a game instance to fetch the rules
-        self.game = HigherOrLower(self.leaderboard)
-        rules = self.game.getRules()
-
-        # Create a QDialog for displaying the rules
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Game Rules")
-        dialog.setGeometry(100, 100, 400, 600)  # Set the size of the dialog
-
-        # Create a QLabel to display the rules and add it to the dialog
-        layout = QVBoxLayout(dialog)
-        label = QLabel(rules, dialog)
-        layout.addWidget(label)
-
-        # Apply custom styles to the QLabel
-        label.setStyleSheet("color: white; font-size: 20px; font-family: Bodoni MT;")
+        if self.rules_dialog is None:
+            self.rules_dialog = RulesDialog(self.game.getRules(), self)
 
         # Execute the dialog to show it on the screen
-        dialog.exec_()
+        self.rules_dialog.exec_()
 
     def show_leaderboard(self):
         """
-        Display the leaderboard in a custom dialog window.
+        Display the leaderboard in a custom dialog window, built on first use and
+        refreshed on later calls.
         """
-        dialog = LeaderboardDialog(self.leaderboard)  # Create the leaderboard dialog
-        dialog.exec_()  # Display the dialog
+        if self.leaderboard_dialog is None:
+            self.leaderboard_dialog = LeaderboardDialog(self.leaderboard)  # Create the leaderboard dialog
+        else:
+            self.leaderboard_dialog.populate_table()  # Pick up scores saved since last shown
+        self.leaderboard_dialog.exec_()  # Display the dialog
 
     ############ GAME MANAGEMENT ##############
     """
@@ -226,6 +246,7 @@ class PlayUI(QMainWindow):
         elif self.current_state == "WAIT_FOR_GUESS":
             self.display(f"The card is: {self.card0}")
             self.guess_button_state()  # Enable the guessing buttons
+            self.show_odds()
         elif self.current_state == "DRAW_AFTER_GUESS":
             self.draw_after_guess()  # Handle card drawing after a guess
         elif self.current_state == "UPDATE_STATE":
@@ -240,7 +261,7 @@ class PlayUI(QMainWindow):
         """
         self.card0 = self.game.draw_card()  # Draw the first card
 
-        if self.card0.rank == 'Joker':
+        if self.card0.is_joker:
             # Joker scenario: Add a life, maintain state, and allow redrawing
             self.display("You drew a Joker! +1 Life. Click next to draw again")
             self.update_ui()
@@ -251,6 +272,7 @@ class PlayUI(QMainWindow):
             self.display(f"The card is: {self.card0}")
             self.update_ui()
             self.guess_button_state()  # Enable guessing buttons
+            self.show_odds()
             self.current_state = "WAIT_FOR_GUESS"
 
     def action(self, signal):
@@ -297,7 +319,7 @@ class PlayUI(QMainWindow):
             self.current_state = "DRAW_AFTER_GUESS"
             return
 
-        if self.card1.rank == 'Joker':
+        if self.card1.is_joker:
             # Joker scenario: Add a life and allow redrawing
             self.display("You drew a Joker! +1 Life. Click next to draw again")
             self.update_ui()
@@ -305,8 +327,8 @@ class PlayUI(QMainWindow):
         else:
             # Normal card scenario: Check the player's guess
             self.update_ui()
-            result = self.game.checkGuess(self.card0, self.card1, self.guess)
-            if result:
+            self.correct = self.game.checkGuess(self.card0, self.card1, self.guess)  # Checked (and logged) once
+            if self.correct:
                 # Correct guess
                 self.display(f"The next card is: {self.card1} - you were right!")
                 self.current_state = "UPDATE_STATE"
@@ -320,7 +342,7 @@ class PlayUI(QMainWindow):
         Updates the game state based on whether the player's guess was correct or not.
         Handles scoring, streak updates, and checks for game over conditions.
         """
-        if self.game.checkGuess(self.card0, self.card1, self.guess):
+        if self.correct:
             # Correct guess: Award points and update streak
             points_gained = self.game.correct()
             self.display(f"+{points_gained} points! ({self.game.BASE_SCORE} + {(self.game.streak-1)*self.game.STREAK_MULTIPLIER} streak bonus)")
@@ -383,9 +405,9 @@ class PlayUI(QMainWindow):
         if not no_deck:
             # If a deck has been initialised
             if self.game.card:
-                # Update the card image if a card is available
-                card_image_path = self.get_card_image_path(self.game.card)
-                self.card_image.setPixmap(QPixmap(card_image_path))
+                # Update the card image from the cache if a card is available
+                pixmap = self.image_cache.pixmap(self.game.card.getImageName(), self.card_image.size())
+                self.card_image.setPixmap(pixmap)
             else:
                 # Clear the card image if no card is available
                 self.card_image.clear()
@@ -406,6 +428,20 @@ class PlayUI(QMainWindow):
         card_path = os.path.join(self.dirpath, fr"card-images\{filename}")
         return card_path
 
+    def show_odds(self):
+        """
+        Show the odds of the next card being higher or lower than the current card
+        as tooltips on the guess buttons.
+        """
+        odds = self.game.odds(self.card0)
+        if odds is None:
+            # A Joker is redrawn before any guess, so there is nothing to compare against
+            self.higher_button.setToolTip("")
+            self.lower_button.setToolTip("")
+            return
+        self.higher_button.setToolTip(f"Chance of higher: {odds['higher']:.0%} (tie {odds['tie']:.0%})")
+        self.lower_button.setToolTip(f"Chance of lower: {odds['lower']:.0%} (tie {odds['tie']:.0%})")
+
     def display(self, text):
         """
         Update the main display line in the GUI with the given text.
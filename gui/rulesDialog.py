@@ -0,0 +1,27 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel
+
+class RulesDialog(QDialog):
+    """
+    Represents a dialog window displaying the game rules.
+    Built once per screen and reused each time the rules are opened.
+    """
+
+    def __init__(self, rules, parent=None):
+        """
+        Initialise the rules dialog with the rules text and custom styling.
+
+        Args:
+            rules (str): The rules text, as returned by HigherOrLower.getRules.
+            parent (QWidget, optional): The window the dialog belongs to.
+        """
+        super(RulesDialog, self).__init__(parent)
+        self.setWindowTitle("Game Rules")
+        self.setGeometry(100, 100, 400, 600)  # Set the size of the dialog
+
+        # Create a QLabel to display the rules and add it to the dialog
+        layout = QVBoxLayout(self)
+        label = QLabel(rules, self)
+        layout.addWidget(label)
+
+        # Apply custom styles to the QLabel
+        label.setStyleSheet("color: white; font-size: 20px; font-family: Bodoni MT;")
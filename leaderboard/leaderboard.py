@@ -1,9 +1,242 @@
+import itertools
+import os
+import random
 import sqlite3
+import threading
+import time
 from datetime import datetime
 
+# Schema upgrades, applied in order by Leaderboard.migrate; MIGRATIONS[i] upgrades a database
+# from PRAGMA user_version i to i + 1
+MIGRATIONS = (
+    # 1: Covering index for the top scores, and score counts (per score, and per score and date)
+    #    kept up to date by triggers, so a rank is found without scanning the table
+    (
+        "CREATE INDEX IF NOT EXISTS leaderboard_score_date ON leaderboard (score DESC, date DESC, name)",
+        """
+        CREATE TABLE IF NOT EXISTS score_counts (
+            score INTEGER PRIMARY KEY,
+            count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS score_date_counts (
+            score INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (score, date)
+        ) WITHOUT ROWID
+        """,
+        "DELETE FROM score_counts",
+        "DELETE FROM score_date_counts",
+        "INSERT INTO score_counts (score, count) SELECT score, COUNT(*) FROM leaderboard GROUP BY score",
+        """
+        INSERT INTO score_date_counts (score, date, count)
+        SELECT score, date, COUNT(*) FROM leaderboard GROUP BY score, date
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS score_counts_insert AFTER INSERT ON leaderboard BEGIN
+            INSERT INTO score_counts (score, count) VALUES (NEW.score, 1)
+                ON CONFLICT (score) DO UPDATE SET count = count + 1;
+            INSERT INTO score_date_counts (score, date, count) VALUES (NEW.score, NEW.date, 1)
+                ON CONFLICT (score, date) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS score_counts_delete AFTER DELETE ON leaderboard BEGIN
+            UPDATE score_counts SET count = count - 1 WHERE score = OLD.score;
+            UPDATE score_date_counts SET count = count - 1 WHERE score = OLD.score AND date = OLD.date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS score_counts_update AFTER UPDATE OF score, date ON leaderboard BEGIN
+            UPDATE score_counts SET count = count - 1 WHERE score = OLD.score;
+            UPDATE score_date_counts SET count = count - 1 WHERE score = OLD.score AND date = OLD.date;
+            INSERT INTO score_counts (score, count) VALUES (NEW.score, 1)
+                ON CONFLICT (score) DO UPDATE SET count = count + 1;
+            INSERT INTO score_date_counts (score, date, count) VALUES (NEW.score, NEW.date, 1)
+                ON CONFLICT (score, date) DO UPDATE SET count = count + 1;
+        END
+        """,
+    ),
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Index and triggers derived from the scores, dropped by a deferred bulk load; the version 1
+# statements are idempotent and rebuild all of them (and refill the count tables)
+DERIVED_INDEXES = ('leaderboard_score_date',)
+DERIVED_TRIGGERS = ('score_counts_insert', 'score_counts_delete', 'score_counts_update')
+REBUILD_DERIVED = MIGRATIONS[0]
+
+# Concurrent writers: SQLite waits up to BUSY_TIMEOUT for a lock itself, and a write that still
+# fails as busy or locked is retried RETRIES times, backing off from BACKOFF up to MAX_BACKOFF
+BUSY_TIMEOUT = 5.0  # Seconds
+RETRIES = 8
+BACKOFF = 0.01      # Seconds, doubled on each retry
+MAX_BACKOFF = 1.0   # Seconds
+
+def is_contention(error):
+    """
+    Check whether an SQLite error means another connection holds the lock.
+
+    Args:
+        error (sqlite3.OperationalError): The error.
+    Returns:
+        bool: True for 'database is locked' and 'database is busy' errors.
+    """
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+def retry(work, retries=RETRIES, backoff=BACKOFF):
+    """
+    Run a database operation, retrying it with jittered exponential backoff while the
+    database is busy or locked. The operation must be safe to repeat, e.g. one transaction.
+
+    Args:
+        work (callable): The operation, called with no arguments.
+        retries (int): Retries before giving up.
+        backoff (float): Delay before the first retry in seconds.
+    Returns:
+        The operation's return value.
+    Raises:
+        sqlite3.OperationalError: If the operation fails for another reason, or is still
+                                  contended after every retry.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return work()
+        except sqlite3.OperationalError as error:
+            if attempt == retries or not is_contention(error):
+                raise
+            time.sleep(min(MAX_BACKOFF, backoff * 2 ** attempt) * random.uniform(0.5, 1.5))
+
+class ConnectionPool:
+    """
+    SQLite connections to one database file, one per thread, shared by every Leaderboard
+    open on that file in the process.
+
+    Connections use WAL journaling, so readers never block the writer and the writer never
+    blocks readers, and synchronous=NORMAL, which in WAL mode can only lose the last commits
+    on power loss, never corrupt the database. Write transactions begin IMMEDIATE, taking the
+    write lock up front and waiting for it in SQLite's busy handler, rather than failing when
+    a read upgrades to a write. A forked child opens its own connections instead of reusing
+    its parent's.
+
+    An in-memory database is private to its Leaderboard and uses one connection for every
+    thread, since each connection to ':memory:' would be a separate database.
+    """
+
+    _pools = {}  # Absolute database path -> shared pool
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path, timeout=BUSY_TIMEOUT):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file, or ':memory:'.
+            timeout (float): SQLite busy timeout in seconds.
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.memory = db_path in (':memory:', '')
+        self.users = 0  # Leaderboards sharing the pool
+        self.lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def acquire(cls, db_path):
+        """
+        Get the shared pool of a database file, creating it on first use.
+
+        Args:
+            db_path (str): Path to the SQLite database file, or ':memory:'.
+        Returns:
+            ConnectionPool: The pool; call release() when done with it.
+        """
+        if db_path in (':memory:', ''):
+            pool = cls(db_path)
+            pool.users = 1
+            return pool
+        key = os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = cls(key)
+            pool.users += 1
+        return pool
+
+    def release(self):
+        """
+        Give up one use of the pool, closing its connections when no Leaderboard uses it.
+        """
+        with self._pools_lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            if self._pools.get(self.db_path) is self:
+                del self._pools[self.db_path]
+        self.close()
+
+    def reset(self):
+        """
+        Forget every connection without closing it (used in a forked child, where the
+        parent's connections must not be touched).
+        """
+        self.pid = os.getpid()
+        self.local = threading.local()
+        self.connections = []
+
+    def connect(self):
+        """
+        Open and configure a new connection.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level='IMMEDIATE',
+                               check_same_thread=False)
+        retry(lambda: conn.execute("PRAGMA journal_mode=WAL"))  # Switching needs a brief exclusive lock
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def connection(self):
+        """
+        Get the calling thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        if self.pid != os.getpid():
+            self.reset()
+        if self.memory:
+            with self.lock:  # Every thread shares the one in-memory connection
+                if not self.connections:
+                    self.connections.append(self.connect())
+                return self.connections[0]
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = self.connect()
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def close(self):
+        """
+        Close every connection of the pool.
+        """
+        with self.lock:
+            connections, self.connections = self.connections, []
+            self.local = threading.local()
+        if self.pid == os.getpid():
+            for conn in connections:
+                conn.close()
+
 class Leaderboard:
     """
     Manages the leaderboard by storing, retrieving, and displaying high scores using an SQLite database.
+
+    Leaderboards on the same file share one connection per thread (see ConnectionPool), and
+    writes are retried while other processes hold the database lock, so games, the GUI and
+    simulations can record scores concurrently.
     """
 
     def __init__(self, db_path='leaderboard.db'):
@@ -15,23 +248,57 @@ class Leaderboard:
         """
         self.db_path = db_path
         self.display_no = 10  # Number of top scores to display
-        self.conn = sqlite3.connect(self.db_path)  # Establish connection to the database
+        self.pool = ConnectionPool.acquire(self.db_path)  # Shared per-thread connections
         self.create_table()  # Ensure the leaderboard table exists
+        self.migrate()  # Bring older databases up to the current schema
+
+    @property
+    def conn(self):
+        """sqlite3.Connection: The calling thread's connection to the database."""
+        if self.pool is None:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed leaderboard.')
+        return self.pool.connection()
 
     def create_table(self):
         """
         Create the leaderboard table if it does not already exist.
         """
-        with self.conn:
-            self.conn.execute("""
-                CREATE TABLE IF NOT EXISTS leaderboard (
-                    id INTEGER PRIMARY KEY,
-                    date TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    score INTEGER NOT NULL
-                )
-            """)  # Define table schema for storing scores
+        def create():
+            with self.conn:
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS leaderboard (
+                        id INTEGER PRIMARY KEY,
+                        date TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        score INTEGER NOT NULL
+                    )
+                """)  # Define table schema for storing scores
+        retry(create)
     
+    def migrate(self):
+        """
+        Upgrade the database schema to SCHEMA_VERSION, recorded in PRAGMA user_version.
+        Each upgrade runs in one transaction, holding the write lock so that concurrent
+        processes opening the same database upgrade it only once.
+        """
+        conn = self.conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        def upgrade():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]  # Re-read under the lock
+                for statements in MIGRATIONS[version:]:
+                    for statement in statements:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        retry(upgrade)
+
     def add_score(self, name, score):
         """
         Add a new score to the leaderboard.
@@ -45,21 +312,101 @@ class Leaderboard:
         current_date = datetime.now()
         date = current_date.strftime("%Y-%m-%d")  # Format date for storage
 
-        with self.conn:
-            self.conn.execute(
-                "INSERT INTO leaderboard (date, name, score) VALUES (?, ?, ?)",
-                (date, name, score)
-            )
+        def insert():
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO leaderboard (date, name, score) VALUES (?, ?, ?)",
+                    (date, name, score)
+                )
+        retry(insert)
 
         # Determine the rank of the newly added score
-        position = self.conn.execute("""
-            SELECT COUNT(*)
-            FROM leaderboard
-            WHERE score > ?
-               OR (score = ? AND date > ?)
-        """, (score, score, date)).fetchone()[0] + 1  # Add 1 for 1-based ranking
+        return self.rank(score, date)
+
+    def add_scores(self, rows, batch_size=100000, ranks=False, defer_indexes=False):
+        """
+        Add many scores at once, inserting them in large single-transaction batches.
+
+        Rows are consumed lazily, one batch at a time, so a generator of any length is loaded
+        in constant memory (unless ranks are requested).
+
+        Args:
+            rows (iterable): (name, score, date) tuples. The date is a 'YYYY-MM-DD' string, a
+                             date or datetime, or None for today.
+            batch_size (int): Rows inserted per transaction.
+            ranks (bool): If True, return the position of every row, as of the end of its batch.
+            defer_indexes (bool): If True, drop the score index and count triggers for the load
+                                  and rebuild them once at the end, which is much faster for large
+                                  loads. Ranks read by other connections are stale until then.
+        Returns:
+            int or list: The number of rows added, or their positions if ranks is True.
+        Raises:
+            ValueError: If ranks and defer_indexes are both requested (ranks need the counts).
+        """
+        if ranks and defer_indexes:
+            raise ValueError('Ranks cannot be computed while index maintenance is deferred.')
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        def normalise(batch):
+            for name, score, date in batch:
+                if date is None:
+                    date = today
+                elif not isinstance(date, str):
+                    date = date.strftime("%Y-%m-%d")
+                yield date, name, score
+
+        conn = self.conn
 
-        return position
+        def execute(statements):
+            def transaction():
+                with conn:
+                    for statement in statements:
+                        conn.execute(statement)
+            retry(transaction)
+
+        if defer_indexes:
+            execute([f"DROP INDEX IF EXISTS {index}" for index in DERIVED_INDEXES] +
+                    [f"DROP TRIGGER IF EXISTS {trigger}" for trigger in DERIVED_TRIGGERS])
+
+        added = 0
+        positions = [] if ranks else None
+        rows = iter(rows)
+        try:
+            while True:
+                batch = list(normalise(itertools.islice(rows, batch_size)))
+                if not batch:
+                    break
+                def insert():
+                    with conn:
+                        conn.executemany("INSERT INTO leaderboard (date, name, score) VALUES (?, ?, ?)", batch)
+                retry(insert)
+                added += len(batch)
+                if ranks:
+                    positions.extend(self.rank(score, date) for date, _, score in batch)
+        finally:
+            # Rebuild even if the load failed part way, so the rows already added are counted
+            if defer_indexes:
+                execute(REBUILD_DERIVED)
+        return positions if ranks else added
+
+    def rank(self, score, date):
+        """
+        Position of a score recorded on a date: one more than the number of higher scores and
+        equal scores recorded on later dates.
+
+        Both counts are read from the count tables, which have one row per distinct score and
+        per distinct score and date, so the cost does not grow with the number of rows.
+
+        Args:
+            score (int): The score.
+            date (str): Its date, formatted YYYY-MM-DD.
+        Returns:
+            int: The 1-based position.
+        """
+        return self.conn.execute("""
+            SELECT (SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE score > ?)
+                 + (SELECT COALESCE(SUM(count), 0) FROM score_date_counts WHERE score = ? AND date > ?)
+        """, (score, score, date)).fetchone()[0] + 1  # Add 1 for 1-based ranking
 
     def get_top_scores(self, limit=10):
         """
@@ -93,9 +440,12 @@ class Leaderboard:
 
     def close(self):
         """
-        Close the database connection.
+        Release the database connections; they are closed once no leaderboard on the file
+        is open in this process.
         """
-        self.conn.close()
+        if self.pool is not None:
+            self.pool.release()
+            self.pool = None
 
 def test():
     """
@@ -0,0 +1,543 @@
+"""
+Asyncio server hosting many concurrent Higher or Lower games over a JSON lines protocol.
+
+Each request is one JSON object per line and gets one JSON object back:
+    {"op": "new"}                                  Start a session; the reply includes its "session" ID.
+    {"op": "next", "session": ID}                  Like the Next button: draw, reveal, score, or end.
+    {"op": "guess", "session": ID, "guess": "h"}   Guess Higher ("h") or Lower ("l").
+    {"op": "bank", "session": ID}                  Bank the unbanked points.
+    {"op": "submit", "session": ID, "name": NAME}  Save the final score to the leaderboard.
+    {"op": "state", "session": ID}                 Report the session without changing it.
+    {"op": "close", "session": ID}                 End the session.
+An optional "id" in a request is echoed in its reply. Replies carry "ok" and either "error"
+or the session view (state, message, card, score, unbanked, streak, lives).
+
+Sessions follow the PlayUI state machine (START_GAME, WAIT_FOR_GUESS, DRAW_AFTER_GUESS,
+UPDATE_STATE, GAME_OVER). Leaderboard writes run on a dedicated thread, which owns the SQLite
+connection, so they never block the event loop. Sessions live in a SessionStore, which spills
+idle games to disk as compact snapshots and reloads them on their next move; the store has a
+dedicated thread of its own for the same reason.
+
+Run from the repository root:
+    python -m server.gameServer --port 8765
+"""
+
+from cards.card import CARDS
+from concurrent.futures import ThreadPoolExecutor
+from games.higherOrLower import HigherOrLower
+from leaderboard.leaderboard import Leaderboard
+from server.sessionStore import SessionStore, estimate_size
+import argparse
+import asyncio
+import json
+import secrets
+import struct
+
+STATES = ("START_GAME", "WAIT_FOR_GUESS", "DRAW_AFTER_GUESS", "UPDATE_STATE", "GAME_OVER")
+GUESSES = (None, 'h', 'l')
+
+# Serialized session layout: version, state index, card0 code, card1 code, guess index, flags,
+# game snapshot length; followed by the game snapshot and the UTF-8 message
+SESSION_VERSION = 1
+SESSION_HEADER = struct.Struct('<BBBBBBH')
+SESSION_CORRECT = 1    # flags bit: the last checked guess was correct
+SESSION_SUBMITTED = 2  # flags bit: the final score has been saved
+NO_CARD = 255
+
+
+class SessionError(Exception):
+    """
+    Raised when a request is not valid for its session's current state.
+    """
+
+
+class GameSession:
+    """
+    Headless version of the PlayUI state machine around one HigherOrLower game.
+
+    Attributes:
+        game (HigherOrLower): The game being played.
+        current_state (str): One of the PlayUI game states.
+        card0 (Card): The card to guess against.
+        card1 (Card): The card drawn after the guess.
+        guess (str): The pending guess, 'h' or 'l'.
+        correct (bool): Whether the last checked guess was correct.
+        message (str): Message for the player, as PlayUI shows on its display line.
+        submitted (bool): Whether the final score has been saved to the leaderboard.
+    """
+
+    def __init__(self, game=None):
+        """
+        Args:
+            game (HigherOrLower, optional): The game to host. If None, a new secure game is started.
+        """
+        self.game = game if game is not None else HigherOrLower(secure=True)
+        self.current_state = "START_GAME"
+        self.card0 = None
+        self.card1 = None
+        self.guess = None
+        self.correct = None
+        self.message = "Welcome! Send next to draw a card"
+        self.submitted = False
+
+    def to_bytes(self):
+        """
+        Serializes the session around a snapshot of its game (see HigherOrLower.snapshot).
+
+        Returns:
+            bytes: The serialized session.
+        """
+        snapshot = self.game.snapshot()
+        flags = (SESSION_CORRECT if self.correct else 0) | (SESSION_SUBMITTED if self.submitted else 0)
+        header = SESSION_HEADER.pack(SESSION_VERSION, STATES.index(self.current_state),
+                                     self.card0.code if self.card0 else NO_CARD,
+                                     self.card1.code if self.card1 else NO_CARD,
+                                     GUESSES.index(self.guess), flags, len(snapshot))
+        return header + snapshot + self.message.encode()
+
+    @classmethod
+    def from_bytes(cls, data, leaderboard=None):
+        """
+        Rebuilds a session serialized with to_bytes.
+
+        Args:
+            data (bytes): The serialized session.
+            leaderboard (Leaderboard, optional): Leaderboard for the restored game.
+        Returns:
+            GameSession: The session.
+        Raises:
+            ValueError: If the data is from an unsupported version.
+        """
+        version, state, card0, card1, guess, flags, length = SESSION_HEADER.unpack_from(data)
+        if version != SESSION_VERSION:
+            raise ValueError('Unsupported session version.')
+        start = SESSION_HEADER.size
+        session = cls(HigherOrLower.restore(data[start:start + length], leaderboard))
+        session.current_state = STATES[state]
+        session.card0 = CARDS[card0] if card0 != NO_CARD else None
+        session.card1 = CARDS[card1] if card1 != NO_CARD else None
+        session.guess = GUESSES[guess]
+        session.correct = bool(flags & SESSION_CORRECT)
+        session.submitted = bool(flags & SESSION_SUBMITTED)
+        session.message = data[start + length:].decode()
+        return session
+
+    def memory_size(self):
+        """
+        Estimates the memory held by this session alone, leaving out the shared leaderboard
+        and interned cards.
+
+        Returns:
+            int: Estimated size in bytes.
+        """
+        game = self.game
+        return (estimate_size(self, 1) + estimate_size(game, 1) + estimate_size(game.deck, 2)
+                + estimate_size(game.deck.rank_index, 2))
+
+    def view(self):
+        """
+        Returns:
+            dict: The session state sent to the client.
+        """
+        card = self.game.card
+        return {'state': self.current_state, 'message': self.message,
+                'card': str(card) if card else None, 'code': card.code if card else None,
+                'score': self.game.score, 'unbanked': self.game.unbanked_points,
+                'streak': self.game.streak, 'lives': self.game.lives}
+
+    def advance(self):
+        """
+        Moves the game on, as the Next button does in PlayUI.
+
+        Raises:
+            SessionError: If the game is over.
+        """
+        if self.current_state == "START_GAME":
+            self.card0 = self.game.draw_card()
+            if self.card0.is_joker:
+                self.message = "You drew a Joker! +1 Life. Send next to draw again"
+            else:
+                self.message = f"The card is: {self.card0}"
+                self.current_state = "WAIT_FOR_GUESS"
+        elif self.current_state == "WAIT_FOR_GUESS":
+            self.message = f"The card is: {self.card0}"
+        elif self.current_state == "DRAW_AFTER_GUESS":
+            self.draw_after_guess()
+        elif self.current_state == "UPDATE_STATE":
+            self.update_state()
+        else:
+            raise SessionError("The game is over. Submit your name or close the session.")
+
+    def action(self, signal):
+        """
+        Handles a guess or a bank, as the Higher, Lower and Bank buttons do in PlayUI.
+
+        Args:
+            signal (str): 'h' for Higher, 'l' for Lower or 'b' to Bank.
+        Raises:
+            SessionError: If the game is not waiting for a guess or the signal is invalid.
+        """
+        if self.current_state != "WAIT_FOR_GUESS":
+            raise SessionError("Not waiting for a guess.")
+        if signal in ('h', 'l'):
+            self.guess = signal
+            self.message = f"You chose {'higher' if signal == 'h' else 'lower'}! Send next to draw"
+            self.current_state = "DRAW_AFTER_GUESS"
+        elif signal == 'b':
+            if self.game.unbanked_points > 0:
+                self.game.bankPoints()
+                self.message = "You banked! Send next to continue"
+            else:
+                self.message = "No points to bank! Send next to continue"
+        else:
+            raise SessionError("Guess must be 'h' or 'l'.")
+
+    def draw_after_guess(self):
+        """
+        Draws the next card after a guess and checks the guess.
+        """
+        self.card1 = self.game.draw_card()
+        if not self.card1:
+            self.message = "New deck - no jokers this time! Send next to draw"
+        elif self.card1.is_joker:
+            self.message = "You drew a Joker! +1 Life. Send next to draw again"
+        else:
+            self.correct = self.game.checkGuess(self.card0, self.card1, self.guess)
+            if self.correct:
+                self.message = f"The next card is: {self.card1} - you were right!"
+            else:
+                self.message = f"The next card is: {self.card1} - tough luck!"
+            self.current_state = "UPDATE_STATE"
+
+    def update_state(self):
+        """
+        Scores the checked guess and ends the game when no lives remain.
+        """
+        if self.correct:
+            points_gained = self.game.correct()
+            self.message = f"+{points_gained} points!"
+        else:
+            points_lost = self.game.incorrect()
+            self.message = f"Lost {points_lost} unbanked points and 1 life."
+
+        if self.game.lives <= 0:
+            self.message += f" Game Over! Final Score: {self.game.score}"
+            self.current_state = "GAME_OVER"
+        else:
+            self.card0 = self.card1
+            self.current_state = "WAIT_FOR_GUESS"
+
+
+class GameServer:
+    """
+    Serves GameSessions to clients over TCP.
+
+    Attributes:
+        sessions (SessionStore): Session ID -> GameSession, used only on the session thread.
+        moves (int): Number of requests handled.
+    """
+
+    def __init__(self, db_path="leaderboard.db", session_db="sessions.db", max_sessions=10000,
+                 max_bytes=None, ttl=300):
+        """
+        Args:
+            db_path (str): Path of the leaderboard database.
+            session_db (str): Path of the database idle sessions are spilled to.
+            max_sessions (int, optional): Most sessions kept in memory.
+            max_bytes (int, optional): Most estimated session memory kept in memory.
+            ttl (float, optional): Seconds after which an idle session is spilled to disk.
+        """
+        # One thread owns the SQLite connection and performs every leaderboard write
+        self.leaderboard_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard")
+        self.leaderboard = self.leaderboard_executor.submit(Leaderboard, db_path).result()
+        # Another owns the session store, whose spills and reloads are SQLite work too
+        self.session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sessions")
+        self.sessions = self.session_executor.submit(
+            SessionStore, session_db, GameSession.to_bytes, self.load_session,
+            max_sessions, max_bytes, ttl, size=GameSession.memory_size).result()
+        self.moves = 0
+        self.server = None
+        self.expiry_task = None
+
+    def load_session(self, data):
+        """
+        Rebuilds a spilled session, reconnecting it to the leaderboard.
+
+        Args:
+            data (bytes): The serialized session.
+        Returns:
+            GameSession: The session.
+        """
+        return GameSession.from_bytes(data, self.leaderboard)
+
+    async def in_session_thread(self, func, *args):
+        """
+        Runs a call on the session thread.
+
+        Args:
+            func (callable): The call, e.g. self.apply.
+            *args: Its arguments.
+        Returns:
+            The call's return value.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.session_executor, func, *args)
+
+    def new_session(self):
+        """
+        Starts a session with a new secure game. Runs on the session thread.
+
+        Returns:
+            tuple: (session ID, GameSession).
+        """
+        session_id = secrets.token_hex(8)
+        session = GameSession(HigherOrLower(self.leaderboard, secure=True))
+        self.sessions.put(session_id, session)
+        return session_id, session
+
+    def get_session(self, session_id):
+        """
+        Runs on the session thread.
+
+        Args:
+            session_id (str): The session ID.
+        Returns:
+            GameSession: The session.
+        Raises:
+            SessionError: If there is no such session.
+        """
+        if not isinstance(session_id, str):
+            raise SessionError("Unknown session.")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionError("Unknown session.")
+        return session
+
+    def close_session(self, session_id):
+        """
+        Ends a session. Runs on the session thread.
+
+        Args:
+            session_id (str): The session ID.
+        """
+        self.sessions.pop(session_id)
+
+    def apply(self, request):
+        """
+        Applies one request other than submit. Runs on the session thread, which owns every
+        session, so a session cannot be spilled between being loaded and being changed.
+
+        Args:
+            request (dict): The decoded request.
+        Returns:
+            dict: The reply.
+        Raises:
+            SessionError: If the request is invalid.
+        """
+        op = request.get('op')
+        if op == 'new':
+            session_id, session = self.new_session()
+            return dict(session.view(), session=session_id)
+
+        session_id = request.get('session')
+        session = self.get_session(session_id)
+        if op == 'next':
+            session.advance()
+        elif op == 'guess':
+            session.action(request.get('guess'))
+        elif op == 'bank':
+            session.action('b')
+        elif op == 'close':
+            self.close_session(session_id)
+        elif op != 'state':
+            raise SessionError(f"Unknown op '{op}'.")
+        return dict(session.view(), session=session_id)
+
+    async def handle(self, request):
+        """
+        Applies one request.
+
+        Args:
+            request (dict): The decoded request.
+        Returns:
+            dict: The reply.
+        Raises:
+            SessionError: If the request is invalid.
+        """
+        if request.get('op') == 'submit':
+            return await self.submit(request.get('session'), str(request.get('name', '')).strip())
+        return await self.in_session_thread(self.apply, request)
+
+    def begin_submit(self, session_id, name):
+        """
+        Checks that a session's score can be submitted and marks it submitted. Runs on the
+        session thread.
+
+        Args:
+            session_id (str): The session ID.
+            name (str): The player's name.
+        Returns:
+            GameSession: The session.
+        Raises:
+            SessionError: If the game is not over, was already submitted, or the name is empty.
+        """
+        session = self.get_session(session_id)
+        if session.current_state != "GAME_OVER" or session.submitted:
+            raise SessionError("Only a finished game can be submitted, once.")
+        if not name:
+            raise SessionError("A name is required.")
+        session.submitted = True
+        return session
+
+    def finish_submit(self, session_id, session, final_score, position):
+        """
+        Reports a saved score in its session. Runs on the session thread.
+
+        Returns:
+            dict: The reply.
+        """
+        session.message = f"Score {final_score} saved. Leaderboard Position: {position}"
+        if session_id in self.sessions:  # Unless it was closed or expired meanwhile
+            self.sessions.put(session_id, session)  # The session may have been spilled meanwhile
+        return dict(session.view(), session=session_id)
+
+    def cancel_submit(self, session_id, session):
+        """
+        Lets a session be submitted again after its score could not be saved. Runs on the
+        session thread.
+        """
+        session.submitted = False
+        if session_id in self.sessions:
+            self.sessions.put(session_id, session)
+
+    async def submit(self, session_id, name):
+        """
+        Saves a finished game's score on the leaderboard thread.
+
+        Args:
+            session_id (str): The session ID.
+            name (str): The player's name.
+        Returns:
+            dict: The reply.
+        Raises:
+            SessionError: If the game is not over, was already submitted, or the name is empty.
+        """
+        session = await self.in_session_thread(self.begin_submit, session_id, name)
+        loop = asyncio.get_running_loop()
+        try:
+            final_score, position = await loop.run_in_executor(self.leaderboard_executor, session.game.gameOver, name)
+        except Exception:
+            await self.in_session_thread(self.cancel_submit, session_id, session)
+            raise
+        return await self.in_session_thread(self.finish_submit, session_id, session, final_score, position)
+
+    async def session_metrics(self):
+        """
+        Returns:
+            dict: The session store's metrics (see SessionStore.metrics).
+        """
+        return await self.in_session_thread(self.sessions.metrics)
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads requests from one connection and writes the replies, in order.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader.
+            writer (asyncio.StreamWriter): Connection writer.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise SessionError("Requests must be JSON objects.")
+                    if 'id' in request:
+                        reply['id'] = request['id']
+                    reply.update(await self.handle(request))
+                    reply['ok'] = True
+                except Exception as e:
+                    # Any bad request fails alone; the connection stays open for the next one
+                    reply.update(ok=False, error=str(e) or type(e).__name__)
+                self.moves += 1
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Starts listening.
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free port.
+        Returns:
+            int: The bound port.
+        """
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        if self.sessions.ttl is not None:
+            self.expiry_task = asyncio.ensure_future(self.expire_sessions())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def expire_sessions(self):
+        """
+        Spills idle sessions to disk, checking every tenth of the TTL.
+        """
+        while True:
+            await asyncio.sleep(self.sessions.ttl / 10)
+            await self.in_session_thread(self.sessions.expire)
+
+    async def close(self):
+        """
+        Stops listening, spills the open sessions to disk and closes the leaderboard.
+        """
+        if self.expiry_task:
+            self.expiry_task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.in_session_thread(self.sessions.close)
+        self.session_executor.shutdown()
+        await asyncio.get_running_loop().run_in_executor(self.leaderboard_executor, self.leaderboard.close)
+        self.leaderboard_executor.shutdown()
+
+
+async def serve(host, port, db_path, session_db, max_sessions, ttl):
+    """
+    Runs a server until cancelled.
+    """
+    server = GameServer(db_path, session_db, max_sessions, ttl=ttl)
+    port = await server.start(host, port)
+    print(f"Serving Higher or Lower on {host}:{port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """
+    Command line entry point for the game server.
+    """
+    parser = argparse.ArgumentParser(description="Higher or Lower game server.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="port to bind")
+    parser.add_argument("--db", default="leaderboard.db", help="leaderboard database")
+    parser.add_argument("--session-db", default="sessions.db", help="database idle sessions are spilled to")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="sessions kept in memory")
+    parser.add_argument("--ttl", type=float, default=300, help="seconds before an idle session is spilled")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.session_db, args.max_sessions, args.ttl))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
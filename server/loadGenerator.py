@@ -0,0 +1,132 @@
+"""
+Load generator for the game server.
+
+Opens many concurrent client connections, each playing whole games through the JSON lines
+protocol with a simple strategy (guess around 7, bank at 10 unbanked points), and reports
+moves per second and the p50/p99 latency of a move (one request and its reply).
+
+Run from the repository root against a running server, or with --serve to start one in
+process on a free port with a temporary leaderboard and session store:
+    python -m server.loadGenerator --serve --clients 1000 --games 5
+    python -m server.loadGenerator --serve --clients 1000 --max-sessions 100
+"""
+
+from server.gameServer import GameServer
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+async def play_client(host, port, games, submit, latencies):
+    """
+    Plays games over one connection, recording the latency of every move.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        games (int): Games to play.
+        submit (bool): If True, submit each final score to the leaderboard.
+        latencies (list): Receives move latencies in seconds.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send(request):
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - started)
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    try:
+        for _ in range(games):
+            state = await send({'op': 'new'})
+            session = state['session']
+            while state['state'] != "GAME_OVER":
+                if state['state'] == "WAIT_FOR_GUESS":
+                    if state['unbanked'] >= 10:
+                        state = await send({'op': 'bank', 'session': session})
+                    else:
+                        rank = (state['code'] % 13) + 1
+                        state = await send({'op': 'guess', 'session': session, 'guess': 'h' if rank <= 7 else 'l'})
+                else:
+                    state = await send({'op': 'next', 'session': session})
+            if submit:
+                await send({'op': 'submit', 'session': session, 'name': f"load-{port}"})
+            await send({'op': 'close', 'session': session})
+    finally:
+        writer.close()
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a sorted list.
+
+    Args:
+        values (list): Sorted values.
+        q (float): Percentile between 0 and 100.
+    Returns:
+        float: The percentile.
+    """
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+async def run(host, port, clients, games, submit, serve, max_sessions=10000, ttl=300):
+    """
+    Runs the clients concurrently and prints the results.
+
+    Returns:
+        dict: moves, seconds, moves_per_sec, p50_ms, p99_ms.
+    """
+    server = None
+    if serve:
+        directory = tempfile.mkdtemp()
+        server = GameServer(os.path.join(directory, "load_leaderboard.db"), os.path.join(directory, "load_sessions.db"),
+                            max_sessions, ttl=ttl)
+        port = await server.start(host, 0)
+
+    latencies = []
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(play_client(host, port, games, submit, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        if server:
+            metrics = await server.session_metrics()
+            print("Session store:", ", ".join(f"{name} {value:.3g}" if isinstance(value, float) else f"{name} {value}"
+                                              for name, value in metrics.items()))
+    finally:
+        if server:
+            await server.close()
+
+    latencies.sort()
+    result = {'moves': len(latencies), 'seconds': elapsed, 'moves_per_sec': len(latencies) / elapsed,
+              'p50_ms': percentile(latencies, 50) * 1000, 'p99_ms': percentile(latencies, 99) * 1000}
+    print(f"{clients} clients, {clients * games} games, {result['moves']} moves in {elapsed:.2f}s")
+    print(f"{result['moves_per_sec']:,.0f} moves/sec, p50 {result['p50_ms']:.2f}ms, p99 {result['p99_ms']:.2f}ms")
+    return result
+
+
+def main():
+    """
+    Command line entry point for the load generator.
+    """
+    parser = argparse.ArgumentParser(description="Load generator for the Higher or Lower game server.")
+    parser.add_argument("--host", default="127.0.0.1", help="server host")
+    parser.add_argument("--port", type=int, default=8765, help="server port")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=5, help="games per connection")
+    parser.add_argument("--submit", action="store_true", help="submit final scores to the leaderboard")
+    parser.add_argument("--serve", action="store_true", help="start a server in process with a temporary leaderboard")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="sessions the in-process server keeps in memory")
+    parser.add_argument("--ttl", type=float, default=300, help="idle seconds before the in-process server spills a session")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.clients, args.games, args.submit, args.serve,
+                    args.max_sessions, args.ttl))
+
+
+if __name__ == "__main__":
+    main()
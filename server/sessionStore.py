@@ -0,0 +1,263 @@
+"""
+Session store keeping hot sessions in memory and spilling idle ones to SQLite.
+
+Sessions are held in least recently used order. When the store holds more than max_sessions
+sessions or more than max_bytes of estimated session memory, or a session has been idle for
+longer than ttl seconds, the least recently used sessions are serialized and written to disk
+in one transaction. Getting a spilled session loads it back transparently.
+"""
+
+from collections import OrderedDict
+import sqlite3
+import sys
+import time
+
+
+def estimate_size(obj, depth=3):
+    """
+    Rough memory estimate of an object and the objects it refers to through attributes and
+    containers, to a limited depth. Items with __slots__ (such as the interned cards) are
+    shared by every session, so they are not counted.
+
+    Args:
+        obj (object): The object to measure.
+        depth (int): How many levels of references to follow.
+    Returns:
+        int: Estimated size in bytes.
+    """
+    size = sys.getsizeof(obj)
+    if depth == 0:
+        return size
+    if isinstance(obj, (list, tuple)):
+        return size + sum(estimate_size(item, depth - 1) for item in obj if not hasattr(item, '__slots__'))
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(value, depth - 1) for value in obj.values())
+    if hasattr(obj, '__dict__'):
+        return size + estimate_size(vars(obj), depth)
+    return size
+
+
+class SessionStore:
+    """
+    LRU + TTL cache of sessions backed by an SQLite spill table.
+
+    Attributes:
+        sessions (OrderedDict): Resident sessions: ID -> (session, size, last access time),
+                                least recently used first.
+        resident_bytes (int): Estimated memory of the resident sessions.
+        hits (int): Gets served from memory.
+        misses (int): Gets loaded from disk.
+        evictions (int): Sessions spilled because of the count or memory limit.
+        expirations (int): Sessions spilled because they were idle for longer than the TTL.
+    """
+
+    def __init__(self, path, dump, load, max_sessions=10000, max_bytes=None, ttl=None,
+                 size=estimate_size, clock=time.monotonic):
+        """
+        Opens the store, creating the spill table if needed.
+
+        Args:
+            path (str): SQLite database path for spilled sessions.
+            dump (callable): Serializes a session to bytes.
+            load (callable): Rebuilds a session from bytes.
+            max_sessions (int, optional): Most sessions kept in memory.
+            max_bytes (int, optional): Most estimated session memory kept in memory.
+            ttl (float, optional): Seconds of inactivity after which expire() spills a session.
+            size (callable): Estimates a session's memory in bytes.
+            clock (callable): Time source in seconds.
+        """
+        self.dump = dump
+        self.load = load
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = size
+        self.clock = clock
+
+        self.sessions = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        # Spilled sessions are a cache of live games, so durability is traded for speed
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def __len__(self):
+        """
+        Returns:
+            int: Number of sessions, resident and spilled.
+        """
+        return len(self.sessions) + self.spilled()
+
+    def __contains__(self, session_id):
+        """
+        Checks whether a session exists, resident or spilled, without loading it.
+        """
+        return session_id in self.sessions or self.conn.execute(
+            "SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    def spilled(self):
+        """
+        Returns:
+            int: Number of sessions on disk.
+        """
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def put(self, session_id, session):
+        """
+        Adds or replaces a session, spilling others if a limit is exceeded. A spilled copy of
+        the session is deleted, so the session is never both resident and on disk.
+
+        Args:
+            session_id (str): The session ID.
+            session (object): The session.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        self._make_resident(session_id, session)
+
+    def get(self, session_id):
+        """
+        Returns a session, loading it from disk if it was spilled.
+
+        Args:
+            session_id (str): The session ID.
+        Returns:
+            object: The session, or None if there is no such session.
+        """
+        entry = self.sessions.get(session_id)
+        if entry is not None:
+            self.hits += 1
+            self.sessions[session_id] = (entry[0], entry[1], self.clock())
+            self.sessions.move_to_end(session_id)
+            return entry[0]
+
+        row = self.conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        self.misses += 1
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        session = self.load(row[0])
+        self._make_resident(session_id, session)  # Its row was just deleted
+        return session
+
+    def pop(self, session_id):
+        """
+        Removes a session from memory and disk.
+
+        Args:
+            session_id (str): The session ID.
+        """
+        self._remove_resident(session_id)
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def expire(self):
+        """
+        Spills every session idle for longer than the TTL. Call this periodically.
+
+        Returns:
+            int: Number of sessions spilled.
+        """
+        if self.ttl is None:
+            return 0
+        cutoff = self.clock() - self.ttl
+        idle = []
+        for session_id, (_, _, last_access) in self.sessions.items():
+            if last_access > cutoff:
+                break  # The rest were used more recently
+            idle.append(session_id)
+        self._spill(idle)
+        self.expirations += len(idle)
+        return len(idle)
+
+    def purge(self, max_age):
+        """
+        Deletes spilled sessions not used for max_age seconds, e.g. abandoned games.
+
+        Args:
+            max_age (float): Age in seconds.
+        Returns:
+            int: Number of sessions deleted.
+        """
+        with self.conn:
+            return self.conn.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - max_age,)).rowcount
+
+    def flush(self):
+        """
+        Spills every resident session, e.g. before shutting down.
+        """
+        self._spill(list(self.sessions))
+
+    def close(self):
+        """
+        Spills every resident session and closes the database.
+        """
+        self.flush()
+        self.conn.close()
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Resident and spilled counts, estimated resident memory, hit rate,
+                  evictions and expirations.
+        """
+        lookups = self.hits + self.misses
+        return {'resident': len(self.sessions), 'spilled': self.spilled(),
+                'resident_bytes': self.resident_bytes, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 1.0,
+                'evictions': self.evictions, 'expirations': self.expirations}
+
+    def _make_resident(self, session_id, session):
+        """Add or replace a resident session, spilling others if a limit is exceeded."""
+        self._remove_resident(session_id)
+        size = self.size(session)
+        self.sessions[session_id] = (session, size, self.clock())
+        self.resident_bytes += size
+        self._enforce_limits()
+
+    def _remove_resident(self, session_id):
+        """Forget a resident session, if there is one."""
+        entry = self.sessions.pop(session_id, None)
+        if entry is not None:
+            self.resident_bytes -= entry[1]
+
+    def _enforce_limits(self):
+        """Spill least recently used sessions until the count and memory limits are met."""
+        over = []
+        count = len(self.sessions)
+        resident_bytes = self.resident_bytes
+        for session_id, (_, size, _) in self.sessions.items():
+            if ((self.max_sessions is None or count <= self.max_sessions) and
+                    (self.max_bytes is None or resident_bytes <= self.max_bytes)):
+                break
+            over.append(session_id)
+            count -= 1
+            resident_bytes -= size
+        if over:
+            self._spill(over)
+            self.evictions += len(over)
+
+    def _spill(self, session_ids):
+        """Write sessions to disk in one transaction and drop them from memory."""
+        if not session_ids:
+            return
+        now = time.time()
+        rows = [(session_id, self.dump(self.sessions[session_id][0]), now) for session_id in session_ids]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO sessions (id, data, updated) VALUES (?, ?, ?)", rows)
+        for session_id in session_ids:
+            self._remove_resident(session_id)